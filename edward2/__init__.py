@@ -24,29 +24,73 @@ For user guides, see:
 
 """
 
+import importlib
+import importlib.util
 import warnings
-try:
-  from edward2 import numpy
-  __all__ = ["numpy"]
-except ImportError:
-  __all__ = []
-  warnings.warn("NumPy backend for Edward2 is not available.")
 
-try:
-  from edward2 import tensorflow
-  from edward2.tensorflow import *  # pylint: disable=wildcard-import
-  # By default, `import edward2 as ed` uses the TensorFlow backend's namespace.
-  __all__ += tensorflow.__all__ + ["tensorflow"]
-except ImportError:
+from edward2.parallel import parallel_map
+from edward2.trace import get_next_tracer
+from edward2.trace import trace
+from edward2.trace import traceable
+from edward2.trace import use_thread_local_tracer_stack
+from edward2.tracers import condition
+from edward2.tracers import memoize
+from edward2.tracers import tape
+from edward2.version import __version__
+from edward2.version import VERSION
+
+# Backends are imported on first access, e.g., `ed.Normal` imports the
+# TensorFlow backend and `ed.numpy` imports the NumPy backend, so that
+# `import edward2` does not pay for backends which are not used. The tracing
+# operations above are shared by both backends; importing them eagerly also
+# binds `ed.trace` to the function rather than the `edward2.trace` module.
+_BACKEND_REQUIREMENTS = {
+    "numpy": ("numpy", "scipy"),
+    "tensorflow": ("tensorflow", "tensorflow_probability"),
+}
+
+
+def _is_available(backend):
+  return all(importlib.util.find_spec(requirement) is not None
+             for requirement in _BACKEND_REQUIREMENTS[backend])
+
+
+_AVAILABLE_BACKENDS = [backend for backend in ("numpy", "tensorflow")
+                       if _is_available(backend)]
+if "numpy" not in _AVAILABLE_BACKENDS:
+  warnings.warn("NumPy backend for Edward2 is not available.")
+if "tensorflow" not in _AVAILABLE_BACKENDS:
   warnings.warn("TensorFlow backend for Edward2 is not available.")
+if not _AVAILABLE_BACKENDS:
+  raise ImportError("Neither NumPy nor TensorFlow backends are available for "
+                    "Edward2. Please install the dependencies for either of"
+                    "them.")
+
+
+def __getattr__(name):
+  if name in _AVAILABLE_BACKENDS:
+    return importlib.import_module("edward2." + name)
+  if name.startswith("__") and name != "__all__":
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__,
+                                                                    name))
+  if "tensorflow" in _AVAILABLE_BACKENDS:
+    # By default, `import edward2 as ed` uses the TensorFlow backend's
+    # namespace.
+    tensorflow = importlib.import_module("edward2.tensorflow")
+    if name == "__all__":
+      value = ["numpy"] if "numpy" in _AVAILABLE_BACKENDS else []
+      value += tensorflow.__all__ + ["tensorflow"]
+      globals()[name] = value
+      return value
+    elif name in tensorflow.__all__:
+      value = getattr(tensorflow, name)
+      globals()[name] = value
+      return value
+  elif name == "__all__":
+    return list(_AVAILABLE_BACKENDS)
+  raise AttributeError("module {!r} has no attribute {!r}".format(__name__,
+                                                                  name))
+
 
-try:
-  numpy
-except NameError:
-  try:
-    tensorflow
-  except NameError:
-    raise ImportError("Neither NumPy nor TensorFlow backends are available for "
-                      "Edward2. Please install the dependencies for either of"
-                      "them.")
-# pylint: enable=g-import-not-at-top
+def __dir__():
+  return sorted(set(globals()) | set(__getattr__("__all__")))
@@ -0,0 +1,51 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Utilities for benchmarks."""
+
+import time
+
+
+class ReportMixin(object):
+  """Mixin for benchmarks which times functions and reports their wall time.
+
+  It requires a `report_benchmark` method, e.g., of `tf.test.Benchmark`. It does
+  not import TensorFlow itself so that benchmarks of the NumPy backend can use
+  it.
+  """
+
+  def _report(self, name, fn, num_iters=10, extras=None,
+              report_first_call=False):
+    """Reports the mean wall time of calling `fn` after a warm-up call.
+
+    Args:
+      name: Name of the benchmark.
+      fn: Function to call without arguments.
+      num_iters: Number of timed calls.
+      extras: Optional dict of extra values to report.
+      report_first_call: Whether to also report the warm-up call's wall time,
+        e.g., including `tf.function` tracing, as `name + "_first_call"`.
+    """
+    start = time.time()
+    fn()  # Warm up, e.g., tf.function tracing.
+    if report_first_call:
+      self.report_benchmark(name=name + "_first_call", iters=1,
+                            wall_time=time.time() - start)
+    start = time.time()
+    for _ in range(num_iters):
+      fn()
+    wall_time = (time.time() - start) / num_iters
+    self.report_benchmark(name=name, iters=num_iters, wall_time=wall_time,
+                          extras=extras)
@@ -0,0 +1,61 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks for the time to import Edward2.
+
+Each statement runs in a fresh Python interpreter. Run with
+`python -m edward2.import_benchmark`.
+"""
+
+import subprocess
+import sys
+
+from absl import app
+
+_STATEMENTS = [
+    ("import_edward2", "import edward2 as ed"),
+    ("numpy_backend", "import edward2 as ed; ed.numpy.norm"),
+    ("tensorflow_random_variable", "import edward2 as ed; ed.Normal"),
+    ("tensorflow_layer",
+     "import edward2 as ed; ed.layers.DenseReparameterization"),
+    ("import_all", "from edward2 import *"),
+]
+
+_TIMER = """
+import time
+start = time.time()
+{}
+print(time.time() - start)
+"""
+
+
+def _time(statement, repeat=3):
+  times = []
+  for _ in range(repeat):
+    output = subprocess.check_output(
+        [sys.executable, "-c", _TIMER.format(statement)],
+        stderr=subprocess.DEVNULL)
+    times.append(float(output.decode().strip().splitlines()[-1]))
+  return min(times)
+
+
+def main(argv):
+  del argv  # unused
+  for name, statement in _STATEMENTS:
+    print("{}: {:.3f} s".format(name, _time(statement)))
+
+
+if __name__ == "__main__":
+  app.run(main)
@@ -0,0 +1,46 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for importing Edward2."""
+
+import subprocess
+import sys
+
+from absl.testing import absltest
+import edward2 as ed
+
+
+class ImportTest(absltest.TestCase):
+
+  def testImportDoesNotImportBackends(self):
+    # Run in a fresh interpreter, as other tests import the backends.
+    subprocess.run(
+        [sys.executable, "-c",
+         "import sys; import edward2; "
+         "assert 'tensorflow' not in sys.modules, 'tensorflow'; "
+         "assert 'scipy' not in sys.modules, 'scipy'"],
+        check=True)
+
+  def testAllNamesResolve(self):
+    for name in ed.__all__:
+      self.assertIsNotNone(getattr(ed, name), name)
+    for name in ed.layers.__all__:
+      self.assertIsNotNone(getattr(ed.layers, name), name)
+    for name in ed.numpy.__all__:
+      self.assertIsNotNone(getattr(ed.numpy, name), name)
+
+
+if __name__ == "__main__":
+  absltest.main()
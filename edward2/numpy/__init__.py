@@ -17,11 +17,15 @@
 
 from edward2.numpy import generated_random_variables
 from edward2.numpy.generated_random_variables import *  # pylint: disable=wildcard-import
+from edward2.numpy.program_transformations import make_batched_log_joint_fn
 from edward2.numpy.program_transformations import make_log_joint_fn
+from edward2.parallel import parallel_map
 from edward2.trace import get_next_tracer
 from edward2.trace import trace
 from edward2.trace import traceable
+from edward2.trace import use_thread_local_tracer_stack
 from edward2.tracers import condition
+from edward2.tracers import memoize
 from edward2.tracers import tape
 from edward2.version import __version__
 from edward2.version import VERSION
@@ -31,10 +35,14 @@ import scipy
 __all__ = [
     "condition",
     "get_next_tracer",
+    "make_batched_log_joint_fn",
     "make_log_joint_fn",
+    "memoize",
+    "parallel_map",
     "tape",
     "trace",
     "traceable",
+    "use_thread_local_tracer_stack",
     "__version__",
     "VERSION",
 ]
@@ -80,6 +80,8 @@ def make_log_joint_fn(model):
      `size` and `random_state` in the `rvs` method.
      TODO(trandustin): Relax this requirement.
   """
+  sites = _Sites()
+
   def log_joint_fn(*args, **kwargs):
     """Log-probability of inputs according to a joint probability distribution.
 
@@ -98,8 +100,12 @@ def make_log_joint_fn(model):
       TypeError: If a random variable in the model has no specified value in
         `**kwargs`.
     """
-    log_probs = []
+    # Preallocate a log-prob per site executed by previous calls. Sites beyond
+    # those, e.g., on the first call, are accumulated separately.
+    log_probs = np.zeros([len(sites)])
+    extra_log_probs = []
     args_counter = []
+    site_counter = []
 
     def tracer(rv_call, *rv_args, **rv_kwargs):
       """Overrides a random variable's `value` and accumulates its log-prob."""
@@ -111,32 +117,207 @@ def make_log_joint_fn(model):
         rv_name = rv_kwargs.get("name")
         if rv_name is None:
           raise KeyError("Random variable call {} has no name in its arguments."
-                         .format(rv_call.im_class.__name__))
+                         .format(_get_class(rv_call).__name__))
         value = kwargs.get(rv_name)
         if value is None:
           raise LookupError("Keyword argument specifying value for {} is "
                             "missing.".format(rv_name))
-      if sys.version_info < (3,):
-        cls = rv_call.im_class
+      site = len(site_counter)
+      site_counter.append(0)
+      log_prob_fn = sites.log_prob_fn(site, rv_call)
+      log_prob = np.sum(_log_prob(log_prob_fn, value, *rv_args, **rv_kwargs))
+      if site < len(log_probs):
+        log_probs[site] = log_prob
       else:
-        cls = rv_call.__self__.__class__
-      log_prob_fn = getattr(cls, "logpdf", getattr(cls, "logpmf", None))
-      rv_kwargs.pop("size", None)
-      rv_kwargs.pop("random_state", None)
-      rv_kwargs.pop("name", None)
-      log_prob = np.sum(log_prob_fn(cls(), value, *rv_args, **rv_kwargs))
-      log_probs.append(log_prob)
+        extra_log_probs.append(log_prob)
       return value
 
     args, model_args, model_kwargs = _get_function_inputs(
         model, *args, **kwargs)
     with trace(tracer):
       model(*model_args, **model_kwargs)
-    log_prob = sum(log_probs)
+    log_prob = np.sum(log_probs) + sum(extra_log_probs)
     return log_prob
   return log_joint_fn
 
 
+def make_batched_log_joint_fn(model, broadcast=False):
+  """Takes Edward2 probabilistic program and returns its batched log joint.
+
+  The batched log-joint function evaluates many settings of the random
+  variables at once: each random variable's value carries an additional
+  leading sample dimension, and the output is a vector of log-joints, one per
+  sample.
+
+  Args:
+    model: Python callable which executes the generative process of a
+      computable probability distribution using Edward2 random variables.
+    broadcast: Whether to evaluate all samples in a single execution of
+      `model`, relying on `model`'s computation and the scipy log-densities to
+      broadcast over the leading sample dimension. Only set this if `model` is
+      written to broadcast: a model whose computation silently mixes samples
+      (e.g., aligning the sample dimension with a data dimension of equal size)
+      produces incorrect log-joints. If a random variable's log-density does
+      not broadcast over the sample dimension, the batched log-joint falls
+      back to executing `model` once per sample.
+
+  Returns:
+    A batched log-joint probability function. Its inputs are `model`'s
+    original inputs, which are shared across samples, and random variables
+    which appear during the program execution as keyword arguments, each with
+    a leading sample dimension of equal size. Its output is a `np.ndarray` of
+    shape `[num_samples]`.
+
+  #### Examples
+
+  ```python
+  import edward2.numpy as ed
+
+  def model(X):
+    beta = ed.norm.rvs(loc=0., scale=0.1, size=X.shape[1], name="beta")
+    loc = np.einsum('ij,...j->...i', X, beta)
+    y = ed.norm.rvs(loc=loc, scale=1., name="y")
+    return y
+
+  batched_log_joint = ed.make_batched_log_joint_fn(model, broadcast=True)
+
+  X = np.random.normal(size=[3, 2])
+  beta = np.random.normal(size=[1000, 2])
+  y = np.random.normal(size=[1000, 3])
+  out = batched_log_joint(X, y=y, beta=beta)
+  assert out.shape == (1000,)
+  ```
+  """
+  log_joint_fn = make_log_joint_fn(model)
+  sites = _Sites()
+
+  def batched_log_joint_fn(*args, **kwargs):
+    """Log-probabilities of inputs with a leading sample dimension.
+
+    Args:
+      *args: Positional arguments. They are the model's original inputs.
+      **kwargs: Keyword arguments, where for each key-value pair `k` and `v`,
+        `v[i]` is passed as a `value` to the random variable(s) whose keyword
+        argument `name` during construction is equal to `k` when evaluating
+        the `i`th sample. Keyword arguments which are the model's original
+        inputs have no sample dimension.
+
+    Returns:
+      `np.ndarray` of shape `[num_samples]`, which represents the model's
+      log-probability summed over all Edward2 random variables and their
+      dimensions for each sample.
+
+    Raises:
+      TypeError: If a random variable in the model has no specified value in
+        `**kwargs`.
+      ValueError: If no random variable values are passed in `**kwargs`.
+    """
+    _, model_args, model_kwargs = _get_function_inputs(model, *args, **kwargs)
+    values = {k: np.asarray(v) for k, v in kwargs.items()
+              if k not in model_kwargs}
+    if not values:
+      raise ValueError("Batched log-joint requires values of random variables "
+                       "as keyword arguments.")
+    num_samples = len(next(iter(values.values())))
+
+    log_probs = np.zeros([num_samples])
+    if broadcast:
+      site_counter = []
+
+      def tracer(rv_call, *rv_args, **rv_kwargs):
+        """Overrides a random variable's `value` and accumulates log-probs."""
+        rv_name = rv_kwargs.get("name")
+        if rv_name is None:
+          raise KeyError("Random variable call {} has no name in its "
+                         "arguments.".format(_get_class(rv_call).__name__))
+        value = values.get(rv_name)
+        if value is None:
+          raise LookupError("Keyword argument specifying value for {} is "
+                            "missing.".format(rv_name))
+        site = len(site_counter)
+        site_counter.append(0)
+        log_prob_fn = sites.log_prob_fn(site, rv_call)
+        try:
+          log_prob = np.asarray(
+              _log_prob(log_prob_fn, value, *rv_args, **rv_kwargs))
+        except ValueError as e:
+          raise _BroadcastError(
+              "Log-probability of {} does not broadcast over the sample "
+              "dimension: {}".format(rv_name, e))
+        if log_prob.ndim == 0 or log_prob.shape[0] != num_samples:
+          raise _BroadcastError(
+              "Log-probability of {} with shape {} does not broadcast over "
+              "the sample dimension.".format(rv_name, log_prob.shape))
+        log_probs[:] += np.sum(log_prob.reshape([num_samples, -1]), axis=1)
+        return value
+
+      try:
+        with trace(tracer):
+          model(*model_args, **model_kwargs)
+        return log_probs
+      except _BroadcastError:
+        log_probs[:] = 0.
+
+    for i in range(num_samples):
+      sample_kwargs = dict(model_kwargs)
+      sample_kwargs.update({k: v[i] for k, v in values.items()})
+      log_probs[i] = log_joint_fn(*model_args, **sample_kwargs)
+    return log_probs
+  return batched_log_joint_fn
+
+
+class _BroadcastError(ValueError):
+  """Raised when a log-density does not broadcast over the sample dimension."""
+
+
+class _Sites(object):
+  """Log-density functions of a model's random variables, resolved once.
+
+  Sites are indexed in execution order. Each site's log-density function is
+  resolved on the first execution and reused by later executions for as long
+  as the same distribution executes at that site.
+  """
+
+  def __init__(self):
+    self._rv_calls = []
+    self._log_prob_fns = []
+
+  def __len__(self):
+    return len(self._rv_calls)
+
+  def log_prob_fn(self, site, rv_call):
+    """Returns the log-density function of `rv_call` executed at `site`."""
+    if site < len(self._rv_calls) and self._rv_calls[site] is rv_call:
+      return self._log_prob_fns[site]
+    # Bind the log-density to the distribution instance that `rvs` is bound to,
+    # instead of instantiating the class, which is expensive in scipy.
+    distribution = rv_call.__self__
+    log_prob_fn = getattr(distribution, "logpdf",
+                          getattr(distribution, "logpmf", None))
+    if site < len(self._rv_calls):
+      self._rv_calls[site] = rv_call
+      self._log_prob_fns[site] = log_prob_fn
+    else:
+      self._rv_calls.append(rv_call)
+      self._log_prob_fns.append(log_prob_fn)
+    return log_prob_fn
+
+
+def _log_prob(log_prob_fn, value, *rv_args, **rv_kwargs):
+  """Returns `log_prob_fn` of `value` given a random variable's arguments."""
+  rv_kwargs.pop("size", None)
+  rv_kwargs.pop("random_state", None)
+  rv_kwargs.pop("name", None)
+  return log_prob_fn(value, *rv_args, **rv_kwargs)
+
+
+def _get_class(rv_call):
+  """Returns the scipy.stats distribution class of the `rvs` method."""
+  if sys.version_info < (3,):
+    return rv_call.im_class
+  return rv_call.__self__.__class__
+
+
 def _get_function_inputs(f, *args, **kwargs):
   """Filters inputs to be compatible with function `f`'s signature.
 
@@ -149,12 +330,15 @@ def _get_function_inputs(f, *args, **kwargs):
     New original args, args of f, kwargs of f.
   """
   if hasattr(f, "_func"):  # functions returned by tf.make_template
-    argspec = inspect.getargspec(f._func)  # pylint: disable=protected-access
-  else:
+    f = f._func  # pylint: disable=protected-access
+
+  try:  # getargspec was deprecated in Python 3.6
+    argspec = inspect.getfullargspec(f)  # pytype: disable=module-attr
+  except AttributeError:
     argspec = inspect.getargspec(f)
 
   fkwargs = {}
-  for k, v in kwargs.items():
+  for k, v in list(kwargs.items()):
     if k in argspec.args:
       fkwargs[k] = v
       kwargs.pop(k)
@@ -0,0 +1,82 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks for program transformations.
+
+The NumPy backend does not depend on TensorFlow, so this mirrors the methods of
+`tf.test.Benchmark` without it. Run with `python -m
+edward2.numpy.program_transformations_benchmark --benchmark_filter=.`.
+"""
+
+import re
+
+from absl import app
+from absl import flags
+from edward2 import benchmark_utils
+import edward2.numpy as ed
+import numpy as np
+
+flags.DEFINE_string("benchmark_filter", ".",
+                    "Regular expression of the benchmark methods to run.")
+FLAGS = flags.FLAGS
+
+
+def linear_regression(features):
+  beta = ed.norm.rvs(loc=0., scale=1., size=features.shape[1], name="beta")
+  loc = np.einsum("ij,...j->...i", features, beta)
+  y = ed.norm.rvs(loc=loc, scale=1., name="y")
+  return y
+
+
+class ProgramTransformationsBenchmark(benchmark_utils.ReportMixin):
+
+  def report_benchmark(self, name, iters, wall_time, extras=None):
+    print("{}: iters={} wall_time={:.3e}s extras={}".format(
+        name, iters, wall_time, extras))
+
+  def benchmarkLogJoint(self):
+    features = np.random.normal(size=[100, 5])
+    log_joint = ed.make_log_joint_fn(linear_regression)
+    beta = np.random.normal(size=[5])
+    y = np.random.normal(size=[100])
+    self._report("log_joint",
+                 lambda: log_joint(features, beta=beta, y=y),
+                 num_iters=1000)
+
+  def benchmarkBatchedLogJoint(self):
+    features = np.random.normal(size=[100, 5])
+    for num_samples in [10, 100, 1000]:
+      beta = np.random.normal(size=[num_samples, 5])
+      y = np.random.normal(size=[num_samples, 100])
+      for broadcast in [False, True]:
+        batched_log_joint = ed.make_batched_log_joint_fn(linear_regression,
+                                                         broadcast=broadcast)
+        self._report(
+            "batched_log_joint_{}_broadcast_{}".format(num_samples, broadcast),
+            lambda: batched_log_joint(features, beta=beta, y=y),  # pylint: disable=cell-var-from-loop
+            num_iters=10)
+
+
+def main(argv):
+  del argv  # unused
+  benchmark = ProgramTransformationsBenchmark()
+  for name in sorted(dir(benchmark)):
+    if name.startswith("benchmark") and re.search(FLAGS.benchmark_filter,
+                                                  name):
+      getattr(benchmark, name)()
+
+
+if __name__ == "__main__":
+  app.run(main)
@@ -0,0 +1,83 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Parallel execution of Edward2 programs."""
+
+import concurrent.futures
+import functools
+
+from edward2.trace import get_active_tracers
+from edward2.trace import set_active_tracers
+from edward2.tracers import tape
+
+
+def parallel_map(model, inputs, executor=None, record_tape=False):
+  """Executes `model` on each input in parallel under the current tracers.
+
+  The tracer stack is local to each thread, so that models executed by worker
+  threads or processes do not see the tracers active in the caller, e.g.,
+  `condition`. `parallel_map` snapshots the caller's tracers and re-installs
+  them in each worker before executing the model.
+
+  Args:
+    model: Python callable which executes the generative process of a
+      computable probability distribution using Edward2 random variables. It
+      takes a single input.
+    inputs: Iterable of inputs to `model`.
+    executor: Optional `concurrent.futures.Executor` to execute the model with.
+      With a `ProcessPoolExecutor`, `model`, the inputs, the active tracers
+      and the outputs must be picklable; `condition` is picklable if its values
+      are. Default is a `ThreadPoolExecutor` with default number of workers.
+    record_tape: Whether to record each execution with `tape`.
+
+  Returns:
+    List of `model`'s outputs, one per input and in order of `inputs`. If
+    `record_tape`, each element is a tuple of the output and the tape.
+
+  #### Examples
+
+  Draw from the posterior predictive given posterior samples of `w`.
+
+  ```python
+  import edward2.numpy as ed
+
+  def linear_regression(features):
+    w = ed.norm.rvs(loc=0., scale=1., size=features.shape[1], name="w")
+    y = ed.norm.rvs(loc=features.dot(w), scale=1., name="y")
+    return y
+
+  features = [np.random.normal(size=[100, 5]) for _ in range(10)]
+  with ed.condition(w=posterior_sample):
+    outputs = ed.parallel_map(linear_regression, features)
+  ```
+  """
+  tracers = get_active_tracers()
+  run = functools.partial(_call_with_tracers, model, tracers, record_tape)
+  if executor is None:
+    with concurrent.futures.ThreadPoolExecutor() as default_executor:
+      return list(default_executor.map(run, inputs))
+  return list(executor.map(run, inputs))
+
+
+def _call_with_tracers(model, tracers, record_tape, model_input):
+  """Calls `model` with the worker's tracer stack set to `tracers`."""
+  # Replace rather than extend the stack, in case the executor runs the call
+  # in a context which already has the tracers installed.
+  with set_active_tracers(tracers):
+    if record_tape:
+      with tape() as model_tape:
+        output = model(model_input)
+      return output, model_tape
+    return model(model_input)
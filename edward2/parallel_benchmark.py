@@ -0,0 +1,73 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks for parallel execution of Edward2 programs.
+
+Run with `python -m edward2.parallel_benchmark`.
+"""
+
+import concurrent.futures
+import multiprocessing
+import os
+import time
+
+from absl import app
+import edward2 as ed
+import tensorflow as tf
+
+
+def hierarchical_model(num_groups):
+  loc = ed.Normal(loc=0., scale=1., name="loc")
+  group_locs = ed.Normal(loc=loc, scale=1., sample_shape=num_groups,
+                         name="group_locs")
+  y = ed.Normal(loc=tf.repeat(group_locs, 10000), scale=1., name="y")
+  # Return a NumPy array so that outputs of process workers are picklable.
+  return tf.reduce_mean(y).numpy()
+
+
+def _time(executor, num_runs):
+  start = time.time()
+  with ed.condition(loc=0.5):
+    ed.parallel_map(hierarchical_model, [100] * num_runs, executor=executor)
+  return time.time() - start
+
+
+def _process_pool_executor(num_workers):
+  # TensorFlow does not support forking after it is initialized.
+  return concurrent.futures.ProcessPoolExecutor(
+      num_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def main(argv):
+  del argv  # unused
+  num_runs = 64
+  _time(concurrent.futures.ThreadPoolExecutor(1), 1)  # Warm up.
+  serial_time = _time(concurrent.futures.ThreadPoolExecutor(1), num_runs)
+  print("serial: {:.3f} s".format(serial_time))
+  num_workers = 1
+  while num_workers <= (os.cpu_count() or 1):
+    for name, executor_cls in [
+        ("threads", concurrent.futures.ThreadPoolExecutor),
+        ("processes", _process_pool_executor)]:
+      with executor_cls(num_workers) as executor:
+        _time(executor, num_workers)  # Warm up workers.
+        wall_time = _time(executor, num_runs)
+      print("{}_{}: {:.3f} s (speedup {:.1f}x)".format(
+          name, num_workers, wall_time, serial_time / wall_time))
+    num_workers *= 2
+
+
+if __name__ == "__main__":
+  app.run(main)
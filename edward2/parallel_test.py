@@ -0,0 +1,76 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for parallel execution."""
+
+import concurrent.futures
+import pickle
+
+import edward2 as ed
+import tensorflow as tf
+
+
+class _SynchronousExecutor(concurrent.futures.Executor):
+  """Executor which runs calls in the calling thread."""
+
+  def submit(self, fn, *args, **kwargs):
+    future = concurrent.futures.Future()
+    future.set_result(fn(*args, **kwargs))
+    return future
+
+
+def model(loc):
+  x = ed.Normal(loc=loc, scale=1., name="x")
+  y = ed.Normal(loc=x, scale=1e-8, name="y")
+  return y
+
+
+class ParallelTest(tf.test.TestCase):
+
+  def testParallelMapCondition(self):
+    with ed.condition(x=5.):
+      outputs = ed.parallel_map(model, [0., 1., 2., 3.])
+    self.assertLen(outputs, 4)
+    for output in outputs:
+      self.assertAllClose(tf.convert_to_tensor(output), 5., atol=1e-3)
+
+  def testParallelMapTape(self):
+    with ed.condition(x=5.):
+      outputs = ed.parallel_map(model, [0., 1.], record_tape=True)
+    for output, model_tape in outputs:
+      self.assertEqual(list(model_tape.keys()), ["x", "y"])
+      self.assertEqual(model_tape["x"], 5.)
+      self.assertEqual(model_tape["y"], output)
+
+  def testParallelMapExecutor(self):
+    def double(f, *args, **kwargs):
+      return 2. * ed.traceable(f)(*args, **kwargs)
+
+    with ed.condition(x=5.):
+      with ed.trace(double):
+        outputs = ed.parallel_map(model, [0., 1.],
+                                  executor=_SynchronousExecutor())
+    # `y` is doubled, as is `x` before being passed to `y`'s location.
+    for output in outputs:
+      self.assertAllClose(output, 20., atol=1e-3)
+
+  def testConditionIsPicklable(self):
+    with ed.condition(x=5.):
+      with ed.get_next_tracer() as tracer:
+        pickle.dumps(tracer)
+
+
+if __name__ == "__main__":
+  tf.test.main()
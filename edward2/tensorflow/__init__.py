@@ -15,26 +15,29 @@
 
 """Edward2 probabilistic programming language with TensorFlow backend."""
 
+import importlib
+
+from edward2.parallel import parallel_map
 from edward2.tensorflow import constraints
 from edward2.tensorflow import generated_random_variables
 from edward2.tensorflow import initializers
-from edward2.tensorflow import layers
 from edward2.tensorflow import regularizers
-from edward2.tensorflow.generated_random_variables import *  # pylint: disable=wildcard-import
 from edward2.tensorflow.generated_random_variables import make_random_variable
+from edward2.tensorflow.plates import plate
+from edward2.tensorflow.program_transformations import make_batched_log_joint_fn
 from edward2.tensorflow.program_transformations import make_log_joint_fn
 from edward2.tensorflow.random_variable import RandomVariable
 from edward2.tensorflow.transformed_random_variable import TransformedRandomVariable
 from edward2.trace import get_next_tracer
 from edward2.trace import trace
 from edward2.trace import traceable
+from edward2.trace import use_thread_local_tracer_stack
 from edward2.tracers import condition
+from edward2.tracers import memoize
 from edward2.tracers import tape
 from edward2.version import __version__
 from edward2.version import VERSION
 
-import tensorflow_probability as tfp
-
 __all__ = [
     "RandomVariable",
     "TransformedRandomVariable",
@@ -43,15 +46,30 @@ __all__ = [
     "get_next_tracer",
     "initializers",
     "layers",
+    "make_batched_log_joint_fn",
     "make_log_joint_fn",
     "make_random_variable",
+    "memoize",
+    "parallel_map",
+    "plate",
     "regularizers",
     "tape",
     "trace",
     "traceable",
+    "use_thread_local_tracer_stack",
     "__version__",
     "VERSION",
 ]
-for name in dir(generated_random_variables):
-  if name in sorted(dir(tfp.distributions)):
-    __all__.append(name)
+__all__ += [name for name in generated_random_variables.__all__
+            if name != "make_random_variable"]
+
+
+def __getattr__(name):
+  # Import layers on first access as they comprise many large modules.
+  if name == "layers":
+    return importlib.import_module("edward2.tensorflow.layers")
+  # Random variables are made on first access.
+  if name in generated_random_variables.__all__:
+    return getattr(generated_random_variables, name)
+  raise AttributeError("module {!r} has no attribute {!r}".format(__name__,
+                                                                  name))
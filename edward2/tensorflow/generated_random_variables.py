@@ -21,6 +21,7 @@ import re
 
 from edward2.tensorflow.random_variable import RandomVariable
 from edward2.trace import traceable
+import tensorflow as tf
 import tensorflow_probability as tfp
 
 
@@ -48,9 +49,19 @@ def expand_docstring(**kwargs):
   return _fn_wrapped
 
 
+def _broadcast_batch_shape(distribution, plate_shape):
+  """Broadcasts the distribution's batch shape against `plate_shape`."""
+  batch_shape = distribution.batch_shape
+  if batch_shape.is_fully_defined():
+    shape = tf.broadcast_static_shape(batch_shape,
+                                      tf.TensorShape(plate_shape))
+    if shape == batch_shape:
+      return distribution
+  return tfp.distributions.BatchBroadcast(distribution, with_shape=plate_shape)
+
+
 def make_random_variable(distribution_cls):
   """Factory function to make random variable given distribution class."""
-  @traceable
   @functools.wraps(distribution_cls, assigned=("__module__", "__name__"))
   @expand_docstring(cls=distribution_cls.__name__,
                     doc=inspect.cleandoc(
@@ -60,7 +71,10 @@ def make_random_variable(distribution_cls):
     # pylint: disable=g-doc-args
     """Create a random variable for ${cls}.
 
-    See ${cls} for more details.
+    See ${cls} for more details. In addition to the distribution's arguments,
+    the random variable takes the `sample_shape`, `value` and `lazy` arguments
+    of `ed.RandomVariable`, and a `plate_shape` argument set by `ed.plate` to
+    broadcast the distribution's batch shape.
 
     Returns:
       RandomVariable.
@@ -72,21 +86,46 @@ def make_random_variable(distribution_cls):
     # pylint: enable=g-doc-args
     sample_shape = kwargs.pop("sample_shape", ())
     value = kwargs.pop("value", None)
-    return RandomVariable(distribution=distribution_cls(*args, **kwargs),
+    lazy = kwargs.pop("lazy", False)
+    plate_shape = kwargs.pop("plate_shape", None)
+    distribution = distribution_cls(*args, **kwargs)
+    if plate_shape is not None:
+      distribution = _broadcast_batch_shape(distribution, plate_shape)
+    return RandomVariable(distribution=distribution,
                           sample_shape=sample_shape,
-                          value=value)
-  return func
+                          value=value,
+                          lazy=lazy)
+
+  # Lets `ed.plate` batch the random variable via the `plate_shape` argument.
+  func.accepts_plate_shape = True
+  return traceable(func)
+
+
+def _is_distribution(candidate):
+  return (inspect.isclass(candidate) and
+          candidate != tfp.distributions.Distribution and
+          issubclass(candidate, tfp.distributions.Distribution))
+
+
+# Random variables are made on first access, e.g., `ed.Normal`, rather than for
+# all distributions at import.
+__all__ = ["make_random_variable"] + [
+    candidate_name for candidate_name in sorted(dir(tfp.distributions))
+    if _is_distribution(getattr(tfp.distributions, candidate_name))]
+_DISTRIBUTION_NAMES = frozenset(__all__[1:])
+
+
+def __getattr__(name):
+  if name in _DISTRIBUTION_NAMES:
+    value = make_random_variable(getattr(tfp.distributions, name))
+    globals()[name] = value
+    return value
+  raise AttributeError("module {!r} has no attribute {!r}".format(__name__,
+                                                                  name))
 
 
-__all__ = ["make_random_variable"]
-_globals = globals()
-for candidate_name in sorted(dir(tfp.distributions)):
-  candidate = getattr(tfp.distributions, candidate_name)
-  if (inspect.isclass(candidate) and
-      candidate != tfp.distributions.Distribution and
-      issubclass(candidate, tfp.distributions.Distribution)):
+def __dir__():
+  return sorted(set(globals()) | set(__all__))
 
-    _globals[candidate_name] = make_random_variable(candidate)
-    __all__.append(candidate_name)
 
 _HAS_DYNAMIC_ATTRIBUTES = True
@@ -32,6 +32,15 @@ class GeneratedRandomVariablesTest(parameterized.TestCase, tf.test.TestCase):
         ed.Bernoulli.__doc__)
     self.assertEqual(ed.Bernoulli.__name__, "Bernoulli")
 
+  def testRandomVariableMadeOnAccess(self):
+    custom_normal = ed.make_random_variable(tfp.distributions.Normal)
+    self.assertTrue(inspect.isfunction(custom_normal))
+    self.assertIn("Normal", custom_normal.__doc__)
+    self.assertIs(ed.Normal, ed.Normal)
+    self.assertIn("Normal", dir(ed))
+    with self.assertRaises(AttributeError):
+      _ = ed.NotADistribution
+
   @parameterized.named_parameters(
       {"testcase_name": "1d_rv_1d_event", "logits": np.zeros(1), "n": [1]},
       {"testcase_name": "1d_rv_5d_event", "logits": np.zeros(1), "n": [5]},
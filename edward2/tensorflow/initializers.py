@@ -59,6 +59,7 @@ def get_condconv_initializer(initializer, num_experts, expert_shape):
   """
   def condconv_initializer(expected_shape, dtype=None, partition=None):
     """CondConv initializer function."""
+    del partition  # unused
     num_params = np.prod(expert_shape)
     if (len(expected_shape) != 2 or expected_shape[0] != num_experts or
         expected_shape[1] != num_params):
@@ -66,7 +67,7 @@ def get_condconv_initializer(initializer, num_experts, expert_shape):
           'CondConv variables must have shape [num_experts, num_params]'))
     flattened_kernels = []
     for _ in range(num_experts):
-      kernel = initializer(expert_shape, dtype, partition)
+      kernel = initializer(expert_shape, dtype)
       flattened_kernels.append(tf.reshape(kernel, [-1]))
     return tf.stack(flattened_kernels)
 
@@ -455,8 +456,24 @@ class TrainableNormal(tf.keras.layers.Layer):
                mean_constraint=None,
                stddev_constraint='softplus',
                seed=None,
+               lazy=False,
                **kwargs):
-    """Constructs the initializer."""
+    """Constructs the initializer.
+
+    Args:
+      mean_initializer: Initializer for the mean.
+      stddev_initializer: Initializer for the stddev before its constraint.
+      mean_regularizer: Regularizer for the mean.
+      stddev_regularizer: Regularizer for the stddev.
+      mean_constraint: Constraint for the mean.
+      stddev_constraint: Constraint for the stddev.
+      seed: Random seed.
+      lazy: Whether the returned random variables defer sampling until their
+        value is first accessed. Layers which use only the distribution, e.g.,
+        its moments for local reparameterization, set it to avoid drawing
+        unused weight samples.
+      **kwargs: Keyword arguments to pass to `tf.keras.layers.Layer`.
+    """
     super(TrainableNormal, self).__init__(**kwargs)
     self.mean_initializer = get(mean_initializer)
     self.stddev_initializer = get(stddev_initializer)
@@ -465,6 +482,7 @@ class TrainableNormal(tf.keras.layers.Layer):
     self.mean_constraint = constraints.get(mean_constraint)
     self.stddev_constraint = constraints.get(stddev_constraint)
     self.seed = seed
+    self.lazy = lazy
 
   def build(self, shape, dtype=None):
     if dtype is None:
@@ -498,8 +516,10 @@ class TrainableNormal(tf.keras.layers.Layer):
     if self.stddev_constraint:
       stddev = self.stddev_constraint(stddev)
     return generated_random_variables.Independent(
-        generated_random_variables.Normal(loc=mean, scale=stddev).distribution,
-        reinterpreted_batch_ndims=len(shape))
+        generated_random_variables.Normal(
+            loc=mean, scale=stddev, lazy=True).distribution,
+        reinterpreted_batch_ndims=len(shape),
+        lazy=self.lazy)
 
   def get_config(self):
     return {
@@ -516,6 +536,7 @@ class TrainableNormal(tf.keras.layers.Layer):
         'stddev_constraint':
             constraints.serialize(self.stddev_constraint),
         'seed': self.seed,
+        'lazy': self.lazy,
     }
 
 
@@ -542,6 +563,7 @@ class TrainableHeNormal(TrainableNormal):
   def get_config(self):
     return {
         'seed': self.seed,
+        'lazy': self.lazy,
     }
 
 
@@ -568,6 +590,7 @@ class TrainableGlorotNormal(TrainableNormal):
   def get_config(self):
     return {
         'seed': self.seed,
+        'lazy': self.lazy,
     }
 
 
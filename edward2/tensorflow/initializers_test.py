@@ -85,6 +85,30 @@ class InitializersTest(tf.test.TestCase):
                         atol=5e-2)
     self.assertEqual(normal.shape, shape)
 
+  def testTrainableNormalLazy(self):
+    shape = (100,)
+    self.assertIsNotNone(ed.initializers.TrainableNormal()(shape)._value)
+    initializer = ed.initializers.TrainableNormal(lazy=True)
+    normal = initializer(shape)
+    self.assertIsNone(normal._value)
+    self.assertEqual(normal.value.shape, shape)
+    self.assertTrue(initializer.get_config()['lazy'])
+
+    # Only layers which use the kernel's moments opt in.
+    layer = ed.layers.DenseReparameterization(4)
+    self.assertFalse(layer.kernel_initializer.lazy)
+    layer = ed.layers.DenseReparameterization(4, local_reparameterization=True)
+    self.assertTrue(layer.kernel_initializer.lazy)
+
+    # Layers copy a shared initializer rather than modify it.
+    initializer = ed.initializers.TrainableHeNormal()
+    layer = ed.layers.DenseReparameterization(
+        4, kernel_initializer=initializer, local_reparameterization=True)
+    self.assertFalse(initializer.lazy)
+    self.assertIsInstance(layer.kernel_initializer,
+                          ed.initializers.TrainableHeNormal)
+    self.assertTrue(layer.kernel_initializer.lazy)
+
   def testTrainableMixtureOfDeltas(self):
     tf.random.set_seed(345689)
     shape = (100,)
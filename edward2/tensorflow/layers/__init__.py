@@ -13,110 +13,93 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Layers."""
+"""Layers.
 
-from edward2.tensorflow.layers import utils
-from edward2.tensorflow.layers.bayesian_linear_model import BayesianLinearModel
-from edward2.tensorflow.layers.convolutional import CondConv2D
-from edward2.tensorflow.layers.convolutional import Conv1DBatchEnsemble
-from edward2.tensorflow.layers.convolutional import Conv1DFlipout
-from edward2.tensorflow.layers.convolutional import Conv1DRank1
-from edward2.tensorflow.layers.convolutional import Conv1DReparameterization
-from edward2.tensorflow.layers.convolutional import Conv2DBatchEnsemble
-from edward2.tensorflow.layers.convolutional import Conv2DFlipout
-from edward2.tensorflow.layers.convolutional import Conv2DHierarchical
-from edward2.tensorflow.layers.convolutional import Conv2DHyperBatchEnsemble
-from edward2.tensorflow.layers.convolutional import Conv2DRank1
-from edward2.tensorflow.layers.convolutional import Conv2DReparameterization
-from edward2.tensorflow.layers.convolutional import Conv2DVariationalDropout
-from edward2.tensorflow.layers.convolutional import DepthwiseCondConv2D
-from edward2.tensorflow.layers.convolutional import DepthwiseConv2DBatchEnsemble
-from edward2.tensorflow.layers.dense import DenseBatchEnsemble
-from edward2.tensorflow.layers.dense import DenseDVI
-from edward2.tensorflow.layers.dense import DenseFlipout
-from edward2.tensorflow.layers.dense import DenseHierarchical
-from edward2.tensorflow.layers.dense import DenseHyperBatchEnsemble
-from edward2.tensorflow.layers.dense import DenseRank1
-from edward2.tensorflow.layers.dense import DenseReparameterization
-from edward2.tensorflow.layers.dense import DenseVariationalDropout
-from edward2.tensorflow.layers.discrete_flows import DiscreteAutoregressiveFlow
-from edward2.tensorflow.layers.discrete_flows import DiscreteBipartiteFlow
-from edward2.tensorflow.layers.discrete_flows import Reverse
-from edward2.tensorflow.layers.discrete_flows import SinkhornAutoregressiveFlow
-from edward2.tensorflow.layers.embeddings import EmbeddingReparameterization
-from edward2.tensorflow.layers.gaussian_process import ExponentiatedQuadratic
-from edward2.tensorflow.layers.gaussian_process import GaussianProcess
-from edward2.tensorflow.layers.gaussian_process import LinearKernel
-from edward2.tensorflow.layers.gaussian_process import SparseGaussianProcess
-from edward2.tensorflow.layers.gaussian_process import Zeros
-from edward2.tensorflow.layers.made import MADE
-from edward2.tensorflow.layers.neural_process import Attention
-from edward2.tensorflow.layers.neural_process import NeuralProcess
-from edward2.tensorflow.layers.noise import NCPCategoricalPerturb
-from edward2.tensorflow.layers.noise import NCPNormalOutput
-from edward2.tensorflow.layers.noise import NCPNormalPerturb
-from edward2.tensorflow.layers.normalization import ActNorm
-from edward2.tensorflow.layers.normalization import ensemble_batchnorm
-from edward2.tensorflow.layers.normalization import EnsembleSyncBatchNorm
-from edward2.tensorflow.layers.normalization import SpectralNormalization
-from edward2.tensorflow.layers.normalization import SpectralNormalizationConv2D
-from edward2.tensorflow.layers.random_feature import LaplaceRandomFeatureCovariance
-from edward2.tensorflow.layers.random_feature import RandomFeatureGaussianProcess
-from edward2.tensorflow.layers.recurrent import LSTMCellFlipout
-from edward2.tensorflow.layers.recurrent import LSTMCellRank1
-from edward2.tensorflow.layers.recurrent import LSTMCellReparameterization
-from edward2.tensorflow.layers.stochastic_output import MixtureLogistic
+Layers are imported lazily on first access, e.g., `ed.layers.DenseFlipout`, so
+that importing Edward2 does not import every layer module.
+"""
 
-__all__ = [
-    "ActNorm",
-    "Attention",
-    "BayesianLinearModel",
-    "CondConv2D",
-    "Conv1DBatchEnsemble",
-    "Conv1DFlipout",
-    "Conv1DRank1",
-    "Conv1DReparameterization",
-    "Conv2DBatchEnsemble",
-    "Conv2DFlipout",
-    "Conv2DHierarchical",
-    "Conv2DHyperBatchEnsemble",
-    "Conv2DRank1",
-    "Conv2DReparameterization",
-    "Conv2DVariationalDropout",
-    "DenseBatchEnsemble",
-    "DenseDVI",
-    "DenseFlipout",
-    "DenseHierarchical",
-    "DenseHyperBatchEnsemble",
-    "DenseReparameterization",
-    "DenseRank1",
-    "DenseVariationalDropout",
-    "DepthwiseCondConv2D",
-    "DepthwiseConv2DBatchEnsemble",
-    "DiscreteAutoregressiveFlow",
-    "DiscreteBipartiteFlow",
-    "ExponentiatedQuadratic",
-    "EmbeddingReparameterization",
-    "EnsembleSyncBatchNorm",
-    "GaussianProcess",
-    "LaplaceRandomFeatureCovariance",
-    "LinearKernel",
-    "LSTMCellFlipout",
-    "LSTMCellRank1",
-    "LSTMCellReparameterization",
-    "MADE",
-    "MixtureLogistic",
-    "NCPCategoricalPerturb",
-    "NCPNormalOutput",
-    "NCPNormalPerturb",
-    "NeuralProcess",
-    "RandomFeatureGaussianProcess",
-    "Reverse",
-    "SinkhornAutoregressiveFlow",
-    "SparseGaussianProcess",
-    "SpectralNormalization",
-    "SpectralNormalizationConv2D",
-    "Zeros",
-    "ensemble_batchnorm",
-    "utils",
-]
+import importlib
+
+# Maps each public layer to the submodule defining it.
+_LAYER_MODULES = {
+    "ActNorm": "normalization",
+    "Attention": "neural_process",
+    "BayesianLinearModel": "bayesian_linear_model",
+    "CondConv2D": "convolutional",
+    "Conv1DBatchEnsemble": "convolutional",
+    "Conv1DFlipout": "convolutional",
+    "Conv1DRank1": "convolutional",
+    "Conv1DReparameterization": "convolutional",
+    "Conv2DBatchEnsemble": "convolutional",
+    "Conv2DFlipout": "convolutional",
+    "Conv2DHierarchical": "convolutional",
+    "Conv2DHyperBatchEnsemble": "convolutional",
+    "Conv2DRank1": "convolutional",
+    "Conv2DReparameterization": "convolutional",
+    "Conv2DVariationalDropout": "convolutional",
+    "DenseBatchEnsemble": "dense",
+    "DenseDVI": "dense",
+    "DenseFlipout": "dense",
+    "DenseHierarchical": "dense",
+    "DenseHyperBatchEnsemble": "dense",
+    "DenseRank1": "dense",
+    "DenseReparameterization": "dense",
+    "DenseVariationalDropout": "dense",
+    "DepthwiseCondConv2D": "convolutional",
+    "DepthwiseConv2DBatchEnsemble": "convolutional",
+    "DiscreteAutoregressiveFlow": "discrete_flows",
+    "DiscreteBipartiteFlow": "discrete_flows",
+    "EmbeddingReparameterization": "embeddings",
+    "ensemble_batchnorm": "normalization",
+    "EnsembleSyncBatchNorm": "normalization",
+    "ExponentiatedQuadratic": "gaussian_process",
+    "GaussianProcess": "gaussian_process",
+    "LaplaceRandomFeatureCovariance": "random_feature",
+    "LinearKernel": "gaussian_process",
+    "LSTMCellFlipout": "recurrent",
+    "LSTMCellRank1": "recurrent",
+    "LSTMCellReparameterization": "recurrent",
+    "LSTMFlipout": "recurrent",
+    "LSTMRank1": "recurrent",
+    "LSTMReparameterization": "recurrent",
+    "MADE": "made",
+    "MixtureLogistic": "stochastic_output",
+    "NCPCategoricalPerturb": "noise",
+    "NCPNormalOutput": "noise",
+    "NCPNormalPerturb": "noise",
+    "NeuralProcess": "neural_process",
+    "propagate_moments": "moments",
+    "RandomFeatureGaussianProcess": "random_feature",
+    "Reverse": "discrete_flows",
+    "sample_outputs": "utils",
+    "SinkhornAutoregressiveFlow": "discrete_flows",
+    "SparseDense": "pruning",
+    "SparseGaussianProcess": "gaussian_process",
+    "sparsify": "pruning",
+    "SpectralNormalization": "normalization",
+    "SpectralNormalizationConv2D": "normalization",
+    "Zeros": "gaussian_process",
+}
+
+_SUBMODULES = frozenset(_LAYER_MODULES.values())
+
+
+def __getattr__(name):
+  if name in _LAYER_MODULES:
+    module = importlib.import_module(
+        "{}.{}".format(__name__, _LAYER_MODULES[name]))
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+  elif name in _SUBMODULES:
+    return importlib.import_module("{}.{}".format(__name__, name))
+  raise AttributeError("module {!r} has no attribute {!r}".format(__name__,
+                                                                  name))
+
+
+def __dir__():
+  return sorted(set(globals()) | set(__all__))
+
+
+__all__ = sorted(_LAYER_MODULES) + ["moments", "pruning", "utils"]
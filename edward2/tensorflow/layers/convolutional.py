@@ -21,6 +21,7 @@ from edward2.tensorflow import generated_random_variables
 from edward2.tensorflow import initializers
 from edward2.tensorflow import random_variable
 from edward2.tensorflow import regularizers
+from edward2.tensorflow.layers import moments
 from edward2.tensorflow.layers import utils
 
 import tensorflow as tf
@@ -47,6 +48,11 @@ class Conv2DReparameterization(tf.keras.layers.Conv2D):
   Minimizing cross-entropy plus the layer's losses performs variational
   minimum description length, i.e., it minimizes an upper bound to the negative
   marginal likelihood.
+
+  With `local_reparameterization=True`, the layer uses the local
+  reparameterization trick (Kingma et al., 2015): it samples the outputs from
+  their Normal distribution given the mean and variance of the kernel rather
+  than sampling the kernel. See `DenseReparameterization` for details.
   """
 
   def __init__(self,
@@ -65,6 +71,7 @@ class Conv2DReparameterization(tf.keras.layers.Conv2D):
                activity_regularizer=None,
                kernel_constraint=None,
                bias_constraint=None,
+               local_reparameterization=False,
                **kwargs):
     super().__init__(
         filters=filters,
@@ -83,6 +90,10 @@ class Conv2DReparameterization(tf.keras.layers.Conv2D):
         kernel_constraint=constraints.get(kernel_constraint),
         bias_constraint=constraints.get(bias_constraint),
         **kwargs)
+    self.local_reparameterization = local_reparameterization
+    if local_reparameterization:
+      # Only the kernel's moments are used, so don't sample it.
+      self.kernel_initializer = utils.lazy_initializer(self.kernel_initializer)
 
   def call_weights(self):
     """Calls any weights if the initializer is itself a layer."""
@@ -94,8 +105,80 @@ class Conv2DReparameterization(tf.keras.layers.Conv2D):
   def call(self, *args, **kwargs):
     self.call_weights()
     kwargs.pop('training', None)
+    if (self.local_reparameterization and
+        isinstance(self.kernel, random_variable.RandomVariable)):
+      return self._call_local_reparameterization(*args, **kwargs)
     return super().call(*args, **kwargs)
 
+  def _moments_convolution_op(self):
+    """Returns the convolution applied to the kernel's moments."""
+    padding = self.padding
+    if self.padding == 'causal':
+      padding = 'valid'
+    if not isinstance(padding, (list, tuple)):
+      padding = padding.upper()
+    return functools.partial(
+        tf.nn.convolution,
+        strides=self.strides,
+        padding=padding,
+        data_format='NHWC' if self.data_format == 'channels_last' else 'NCHW',
+        dilations=self.dilation_rate)
+
+  def _call_local_reparameterization(self, inputs):
+    """Samples the outputs given the kernel's mean and variance."""
+    convolution_op = self._moments_convolution_op()
+    mean = self.kernel.distribution.mean()
+    variance = self.kernel.distribution.variance()
+    means = convolution_op(inputs, mean)
+    stddevs = tf.sqrt(convolution_op(tf.square(inputs), variance) +
+                      tf.keras.backend.epsilon())
+    if self.use_bias:
+      if self.data_format == 'channels_first':
+        means = tf.nn.bias_add(means, self.bias, data_format='NCHW')
+      else:
+        means = tf.nn.bias_add(means, self.bias, data_format='NHWC')
+    outputs = generated_random_variables.Normal(loc=means, scale=stddevs)
+    if self.activation is not None:
+      outputs = self.activation(outputs)
+    return outputs
+
+  def call_moments(self, inputs_mean, inputs_variance):
+    """Computes the elementwise mean and variance of the outputs.
+
+    See `ed.layers.propagate_moments`. The inputs, kernel and bias are assumed
+    to be independent with factorized distributions.
+
+    Args:
+      inputs_mean: Tensor, the elementwise mean of the inputs.
+      inputs_variance: Tensor, the elementwise variance of the inputs.
+
+    Returns:
+      Tuple of the elementwise mean and variance of the outputs.
+    """
+    self.call_weights()
+    convolution_op = self._moments_convolution_op()
+    kernel_mean, kernel_variance = moments.mean_and_variance(self.kernel)
+    # Var[x w] = (Var[x] + E[x]**2) Var[w] + Var[x] E[w]**2.
+    mean = convolution_op(inputs_mean, kernel_mean)
+    variance = convolution_op(inputs_variance + tf.square(inputs_mean),
+                              kernel_variance)
+    variance += convolution_op(inputs_variance, tf.square(kernel_mean))
+    if self.use_bias:
+      bias_mean, bias_variance = moments.mean_and_variance(self.bias)
+      data_format = 'NCHW' if self.data_format == 'channels_first' else 'NHWC'
+      mean = tf.nn.bias_add(mean, bias_mean, data_format=data_format)
+      variance = tf.nn.bias_add(variance, bias_variance,
+                                data_format=data_format)
+    return moments.activation_moments(self.activation, mean, variance)
+
+  def get_config(self):
+    config = {
+        'local_reparameterization': self.local_reparameterization,
+    }
+    new_config = super().get_config()
+    new_config.update(config)
+    return new_config
+
 
 @utils.add_weight
 class Conv1DReparameterization(tf.keras.layers.Conv1D):
@@ -210,7 +293,7 @@ class Conv2DFlipout(Conv2DReparameterization):
   def _apply_kernel(self, inputs):
     input_shape = tf.shape(inputs)
     batch_dim = input_shape[0]
-    if self._convolution_op is None:
+    if getattr(self, '_convolution_op', None) is None:
       padding = self.padding
       if self.padding == 'causal':
         padding = 'valid'
@@ -294,7 +377,7 @@ class Conv1DFlipout(Conv1DReparameterization):
   def _apply_kernel(self, inputs):
     input_shape = tf.shape(inputs)
     batch_dim = input_shape[0]
-    if self._convolution_op is None:
+    if getattr(self, '_convolution_op', None) is None:
       padding = self.padding
       if self.padding == 'causal':
         padding = 'valid'
@@ -438,6 +521,11 @@ class Conv2DHierarchical(Conv2DFlipout):
                                                         self.dtype)
     super().call_weights()
 
+  def call_moments(self, inputs_mean, inputs_variance):
+    # Means don't exist for Half-Cauchy approximate posteriors of the scales.
+    raise NotImplementedError('Conv2DHierarchical does not support moment '
+                              'propagation.')
+
   def _apply_kernel(self, inputs):
     outputs = super()._apply_kernel(inputs)
     if self.data_format == 'channels_first':
@@ -498,7 +586,7 @@ class Conv2DVariationalDropout(Conv2DReparameterization):
     self.call_weights()
     if training is None:
       training = tf.keras.backend.learning_phase()
-    if self._convolution_op is None:
+    if getattr(self, '_convolution_op', None) is None:
       padding = self.padding
       if self.padding == 'causal':
         padding = 'valid'
@@ -552,8 +640,80 @@ class Conv2DVariationalDropout(Conv2DReparameterization):
         false_fn=lambda: super(Conv2DVariationalDropout, self).call(inputs))
 
 
+def _shape(x):
+  """Returns the shape of `x` as a list of static or else dynamic dims."""
+  static_shape = x.shape.as_list()
+  dynamic_shape = tf.shape(x)
+  return [dynamic_shape[i] if dim is None else dim
+          for i, dim in enumerate(static_shape)]
+
+
+def _call_batch_ensemble(layer, inputs, convolution_fn, rank=1):
+  """Applies a batch ensemble convolution layer.
+
+  The examples are viewed as `[ensemble_size, examples_per_model, ...]`, or as
+  `[1, batch_size, ...]` if `layer.broadcast_inputs` is True, and the fast
+  weights are broadcast over them rather than tiled to the batch size.
+
+  Args:
+    layer: Batch ensemble layer with fast weights `alpha` and `gamma` of shape
+      `[rank, ensemble_size, channels]` (or `[ensemble_size, channels]` if the
+      rank is 1), and optionally `ensemble_bias`.
+    inputs: Tensor of shape `[batch_size, ...]`.
+    convolution_fn: Function applying the layer's shared convolution.
+    rank: Rank of the fast weights.
+
+  Returns:
+    Tensor of shape `[batch_size, ...]`, or `[ensemble_size * batch_size, ...]`
+    if `layer.broadcast_inputs`, or the ensemble members' average of shape
+    `[batch_size / ensemble_size, ...]` (or `[batch_size, ...]` if
+    `layer.broadcast_inputs`) if `layer.average_outputs`.
+  """
+  ensemble_size = layer.ensemble_size
+  input_shape = _shape(inputs)
+  if layer.broadcast_inputs:
+    inputs = tf.expand_dims(inputs, 0)
+  else:
+    inputs = tf.reshape(inputs, [ensemble_size, -1] + input_shape[1:])
+
+  def _expand(weight, leading_dim):
+    """Reshapes a fast weight to broadcast over examples and spatial dims."""
+    shape = [1] * (len(input_shape) + 2)
+    shape[0] = leading_dim
+    shape[1] = ensemble_size
+    shape[3 if layer.data_format == 'channels_first' else -1] = -1
+    return tf.reshape(weight, shape)
+
+  perturb_inputs = tf.expand_dims(inputs, 0) * _expand(layer.alpha, rank)
+  outputs = convolution_fn(
+      tf.reshape(perturb_inputs, [-1] + _shape(perturb_inputs)[3:]))
+  outputs_shape = _shape(outputs)
+  outputs = tf.reshape(outputs, [rank, ensemble_size, -1] + outputs_shape[1:])
+  outputs = outputs * _expand(layer.gamma, rank)
+  if rank > 1:
+    outputs = tf.reduce_sum(outputs, axis=0)
+  else:
+    outputs = tf.reshape(outputs, _shape(outputs)[1:])
+  if layer.use_ensemble_bias:
+    outputs += _expand(layer.ensemble_bias, 1)[0]
+  if layer.ensemble_activation is not None:
+    outputs = layer.ensemble_activation(outputs)
+  if layer.average_outputs:
+    return tf.reduce_mean(outputs, axis=0)
+  return tf.reshape(outputs, [-1] + outputs_shape[1:])
+
+
 class Conv2DBatchEnsemble(tf.keras.layers.Conv2D):
-  """A batch ensemble convolutional layer."""
+  """A batch ensemble convolutional layer.
+
+  For inference, the layer can avoid tiling its inputs `ensemble_size` times.
+  With `broadcast_inputs=True`, the layer takes a batch of inputs shared by all
+  ensemble members and returns the members' outputs stacked along the batch
+  axis, i.e., of batch size `ensemble_size * batch_size`; use it for the first
+  layer of a model. With `average_outputs=True`, the layer returns the average
+  of the ensemble members' outputs after the activation; use it for the last
+  layer.
+  """
 
   def __init__(self,
                filters,
@@ -574,6 +734,8 @@ class Conv2DBatchEnsemble(tf.keras.layers.Conv2D):
                activity_regularizer=None,
                kernel_constraint=None,
                bias_constraint=None,
+               broadcast_inputs=False,
+               average_outputs=False,
                **kwargs):
     super().__init__(
         filters=filters,
@@ -600,6 +762,8 @@ class Conv2DBatchEnsemble(tf.keras.layers.Conv2D):
     self.ensemble_bias_constraint = constraints.get(bias_constraint)
     self.ensemble_activation = tf.keras.activations.get(activation)
     self.use_ensemble_bias = use_bias
+    self.broadcast_inputs = broadcast_inputs
+    self.average_outputs = average_outputs
 
   def _build_parent(self, input_shape):
     super().build(input_shape)
@@ -644,53 +808,7 @@ class Conv2DBatchEnsemble(tf.keras.layers.Conv2D):
     self.built = True
 
   def call(self, inputs):
-    input_dim = self.alpha.shape[-1]
-    batch_size = tf.shape(inputs)[0]
-    examples_per_model = batch_size // self.ensemble_size
-    # TODO(ywenxu): Merge the following two cases.
-    if self.rank > 1:
-      # TODO(ywenxu): Check whether the following works in channels_last case.
-      axis_change = -1 if self.data_format == 'channels_first' else 2
-      alpha = tf.reshape(tf.tile(self.alpha, [1, 1, examples_per_model]),
-                         [self.rank, batch_size, input_dim])
-      gamma = tf.reshape(tf.tile(self.gamma, [1, 1, examples_per_model]),
-                         [self.rank, batch_size, self.filters])
-
-      alpha = tf.expand_dims(alpha, axis=axis_change)
-      alpha = tf.expand_dims(alpha, axis=axis_change)
-      gamma = tf.expand_dims(gamma, axis=axis_change)
-      gamma = tf.expand_dims(gamma, axis=axis_change)
-
-      perturb_inputs = tf.expand_dims(inputs, 0) * alpha
-      perturb_inputs = tf.reshape(perturb_inputs, tf.concat(
-          [[-1], perturb_inputs.shape[2:]], 0))
-      outputs = super().call(perturb_inputs)
-
-      outputs = tf.reshape(outputs, tf.concat(
-          [[self.rank, -1], outputs.shape[1:]], 0))
-      outputs = tf.reduce_sum(outputs * gamma, axis=0)
-    else:
-      axis_change = -1 if self.data_format == 'channels_first' else 1
-      alpha = tf.reshape(tf.tile(self.alpha, [1, examples_per_model]),
-                         [batch_size, input_dim])
-      gamma = tf.reshape(tf.tile(self.gamma, [1, examples_per_model]),
-                         [batch_size, self.filters])
-      alpha = tf.expand_dims(alpha, axis=axis_change)
-      alpha = tf.expand_dims(alpha, axis=axis_change)
-      gamma = tf.expand_dims(gamma, axis=axis_change)
-      gamma = tf.expand_dims(gamma, axis=axis_change)
-      outputs = super().call(inputs*alpha) * gamma
-
-    if self.use_ensemble_bias:
-      bias = tf.reshape(tf.tile(self.ensemble_bias, [1, examples_per_model]),
-                        [batch_size, self.filters])
-      bias = tf.expand_dims(bias, axis=axis_change)
-      bias = tf.expand_dims(bias, axis=axis_change)
-      outputs += bias
-
-    if self.ensemble_activation is not None:
-      outputs = self.ensemble_activation(outputs)
-    return outputs
+    return _call_batch_ensemble(self, inputs, super().call, rank=self.rank)
 
   def get_config(self):
     config = {
@@ -710,6 +828,10 @@ class Conv2DBatchEnsemble(tf.keras.layers.Conv2D):
             tf.keras.activations.serialize(self.ensemble_activation),
         'use_ensemble_bias':
             self.use_ensemble_bias,
+        'broadcast_inputs':
+            self.broadcast_inputs,
+        'average_outputs':
+            self.average_outputs,
     }
     new_config = super().get_config()
     new_config.update(config)
@@ -1274,6 +1396,46 @@ def get_lambda(lambdas, lambda_type, layer_name, lambda_key_to_index):
   return tf.reshape(lambdas[:, index], (-1, 1))
 
 
+def _per_example_convolution(inputs, filters, convolution_fn, data_format):
+  """Applies a different convolution to each example as one grouped convolution.
+
+  The examples are stacked along the channels of a single image, so that a
+  grouped convolution with one group per example applies each example's
+  filters to only its own channels. This supports a dynamic batch size and
+  keeps the graph size independent of it.
+
+  Args:
+    inputs: Tensor of shape `[batch_size, height, width, channels]`, or
+      `[batch_size, channels, height, width]` if `data_format` is `'NCHW'`.
+    filters: Filters of all examples, stacked along the filters' input or
+      output channels with the examples' axis outermost.
+    convolution_fn: Function applying a convolution to an image and filters.
+    data_format: `'NHWC'` or `'NCHW'`.
+
+  Returns:
+    Tensor of the examples' outputs, of shape `[batch_size, ...]`.
+  """
+  batch_size = tf.shape(inputs)[0]
+  if data_format == 'NCHW':
+    inputs = tf.reshape(inputs, [1, -1] + _shape(inputs)[2:])
+  else:
+    inputs = tf.transpose(inputs, [1, 2, 0, 3])
+    inputs = tf.reshape(inputs, [1] + _shape(inputs)[:2] + [-1])
+  outputs = convolution_fn(inputs, filters)
+  outputs_shape = _shape(outputs)
+  if data_format == 'NCHW':
+    return tf.reshape(outputs, [batch_size, -1] + outputs_shape[2:])
+  outputs = tf.reshape(outputs, outputs_shape[1:3] + [batch_size, -1])
+  return tf.transpose(outputs, [2, 0, 1, 3])
+
+
+def _add_per_example_bias(outputs, biases, data_format):
+  """Adds biases of shape `[batch_size, channels]` to convolution outputs."""
+  if data_format == 'NCHW':
+    return outputs + biases[:, :, tf.newaxis, tf.newaxis]
+  return outputs + biases[:, tf.newaxis, tf.newaxis, :]
+
+
 @utils.add_weight
 class CondConv2D(tf.keras.layers.Conv2D):
   """2D conditional convolution layer (e.g. spatial convolution over images).
@@ -1433,37 +1595,29 @@ class CondConv2D(tf.keras.layers.Conv2D):
   def call(self, inputs, routing_weights):
     # Compute example dependent kernels
     kernels = tf.matmul(routing_weights, self.condconv_kernel)
-    batch_size = inputs.shape[0].value
-    inputs = tf.split(inputs, batch_size, 0)
-    kernels = tf.split(kernels, batch_size, 0)
+    kernels = tf.reshape(kernels, (-1,) + self.kernel_shape)
+    # Stack the kernels along output channels for a grouped convolution.
+    kernels = tf.transpose(kernels, [1, 2, 3, 0, 4])
+    kernels = tf.reshape(kernels, self.kernel_shape[:-1] + (-1,))
+
+    def convolution_fn(inputs, kernels):
+      return tf.nn.convolution(
+          inputs,
+          kernels,
+          strides=self.strides,
+          padding=self._get_padding_op(),
+          dilations=self.dilation_rate,
+          data_format=self.converted_data_format)
+
     # Apply example-dependent convolution to each example in the batch
-    outputs_list = []
-    # TODO(ywenxu): Check out tf.vectorized_map.
-    for input_tensor, kernel in zip(inputs, kernels):
-      kernel = tf.reshape(kernel, self.kernel_shape)
-      outputs_list.append(
-          tf.nn.convolution(
-              input_tensor,
-              kernel,
-              strides=self.strides,
-              padding=self._get_padding_op(),
-              dilations=self.dilation_rate,
-              data_format=self.converted_data_format))
-    outputs = tf.concat(outputs_list, 0)
+    outputs = _per_example_convolution(inputs, kernels, convolution_fn,
+                                       self.converted_data_format)
 
     if self.use_bias:
       # Compute example-dependent biases
       biases = tf.matmul(routing_weights, self.condconv_bias)
-      outputs = tf.split(outputs, batch_size, 0)
-      biases = tf.split(biases, batch_size, 0)
-      # Add example-dependent bias to each example in the batch
-      bias_outputs_list = []
-      for output, bias in zip(outputs, biases):
-        bias = tf.squeeze(bias, axis=0)
-        bias_outputs_list.append(
-            tf.nn.bias_add(output, bias,
-                           data_format=self.converted_data_format))
-      outputs = tf.concat(bias_outputs_list, 0)
+      outputs = _add_per_example_bias(outputs, biases,
+                                      self.converted_data_format)
 
     if self.activation is not None:
       return self.activation(outputs)
@@ -1652,41 +1806,38 @@ class DepthwiseCondConv2D(tf.keras.layers.DepthwiseConv2D):
     # Compute example dependent depthwise kernels
     depthwise_kernels = tf.matmul(routing_weights,
                                   self.depthwise_condconv_kernel)
-    batch_size = inputs.shape[0].value
-    inputs = tf.split(inputs, batch_size, 0)
-    depthwise_kernels = tf.split(depthwise_kernels, batch_size, 0)
-    # Apply example-dependent depthwise convolution to each example in the batch
-    outputs_list = []
+    depthwise_kernels = tf.reshape(depthwise_kernels,
+                                   (-1,) + self.depthwise_kernel_shape)
+    # Stack the kernels along input channels, as each example's channels are
+    # convolved independently.
+    depthwise_kernels = tf.transpose(depthwise_kernels, [1, 2, 0, 3, 4])
+    depthwise_kernels = tf.reshape(
+        depthwise_kernels,
+        self.depthwise_kernel_shape[:2] + (-1, self.depth_multiplier))
     if self.data_format == 'channels_first':
       converted_strides = (1, 1) + self.strides
     else:
       converted_strides = (1,) + self.strides + (1,)
-    for input_tensor, depthwise_kernel in zip(inputs, depthwise_kernels):
-      depthwise_kernel = tf.reshape(depthwise_kernel,
-                                    self.depthwise_kernel_shape)
-      outputs_list.append(
-          tf.nn.depthwise_conv2d(
-              input_tensor,
-              depthwise_kernel,
-              strides=converted_strides,
-              padding=self.padding.upper(),
-              dilations=self.dilation_rate,
-              data_format=self.converted_data_format))
-    outputs = tf.concat(outputs_list, 0)
+
+    def convolution_fn(inputs, depthwise_kernels):
+      return tf.nn.depthwise_conv2d(
+          inputs,
+          depthwise_kernels,
+          strides=converted_strides,
+          padding=self.padding.upper(),
+          dilations=self.dilation_rate,
+          data_format=self.converted_data_format)
+
+    # Apply example-dependent depthwise convolution to each example in the batch
+    outputs = _per_example_convolution(inputs, depthwise_kernels,
+                                       convolution_fn,
+                                       self.converted_data_format)
 
     if self.use_bias:
       # Compute example-dependent biases
       biases = tf.matmul(routing_weights, self.condconv_bias)
-      outputs = tf.split(outputs, batch_size, 0)
-      biases = tf.split(biases, batch_size, 0)
-      # Add example-dependent bias to each example in the batch
-      bias_outputs_list = []
-      for output, bias in zip(outputs, biases):
-        bias = tf.squeeze(bias, axis=0)
-        bias_outputs_list.append(
-            tf.nn.bias_add(output, bias,
-                           data_format=self.converted_data_format))
-      outputs = tf.concat(bias_outputs_list, 0)
+      outputs = _add_per_example_bias(outputs, biases,
+                                      self.converted_data_format)
 
     if self.activation is not None:
       return self.activation(outputs)
@@ -1700,7 +1851,16 @@ class DepthwiseCondConv2D(tf.keras.layers.DepthwiseConv2D):
 
 
 class DepthwiseConv2DBatchEnsemble(tf.keras.layers.DepthwiseConv2D):
-  """Batch ensemble of depthwise separable 2D convolutions."""
+  """Batch ensemble of depthwise separable 2D convolutions.
+
+  For inference, the layer can avoid tiling its inputs `ensemble_size` times.
+  With `broadcast_inputs=True`, the layer takes a batch of inputs shared by all
+  ensemble members and returns the members' outputs stacked along the batch
+  axis, i.e., of batch size `ensemble_size * batch_size`; use it for the first
+  layer of a model. With `average_outputs=True`, the layer returns the average
+  of the ensemble members' outputs after the activation; use it for the last
+  layer.
+  """
 
   def __init__(self,
                kernel_size,
@@ -1720,6 +1880,8 @@ class DepthwiseConv2DBatchEnsemble(tf.keras.layers.DepthwiseConv2D):
                activity_regularizer=None,
                depthwise_constraint=None,
                bias_constraint=None,
+               broadcast_inputs=False,
+               average_outputs=False,
                **kwargs):
     super().__init__(
         kernel_size=kernel_size,
@@ -1745,6 +1907,8 @@ class DepthwiseConv2DBatchEnsemble(tf.keras.layers.DepthwiseConv2D):
     self.ensemble_bias_constraint = constraints.get(bias_constraint)
     self.ensemble_activation = tf.keras.activations.get(activation)
     self.use_ensemble_bias = use_bias
+    self.broadcast_inputs = broadcast_inputs
+    self.average_outputs = average_outputs
 
   def build(self, input_shape):
     input_shape = tf.TensorShape(input_shape)
@@ -1782,31 +1946,7 @@ class DepthwiseConv2DBatchEnsemble(tf.keras.layers.DepthwiseConv2D):
     self.built = True
 
   def call(self, inputs):
-    axis_change = -1 if self.data_format == 'channels_first' else 1
-    batch_size = tf.shape(inputs)[0]
-    input_dim = self.alpha.shape[-1]
-    filters = self.gamma.shape[-1]
-    examples_per_model = batch_size // self.ensemble_size
-    alpha = tf.reshape(tf.tile(self.alpha, [1, examples_per_model]),
-                       [batch_size, input_dim])
-    gamma = tf.reshape(tf.tile(self.gamma, [1, examples_per_model]),
-                       [batch_size, filters])
-    alpha = tf.expand_dims(alpha, axis=axis_change)
-    alpha = tf.expand_dims(alpha, axis=axis_change)
-    gamma = tf.expand_dims(gamma, axis=axis_change)
-    gamma = tf.expand_dims(gamma, axis=axis_change)
-    outputs = super().call(inputs*alpha) * gamma
-
-    if self.use_ensemble_bias:
-      bias = tf.reshape(tf.tile(self.ensemble_bias, [1, examples_per_model]),
-                        [batch_size, filters])
-      bias = tf.expand_dims(bias, axis=axis_change)
-      bias = tf.expand_dims(bias, axis=axis_change)
-      outputs += bias
-
-    if self.ensemble_activation is not None:
-      outputs = self.ensemble_activation(outputs)
-    return outputs
+    return _call_batch_ensemble(self, inputs, super().call)
 
   def get_config(self):
     config = {
@@ -1826,6 +1966,10 @@ class DepthwiseConv2DBatchEnsemble(tf.keras.layers.DepthwiseConv2D):
             tf.keras.activations.serialize(self.ensemble_activation),
         'use_ensemble_bias':
             self.use_ensemble_bias,
+        'broadcast_inputs':
+            self.broadcast_inputs,
+        'average_outputs':
+            self.average_outputs,
     }
     new_config = super().get_config()
     new_config.update(config)
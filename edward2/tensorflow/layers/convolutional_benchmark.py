@@ -0,0 +1,51 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for Bayesian convolutional layers.
+
+Run with `python convolutional_benchmark.py --benchmark_filter=.`.
+"""
+
+import edward2 as ed
+from edward2 import benchmark_utils
+import tensorflow as tf
+
+
+class ConvolutionalBenchmark(benchmark_utils.ReportMixin, tf.test.Benchmark):
+
+  def _benchmark_cond_conv(self, name, layer):
+    for batch_size in [16, 128]:
+      inputs = tf.random.normal([batch_size, 32, 32, 32])
+      routing_weights = tf.random.uniform([batch_size, layer.num_experts])
+      compiled_layer = tf.function(layer)
+      self._report("{}_eager_{}".format(name, batch_size),
+                   lambda: layer(inputs, routing_weights),  # pylint: disable=cell-var-from-loop
+                   report_first_call=True)
+      self._report("{}_compiled_{}".format(name, batch_size),
+                   lambda: compiled_layer(inputs, routing_weights),  # pylint: disable=cell-var-from-loop
+                   report_first_call=True)
+
+  def benchmarkCondConv2D(self):
+    layer = ed.layers.CondConv2D(32, kernel_size=3, num_experts=4,
+                                 padding="same")
+    self._benchmark_cond_conv("cond_conv2d", layer)
+
+  def benchmarkDepthwiseCondConv2D(self):
+    layer = ed.layers.DepthwiseCondConv2D(kernel_size=3, num_experts=4,
+                                          padding="same")
+    self._benchmark_cond_conv("depthwise_cond_conv2d", layer)
+
+
+if __name__ == "__main__":
+  tf.test.main()
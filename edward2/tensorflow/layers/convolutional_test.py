@@ -119,6 +119,32 @@ class ConvolutionalTest(parameterized.TestCase, tf.test.TestCase):
     else:
       self.assertLen(model.losses, 1)
 
+  def testConv2DLocalReparameterization(self):
+    inputs = np.random.rand(5, 4, 4, 3).astype(np.float32)
+    layer = ed.layers.Conv2DReparameterization(
+        2, kernel_size=3, padding="same", local_reparameterization=True)
+    with tf.GradientTape() as tape:
+      outputs = layer(inputs)
+      loss = tf.reduce_sum(outputs)
+    self.assertIsInstance(outputs, ed.RandomVariable)
+    self.assertEqual(outputs.shape, (5, 4, 4, 2))
+    # The kernel is never sampled.
+    self.assertIsNone(layer.kernel._value)
+    mean = layer.kernel.distribution.mean()
+    variance = layer.kernel.distribution.variance()
+    self.assertAllClose(outputs.distribution.mean(),
+                        tf.nn.conv2d(inputs, mean, 1, "SAME"))
+    self.assertAllClose(outputs.distribution.variance(),
+                        tf.nn.conv2d(inputs**2, variance, 1, "SAME") +
+                        tf.keras.backend.epsilon(),
+                        rtol=1e-4)
+    variables = [layer.kernel_initializer.mean, layer.kernel_initializer.stddev]
+    grads = tape.gradient(loss, variables)
+    for grad in grads:
+      self.assertIsNotNone(grad)
+    config = layer.get_config()
+    self.assertTrue(config["local_reparameterization"])
+
   @parameterized.parameters(
       {"layer": ed.layers.Conv1DFlipout,
        "kernel_initializer": "zeros",
@@ -234,6 +260,122 @@ class ConvolutionalTest(parameterized.TestCase, tf.test.TestCase):
     self.assertEqual(batch_outputs.shape, expected_shape)
     self.assertAllClose(batch_outputs, loop_outputs)
 
+  @parameterized.parameters(
+      {"layer": ed.layers.Conv2DBatchEnsemble, "rank": 1},
+      {"layer": ed.layers.Conv2DBatchEnsemble, "rank": 2},
+      {"layer": ed.layers.DepthwiseConv2DBatchEnsemble, "rank": 1},
+  )
+  def testConv2DBatchEnsembleBroadcastInputs(self, layer, rank):
+    """Tests that broadcasting inputs is the same as tiling them."""
+    ensemble_size = 2
+    batch_size = 3
+    inputs = tf.random.normal([batch_size, 4, 4, 5])
+    kwargs = {"rank": rank} if rank > 1 else {}
+    if layer == ed.layers.Conv2DBatchEnsemble:
+      kwargs["filters"] = 5
+    layer = layer(kernel_size=2,
+                  ensemble_size=ensemble_size,
+                  bias_initializer="he_normal",
+                  activation="relu",
+                  **kwargs)
+    tiled_outputs = layer(tf.tile(inputs, [ensemble_size, 1, 1, 1]))
+
+    layer.broadcast_inputs = True
+    outputs = layer(inputs)
+    self.assertEqual(outputs.shape, (ensemble_size * batch_size, 3, 3, 5))
+    self.assertAllClose(outputs, tiled_outputs)
+
+    layer.average_outputs = True
+    outputs = layer(inputs)
+    self.assertEqual(outputs.shape, (batch_size, 3, 3, 5))
+    self.assertAllClose(
+        outputs,
+        tf.reduce_mean(
+            tf.reshape(tiled_outputs, [ensemble_size, -1, 3, 3, 5]), 0))
+
+  @parameterized.parameters(
+      {"strides": 1, "padding": "same", "dilation_rate": 1},
+      {"strides": 2, "padding": "valid", "dilation_rate": 1},
+      {"strides": 1, "padding": "valid", "dilation_rate": 2},
+  )
+  def testCondConv2D(self, strides, padding, dilation_rate):
+    """Tests that vectorized implementation is same as for loop."""
+    batch_size = 3
+    num_experts = 4
+    inputs = tf.random.normal([batch_size, 7, 7, 5])
+    routing_weights = tf.random.uniform([batch_size, num_experts])
+    layer = ed.layers.CondConv2D(
+        filters=6,
+        kernel_size=3,
+        num_experts=num_experts,
+        strides=strides,
+        padding=padding,
+        dilation_rate=dilation_rate,
+        bias_initializer="he_normal",
+        activation="relu")
+    outputs = layer(inputs, routing_weights)
+
+    kernels = tf.reshape(tf.matmul(routing_weights, layer.condconv_kernel),
+                         [batch_size, 3, 3, 5, 6])
+    biases = tf.matmul(routing_weights, layer.condconv_bias)
+    loop_outputs = [
+        tf.nn.relu(tf.nn.convolution(
+            inputs[i:i+1], kernels[i], strides=strides,
+            padding=padding.upper(), dilations=dilation_rate) + biases[i])
+        for i in range(batch_size)
+    ]
+    self.assertAllClose(outputs, tf.concat(loop_outputs, axis=0))
+
+  @parameterized.parameters(
+      {"strides": 1, "padding": "same", "depth_multiplier": 1},
+      {"strides": 2, "padding": "valid", "depth_multiplier": 2},
+  )
+  def testDepthwiseCondConv2D(self, strides, padding, depth_multiplier):
+    """Tests that vectorized implementation is same as for loop."""
+    batch_size = 3
+    num_experts = 4
+    inputs = tf.random.normal([batch_size, 7, 7, 5])
+    routing_weights = tf.random.uniform([batch_size, num_experts])
+    layer = ed.layers.DepthwiseCondConv2D(
+        kernel_size=3,
+        num_experts=num_experts,
+        strides=strides,
+        padding=padding,
+        depth_multiplier=depth_multiplier,
+        bias_initializer="he_normal")
+    outputs = layer(inputs, routing_weights)
+
+    kernels = tf.reshape(
+        tf.matmul(routing_weights, layer.depthwise_condconv_kernel),
+        [batch_size, 3, 3, 5, depth_multiplier])
+    biases = tf.matmul(routing_weights, layer.condconv_bias)
+    loop_outputs = [
+        tf.nn.depthwise_conv2d(
+            inputs[i:i+1], kernels[i], strides=(1, strides, strides, 1),
+            padding=padding.upper()) + biases[i]
+        for i in range(batch_size)
+    ]
+    self.assertAllClose(outputs, tf.concat(loop_outputs, axis=0))
+
+  @parameterized.parameters(
+      {"layer": ed.layers.CondConv2D, "kwargs": {"filters": 6}},
+      {"layer": ed.layers.DepthwiseCondConv2D, "kwargs": {}},
+  )
+  def testCondConv2DDynamicBatchSize(self, layer, kwargs):
+    layer = layer(kernel_size=3, num_experts=2, padding="same", **kwargs)
+
+    @tf.function(input_signature=[
+        tf.TensorSpec([None, 6, 6, 5]), tf.TensorSpec([None, 2])])
+    def compiled_layer(inputs, routing_weights):
+      return layer(inputs, routing_weights)
+
+    for batch_size in [1, 4]:
+      inputs = tf.random.normal([batch_size, 6, 6, 5])
+      routing_weights = tf.random.uniform([batch_size, 2])
+      outputs = compiled_layer(inputs, routing_weights)
+      self.assertEqual(outputs.shape[0], batch_size)
+      self.assertAllClose(outputs, layer(inputs, routing_weights))
+
   def testConv1DBatchEnsemble(self):
     """Tests that vectorized implementation is same as for loop."""
     ensemble_size = 2
@@ -21,6 +21,7 @@ from edward2.tensorflow import generated_random_variables
 from edward2.tensorflow import initializers
 from edward2.tensorflow import random_variable
 from edward2.tensorflow import regularizers
+from edward2.tensorflow.layers import moments
 from edward2.tensorflow.layers import utils
 
 import tensorflow as tf
@@ -30,6 +31,16 @@ import tensorflow_probability as tfp
 LAMBDA_TYPE = ('l2_kernel', 'l2_bias', 'dr')  # used by HyperBatchEnsemble
 
 
+def _median(weight):
+  """Returns the median of a weight if it is a random variable."""
+  if not isinstance(weight, random_variable.RandomVariable):
+    return weight
+  distribution = weight.distribution
+  if isinstance(distribution, tfp.distributions.Independent):
+    distribution = distribution.distribution
+  return distribution.quantile(0.5)
+
+
 @utils.add_weight
 class DenseReparameterization(tf.keras.layers.Dense):
   """Bayesian densely-connected layer estimated via reparameterization.
@@ -48,6 +59,16 @@ class DenseReparameterization(tf.keras.layers.Dense):
   Minimizing cross-entropy plus the layer's losses performs variational
   minimum description length, i.e., it minimizes an upper bound to the negative
   marginal likelihood.
+
+  With `local_reparameterization=True`, the layer uses the local
+  reparameterization trick (Kingma et al., 2015). Rather than sampling the
+  kernel, which all examples in the minibatch then share, it samples each
+  example's pre-activations from their Normal distribution given the mean and
+  variance of the kernel. This reduces the variance of gradients and does not
+  materialize a kernel sample. It requires the kernel distribution to be
+  fully factorized with finite `mean()` and `variance()`, e.g., the default
+  `trainable_normal` initializer. It computes two matmuls rather than one, so
+  it is slower than sampling the kernel at large batch sizes.
   """
 
   def __init__(self,
@@ -59,6 +80,7 @@ class DenseReparameterization(tf.keras.layers.Dense):
                kernel_regularizer='normal_kl_divergence',
                bias_regularizer=None,
                activity_regularizer=None,
+               local_reparameterization=False,
                **kwargs):
     super().__init__(
         units=units,
@@ -70,6 +92,10 @@ class DenseReparameterization(tf.keras.layers.Dense):
         bias_regularizer=regularizers.get(bias_regularizer),
         activity_regularizer=regularizers.get(activity_regularizer),
         **kwargs)
+    self.local_reparameterization = local_reparameterization
+    if local_reparameterization:
+      # Only the kernel's moments are used, so don't sample it.
+      self.kernel_initializer = utils.lazy_initializer(self.kernel_initializer)
 
   def call_weights(self):
     """Calls any weights if the initializer is itself a layer."""
@@ -81,8 +107,66 @@ class DenseReparameterization(tf.keras.layers.Dense):
   def call(self, *args, **kwargs):
     self.call_weights()
     kwargs.pop('training', None)
+    if (self.local_reparameterization and
+        isinstance(self.kernel, random_variable.RandomVariable)):
+      return self._call_local_reparameterization(*args, **kwargs)
     return super().call(*args, **kwargs)
 
+  def _call_local_reparameterization(self, inputs):
+    """Samples the outputs given the kernel's mean and variance."""
+    mean = self.kernel.distribution.mean()
+    variance = self.kernel.distribution.variance()
+    if inputs.shape.ndims <= 2:
+      means = tf.matmul(inputs, mean)
+      stddevs = tf.sqrt(tf.matmul(tf.square(inputs), variance) +
+                        tf.keras.backend.epsilon())
+    else:
+      means = tf.tensordot(inputs, mean, [[-1], [0]])
+      stddevs = tf.sqrt(
+          tf.tensordot(tf.square(inputs), variance, [[-1], [0]]) +
+          tf.keras.backend.epsilon())
+    if self.use_bias:
+      means = tf.nn.bias_add(means, self.bias)
+    outputs = generated_random_variables.Normal(loc=means, scale=stddevs)
+    if self.activation is not None:
+      outputs = self.activation(outputs)
+    return outputs
+
+  def call_moments(self, inputs_mean, inputs_variance):
+    """Computes the elementwise mean and variance of the outputs.
+
+    See `ed.layers.propagate_moments`. The inputs, kernel and bias are assumed
+    to be independent with factorized distributions.
+
+    Args:
+      inputs_mean: Tensor, the elementwise mean of the inputs.
+      inputs_variance: Tensor, the elementwise variance of the inputs.
+
+    Returns:
+      Tuple of the elementwise mean and variance of the outputs.
+    """
+    self.call_weights()
+    kernel_mean, kernel_variance = moments.mean_and_variance(self.kernel)
+    # Var[x w] = (Var[x] + E[x]**2) Var[w] + Var[x] E[w]**2.
+    mean = tf.tensordot(inputs_mean, kernel_mean, [[-1], [0]])
+    variance = tf.tensordot(inputs_variance + tf.square(inputs_mean),
+                            kernel_variance, [[-1], [0]])
+    variance += tf.tensordot(inputs_variance, tf.square(kernel_mean),
+                             [[-1], [0]])
+    if self.use_bias:
+      bias_mean, bias_variance = moments.mean_and_variance(self.bias)
+      mean = tf.nn.bias_add(mean, bias_mean)
+      variance = tf.nn.bias_add(variance, bias_variance)
+    return moments.activation_moments(self.activation, mean, variance)
+
+  def get_config(self):
+    config = {
+        'local_reparameterization': self.local_reparameterization,
+    }
+    new_config = super().get_config()
+    new_config.update(config)
+    return new_config
+
 
 class DenseDVI(DenseReparameterization):
   """Densely-connected layer with deterministic VI (Wu et al., 2018).
@@ -259,16 +343,8 @@ class DenseFlipout(DenseReparameterization):
     self.call_weights()
     input_shape = tf.shape(inputs)
     output_shape = tf.concat([input_shape[:-1], [self.units]], 0)
-    sign_input = tf.cast(2 * tf.random.uniform(input_shape,
-                                               minval=0,
-                                               maxval=2,
-                                               dtype=tf.int32) - 1,
-                         inputs.dtype)
-    sign_output = tf.cast(2 * tf.random.uniform(output_shape,
-                                                minval=0,
-                                                maxval=2,
-                                                dtype=inputs.dtype) - 1,
-                          inputs.dtype)
+    sign_input = utils.random_rademacher(input_shape, dtype=inputs.dtype)
+    sign_output = utils.random_rademacher(output_shape, dtype=inputs.dtype)
     kernel_mean = self.kernel.distribution.mean()
     perturbation = self.kernel - kernel_mean
     if inputs.shape.ndims <= 2:
@@ -291,6 +367,11 @@ class DenseVariationalDropout(DenseReparameterization):
 
   Implementation follows the additive parameterization of
   Molchanov et al. (2017).
+
+  At inference (`training=False`), the layer samples the kernel by default.
+  With `deterministic_inference=True`, it instead applies the posterior mean of
+  the kernel and bias. This pass reads the variational parameters directly, so
+  it never samples weights and always reflects their current values.
   """
 
   def __init__(self,
@@ -302,6 +383,7 @@ class DenseVariationalDropout(DenseReparameterization):
                kernel_regularizer='log_uniform_kl_divergence',
                bias_regularizer=None,
                activity_regularizer=None,
+               deterministic_inference=False,
                **kwargs):
     super().__init__(
         units=units,
@@ -313,43 +395,24 @@ class DenseVariationalDropout(DenseReparameterization):
         bias_regularizer=regularizers.get(bias_regularizer),
         activity_regularizer=regularizers.get(activity_regularizer),
         **kwargs)
+    self.deterministic_inference = deterministic_inference
+    if deterministic_inference:
+      # Only the kernel's moments are used, so don't sample it.
+      self.kernel_initializer = utils.lazy_initializer(self.kernel_initializer)
 
   def call(self, inputs, training=None):
     if not isinstance(self.kernel, random_variable.RandomVariable):
       return super().call(inputs)
     self.call_weights()
+    kernel, bias = self.kernel, self.bias
     if training is None:
       training = tf.keras.backend.learning_phase()
 
-    def dropped_inputs():
-      """Forward pass with dropout."""
-      # Clip magnitude of dropout rate, where we get the dropout rate alpha from
-      # the additive parameterization (Molchanov et al., 2017): for weight ~
-      # Normal(mu, sigma**2), the variance `sigma**2 = alpha * mu**2`.
-      mean = self.kernel.distribution.mean()
-      log_variance = tf.math.log(self.kernel.distribution.variance())
-      log_alpha = log_variance - tf.math.log(tf.square(mean) +
-                                             tf.keras.backend.epsilon())
-      log_alpha = tf.clip_by_value(log_alpha, -8., 8.)
-      log_variance = log_alpha + tf.math.log(tf.square(mean) +
-                                             tf.keras.backend.epsilon())
-
-      if inputs.shape.ndims <= 2:
-        means = tf.matmul(inputs, mean)
-        stddevs = tf.sqrt(
-            tf.matmul(tf.square(inputs), tf.exp(log_variance)) +
-            tf.keras.backend.epsilon())
-      else:
-        means = tf.tensordot(inputs, mean, [[-1], [0]])
-        stddevs = tf.sqrt(
-            tf.tensordot(tf.square(inputs), tf.exp(log_variance), [[-1], [0]]) +
-            tf.keras.backend.epsilon())
-      if self.use_bias:
-        means = tf.nn.bias_add(means, self.bias)
-      outputs = generated_random_variables.Normal(loc=means, scale=stddevs)
-      if self.activation is not None:
-        outputs = self.activation(outputs)
-      return outputs
+    dropped_inputs = lambda: self._call_dropout(inputs, kernel, bias)
+    if self.deterministic_inference:
+      inference_fn = lambda: self._call_posterior_mean(inputs, kernel, bias)
+    else:
+      inference_fn = lambda: super(DenseVariationalDropout, self).call(inputs)
 
     # Following tf.keras.Dropout, only apply variational dropout if training
     # flag is True.
@@ -358,11 +421,64 @@ class DenseVariationalDropout(DenseReparameterization):
       if training_value:
         return dropped_inputs()
       else:
-        return super().call(inputs)
+        return inference_fn()
     return tf.cond(
         pred=training,
         true_fn=dropped_inputs,
-        false_fn=lambda: super(DenseVariationalDropout, self).call(inputs))
+        false_fn=inference_fn)
+
+  def _call_dropout(self, inputs, kernel, bias):
+    """Forward pass with dropout."""
+    # Clip magnitude of dropout rate, where we get the dropout rate alpha from
+    # the additive parameterization (Molchanov et al., 2017): for weight ~
+    # Normal(mu, sigma**2), the variance `sigma**2 = alpha * mu**2`.
+    mean = kernel.distribution.mean()
+    log_variance = tf.math.log(kernel.distribution.variance())
+    log_alpha = log_variance - tf.math.log(tf.square(mean) +
+                                           tf.keras.backend.epsilon())
+    log_alpha = tf.clip_by_value(log_alpha, -8., 8.)
+    log_variance = log_alpha + tf.math.log(tf.square(mean) +
+                                           tf.keras.backend.epsilon())
+
+    if inputs.shape.ndims <= 2:
+      means = tf.matmul(inputs, mean)
+      stddevs = tf.sqrt(
+          tf.matmul(tf.square(inputs), tf.exp(log_variance)) +
+          tf.keras.backend.epsilon())
+    else:
+      means = tf.tensordot(inputs, mean, [[-1], [0]])
+      stddevs = tf.sqrt(
+          tf.tensordot(tf.square(inputs), tf.exp(log_variance), [[-1], [0]]) +
+          tf.keras.backend.epsilon())
+    if self.use_bias:
+      means = tf.nn.bias_add(means, bias)
+    outputs = generated_random_variables.Normal(loc=means, scale=stddevs)
+    if self.activation is not None:
+      outputs = self.activation(outputs)
+    return outputs
+
+  def _call_posterior_mean(self, inputs, kernel, bias):
+    """Forward pass with the posterior mean of the kernel and bias."""
+    kernel = kernel.distribution.mean()
+    if inputs.shape.ndims <= 2:
+      outputs = tf.matmul(inputs, kernel)
+    else:
+      outputs = tf.tensordot(inputs, kernel, [[-1], [0]])
+    if self.use_bias:
+      if isinstance(bias, random_variable.RandomVariable):
+        bias = bias.distribution.mean()
+      outputs = tf.nn.bias_add(outputs, bias)
+    if self.activation is not None:
+      outputs = self.activation(outputs)
+    return outputs
+
+  def get_config(self):
+    config = {
+        'deterministic_inference': self.deterministic_inference,
+    }
+    new_config = super().get_config()
+    new_config.update(config)
+    return new_config
 
 
 class DenseHierarchical(DenseVariationalDropout):
@@ -397,6 +513,10 @@ class DenseHierarchical(DenseVariationalDropout):
   backpropagate via reparameterization. Minimizing cross-entropy plus the
   layer's losses performs variational minimum description length, i.e., it
   minimizes an upper bound to the negative marginal likelihood.
+
+  With `deterministic_inference=True`, inference uses the posterior mean of the
+  kernel and bias, and the posterior medians of the local and global scales, as
+  means don't exist for half-Cauchy distributions.
   """
 
   def __init__(self,
@@ -415,6 +535,7 @@ class DenseHierarchical(DenseVariationalDropout):
                activity_regularizer=None,
                local_scale_constraint='softplus',
                global_scale_constraint='softplus',
+               deterministic_inference=False,
                **kwargs):
     self.local_scale_initializer = initializers.get(local_scale_initializer)
     self.global_scale_initializer = initializers.get(global_scale_initializer)
@@ -431,6 +552,7 @@ class DenseHierarchical(DenseVariationalDropout):
         kernel_regularizer=regularizers.get(kernel_regularizer),
         bias_regularizer=regularizers.get(bias_regularizer),
         activity_regularizer=regularizers.get(activity_regularizer),
+        deterministic_inference=deterministic_inference,
         **kwargs)
 
   def build(self, input_shape):
@@ -460,16 +582,55 @@ class DenseHierarchical(DenseVariationalDropout):
                                                         self.dtype)
     super().call_weights()
 
+  def call_moments(self, inputs_mean, inputs_variance):
+    # Means don't exist for Half-Cauchy approximate posteriors of the scales.
+    raise NotImplementedError('DenseHierarchical does not support moment '
+                              'propagation.')
+
   def call(self, inputs, training=None):
     self.call_weights()
-    # TODO(trandustin): Figure out what to set local/global scales to at test
-    # time. Means don't exist for Half-Cauchy approximate posteriors.
-    inputs *= self.local_scale[tf.newaxis, :] * self.global_scale
-    return super().call(inputs, training=training)
+    if not self.deterministic_inference:
+      inputs *= self.local_scale[tf.newaxis, :] * self.global_scale
+      return super().call(inputs, training=training)
+    kernel, bias = self.kernel, self.bias
+    local_scale, global_scale = self.local_scale, self.global_scale
+    if training is None:
+      training = tf.keras.backend.learning_phase()
+
+    def dropped_inputs():
+      """Forward pass with sampled scales and dropout."""
+      scale = local_scale[tf.newaxis, :] * global_scale
+      return self._call_dropout(inputs * scale, kernel, bias)
+
+    def posterior_mean():
+      """Forward pass with the posterior medians of the scales."""
+      # Means don't exist for Half-Cauchy approximate posteriors of the scales.
+      scale = _median(local_scale) * _median(global_scale)
+      return self._call_posterior_mean(inputs * scale, kernel, bias)
+
+    training_value = utils.smart_constant_value(training)
+    if training_value is not None:
+      if training_value:
+        return dropped_inputs()
+      else:
+        return posterior_mean()
+    return tf.cond(
+        pred=training,
+        true_fn=dropped_inputs,
+        false_fn=posterior_mean)
 
 
 class DenseBatchEnsemble(tf.keras.layers.Dense):
-  """A batch ensemble dense layer."""
+  """A batch ensemble dense layer.
+
+  For inference, the layer can avoid tiling its inputs `ensemble_size` times.
+  With `broadcast_inputs=True`, the layer takes a batch of inputs shared by all
+  ensemble members and returns the members' outputs stacked along the batch
+  axis, i.e., of batch size `ensemble_size * batch_size`; use it for the first
+  layer of a model. With `average_outputs=True`, the layer returns the average
+  of the ensemble members' outputs after the activation; use it for the last
+  layer.
+  """
 
   def __init__(self,
                units,
@@ -486,6 +647,8 @@ class DenseBatchEnsemble(tf.keras.layers.Dense):
                activity_regularizer=None,
                kernel_constraint=None,
                bias_constraint=None,
+               broadcast_inputs=False,
+               average_outputs=False,
                **kwargs):
     super().__init__(
         units=units,
@@ -508,6 +671,8 @@ class DenseBatchEnsemble(tf.keras.layers.Dense):
     self.ensemble_bias_initializer = initializers.get(bias_initializer)
     self.ensemble_bias_regularizer = regularizers.get(bias_regularizer)
     self.ensemble_bias_constraint = constraints.get(bias_constraint)
+    self.broadcast_inputs = broadcast_inputs
+    self.average_outputs = average_outputs
 
   def _build_parent(self, input_shape):
     super().build(input_shape)
@@ -550,35 +715,30 @@ class DenseBatchEnsemble(tf.keras.layers.Dense):
     self.built = True
 
   def call(self, inputs):
-    batch_size = tf.shape(inputs)[0]
     input_dim = self.alpha.shape[-1]
-    examples_per_model = batch_size // self.ensemble_size
 
-    # TODO(ywenxu): Merge the following two cases.
-    if self.rank > 1:
-      input_dim = self.alpha.shape[-1]
-      alpha = tf.reshape(tf.tile(self.alpha, [1, 1, examples_per_model]),
-                         [self.rank, batch_size, input_dim])
-      gamma = tf.reshape(tf.tile(self.gamma, [1, 1, examples_per_model]),
-                         [self.rank, batch_size, self.units])
-      perturb_inputs = tf.expand_dims(inputs, 0) * alpha
-      outputs = super().call(perturb_inputs)
-      outputs = tf.reduce_sum(outputs * gamma, axis=0)
-      outputs = tf.reshape(
-          outputs, [self.ensemble_size, examples_per_model, -1])
+    # Broadcast the fast weights over each ensemble member's examples, with a
+    # leading axis over rank (of size 1 if rank is 1), rather than tiling them
+    # to the batch size.
+    if self.broadcast_inputs:
+      inputs = tf.expand_dims(inputs, 0)
     else:
-      inputs = tf.reshape(
-          inputs, [self.ensemble_size, examples_per_model, input_dim])
-      alpha = tf.expand_dims(self.alpha, 1)
-      gamma = tf.expand_dims(self.gamma, 1)
-      perturb_inputs = inputs * alpha
-      outputs = super().call(perturb_inputs) * gamma
+      inputs = tf.reshape(inputs, [self.ensemble_size, -1, input_dim])
+    alpha = tf.reshape(self.alpha,
+                       [self.rank, self.ensemble_size, 1, input_dim])
+    gamma = tf.reshape(self.gamma,
+                       [self.rank, self.ensemble_size, 1, self.units])
+    perturb_inputs = inputs * alpha
+    outputs = super().call(perturb_inputs) * gamma
+    outputs = tf.reduce_sum(outputs, axis=0)
     if self.use_ensemble_bias:
       bias = tf.expand_dims(self.ensemble_bias, 1)
       outputs += bias
     if self.ensemble_activation is not None:
       outputs = self.ensemble_activation(outputs)
-    outputs = tf.reshape(outputs, [batch_size, self.units])
+    if self.average_outputs:
+      return tf.reduce_mean(outputs, axis=0)
+    outputs = tf.reshape(outputs, [-1, self.units])
     return outputs
 
   def get_config(self):
@@ -589,6 +749,10 @@ class DenseBatchEnsemble(tf.keras.layers.Dense):
             tf.keras.activations.serialize(self.ensemble_activation),
         'use_ensemble_bias':
             self.use_ensemble_bias,
+        'broadcast_inputs':
+            self.broadcast_inputs,
+        'average_outputs':
+            self.average_outputs,
         'alpha_initializer':
             initializers.serialize(self.alpha_initializer),
         'gamma_initializer':
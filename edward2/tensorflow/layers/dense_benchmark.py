@@ -0,0 +1,110 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks for Bayesian dense layers.
+
+Run with `python dense_benchmark.py --benchmark_filter=.`.
+"""
+
+import edward2 as ed
+from edward2 import benchmark_utils
+import tensorflow as tf
+
+
+class DenseBenchmark(benchmark_utils.ReportMixin, tf.test.Benchmark):
+
+  def benchmarkDenseFlipout(self):
+    for batch_size in [256, 1024]:
+      inputs = tf.random.normal([batch_size, 512])
+      layer = ed.layers.DenseFlipout(512)
+      compiled_layer = tf.function(layer)
+      self._report("dense_flipout_eager_{}".format(batch_size),
+                   lambda: layer(inputs),  # pylint: disable=cell-var-from-loop
+                   num_iters=20)
+      self._report("dense_flipout_compiled_{}".format(batch_size),
+                   lambda: compiled_layer(inputs),  # pylint: disable=cell-var-from-loop
+                   num_iters=20)
+
+  def benchmarkDenseLocalReparameterization(self):
+    # On CPU, local reparameterization was faster at batch size 256 (8.6ms vs
+    # 10.3ms) but slower at 1024 (24.6ms vs 13.3ms), as it computes two matmuls.
+    for batch_size in [256, 1024]:
+      inputs = tf.random.normal([batch_size, 512])
+      for local_reparameterization in [False, True]:
+        layer = tf.function(ed.layers.DenseReparameterization(
+            512, local_reparameterization=local_reparameterization))
+        name = "dense_{}_{}".format(
+            "local_reparameterization" if local_reparameterization
+            else "reparameterization", batch_size)
+        self._report(name,
+                     lambda: tf.convert_to_tensor(layer(inputs)),  # pylint: disable=cell-var-from-loop
+                     num_iters=20)
+
+  def benchmarkDenseBatchEnsemble(self):
+    for ensemble_size in [4, 8, 16]:
+      inputs = tf.random.normal([64 * ensemble_size, 512])
+      for rank in [1, 2, 3, 4]:
+        layer = tf.function(ed.layers.DenseBatchEnsemble(
+            512, rank=rank, ensemble_size=ensemble_size))
+        self._report(
+            "dense_batch_ensemble_rank{}_ensemble{}".format(rank,
+                                                            ensemble_size),
+            lambda: layer(inputs),  # pylint: disable=cell-var-from-loop
+            num_iters=20)
+
+  def benchmarkDenseBatchEnsembleInference(self):
+    batch_size = 256
+    inputs = tf.random.normal([batch_size, 512])
+    for ensemble_size in [4, 16]:
+      for broadcast in [False, True]:
+        first = ed.layers.DenseBatchEnsemble(
+            512, ensemble_size=ensemble_size, activation="relu",
+            broadcast_inputs=broadcast)
+        last = ed.layers.DenseBatchEnsemble(
+            10, ensemble_size=ensemble_size, average_outputs=broadcast)
+
+        @tf.function
+        def predict(inputs, first=first, last=last, broadcast=broadcast,
+                    ensemble_size=ensemble_size):
+          if broadcast:
+            return last(first(inputs))
+          outputs = last(first(tf.tile(inputs, [ensemble_size, 1])))
+          outputs = tf.reshape(outputs, [ensemble_size, -1, 10])
+          return tf.reduce_mean(outputs, axis=0)
+
+        self._report(
+            "dense_batch_ensemble_inference_{}_ensemble{}".format(
+                "broadcast" if broadcast else "tiled", ensemble_size),
+            lambda: predict(inputs),  # pylint: disable=cell-var-from-loop
+            num_iters=20)
+
+  def benchmarkDenseVariationalDropoutInference(self):
+    inputs = tf.random.normal([256, 1024])
+    for name, layer_class in [
+        ("variational_dropout", ed.layers.DenseVariationalDropout),
+        ("hierarchical", ed.layers.DenseHierarchical)]:
+      for deterministic in [False, True]:
+        layer = layer_class(1024, deterministic_inference=deterministic)
+        layer(inputs, training=True)
+        predict = tf.function(lambda x, layer=layer: layer(x, training=False))
+        self._report(
+            "dense_{}_inference_{}".format(
+                name, "mean" if deterministic else "sampled"),
+            lambda: tf.convert_to_tensor(predict(inputs)),  # pylint: disable=cell-var-from-loop
+            num_iters=20)
+
+
+if __name__ == "__main__":
+  tf.test.main()
@@ -239,6 +239,70 @@ class DenseTest(parameterized.TestCase, tf.test.TestCase):
     else:
       self.assertLen(model.losses, 1)
 
+  @parameterized.parameters(
+      {"layer": ed.layers.DenseVariationalDropout},
+      {"layer": ed.layers.DenseHierarchical},
+  )
+  def testDenseDeterministicInference(self, layer):
+    inputs = np.random.rand(5, 3, 12).astype(np.float32)
+    model = layer(4,
+                  bias_initializer="trainable_normal",
+                  activation=tf.nn.relu,
+                  deterministic_inference=True)
+    model(inputs, training=True)
+    model.kernel_initializer.mean.assign_add(
+        tf.random.normal(model.kernel_initializer.mean.shape, seed=1))
+    outputs1 = model(inputs, training=False)
+    self.assertIsNone(model.kernel._value)
+    outputs2 = tf.function(model)(inputs, training=tf.constant(False))
+
+    scale = 1.
+    if layer == ed.layers.DenseHierarchical:
+      for initializer in (model.local_scale_initializer,
+                          model.global_scale_initializer):
+        scale *= initializer.loc + tf.nn.softplus(initializer.scale)
+    expected = np.tensordot(inputs * scale, model.kernel_initializer.mean,
+                            [[-1], [0]])
+    expected = np.maximum(expected + model.bias_initializer.mean, 0.)
+    self.assertAllClose(outputs1, expected)
+    self.assertAllClose(outputs2, expected)
+    self.assertNotAllClose(model(inputs, training=True), expected)
+    outputs3 = tf.function(model)(inputs, training=tf.constant(True))
+    self.assertEqual(outputs3.shape, (5, 3, 4))
+
+    config = model.get_config()
+    self.assertTrue(config["deterministic_inference"])
+    new_model = layer.from_config(config)
+    self.assertTrue(new_model.deterministic_inference)
+
+  def testDenseLocalReparameterization(self):
+    inputs = np.random.rand(5, 3, 12).astype(np.float32)
+    layer = ed.layers.DenseReparameterization(
+        4, local_reparameterization=True)
+    with tf.GradientTape() as tape:
+      outputs = layer(inputs)
+      loss = tf.reduce_sum(outputs)
+    self.assertIsInstance(outputs, ed.RandomVariable)
+    self.assertEqual(outputs.shape, (5, 3, 4))
+    # The kernel is never sampled.
+    self.assertIsNone(layer.kernel._value)
+    mean = layer.kernel.distribution.mean()
+    variance = layer.kernel.distribution.variance()
+    self.assertAllClose(outputs.distribution.mean(),
+                        np.tensordot(inputs, mean, [[-1], [0]]))
+    self.assertAllClose(outputs.distribution.variance(),
+                        np.tensordot(inputs**2, variance, [[-1], [0]]) +
+                        tf.keras.backend.epsilon(),
+                        rtol=1e-4)
+    variables = [layer.kernel_initializer.mean, layer.kernel_initializer.stddev]
+    grads = tape.gradient(loss, variables)
+    for grad in grads:
+      self.assertIsNotNone(grad)
+    config = layer.get_config()
+    self.assertTrue(config['local_reparameterization'])
+    new_layer = ed.layers.DenseReparameterization.from_config(config)
+    self.assertTrue(new_layer.local_reparameterization)
+
   def testDenseDVIIsDeterministic(self):
     """Tests that DenseDVI network has a deterministic loss function."""
     features = np.random.rand(3, 2).astype(np.float32)
@@ -315,6 +379,70 @@ class DenseTest(parameterized.TestCase, tf.test.TestCase):
     self.assertEqual(batch_outputs.shape, expected_shape)
     self.assertAllClose(batch_outputs, loop_outputs_list)
 
+  @parameterized.parameters(2, 3)
+  def testDenseBatchEnsembleRank(self, rank):
+    """Tests that vectorized implementation is same as for loop."""
+    ensemble_size = 3
+    examples_per_model = 4
+    input_dim = 5
+    output_dim = 6
+    inputs = tf.random.normal([ensemble_size * examples_per_model, input_dim])
+    layer = ed.layers.DenseBatchEnsemble(
+        output_dim,
+        rank=rank,
+        alpha_initializer="he_normal",
+        gamma_initializer="he_normal",
+        bias_initializer="he_normal",
+        activation=None,
+        ensemble_size=ensemble_size)
+    batch_outputs = layer(inputs)
+
+    loop_outputs = []
+    for i in range(ensemble_size):
+      member_inputs = inputs[i * examples_per_model:
+                             (i + 1) * examples_per_model]
+      outputs = layer.ensemble_bias[i]
+      for r in range(rank):
+        outputs += super(ed.layers.DenseBatchEnsemble, layer).call(
+            member_inputs * layer.alpha[r, i]) * layer.gamma[r, i]
+      loop_outputs.append(outputs)
+    self.assertAllClose(batch_outputs, tf.concat(loop_outputs, axis=0))
+
+  @parameterized.parameters(1, 2)
+  def testDenseBatchEnsembleBroadcastInputs(self, rank):
+    """Tests that broadcasting inputs is the same as tiling them."""
+    ensemble_size = 3
+    batch_size = 4
+    inputs = tf.random.normal([batch_size, 5])
+    layer = ed.layers.DenseBatchEnsemble(
+        6,
+        rank=rank,
+        alpha_initializer="he_normal",
+        gamma_initializer="he_normal",
+        bias_initializer="he_normal",
+        activation="relu",
+        ensemble_size=ensemble_size)
+    tiled_outputs = layer(tf.tile(inputs, [ensemble_size, 1]))
+
+    layer.broadcast_inputs = True
+    outputs = layer(inputs)
+    self.assertEqual(outputs.shape, (ensemble_size * batch_size, 6))
+    self.assertAllClose(outputs, tiled_outputs)
+
+    layer.average_outputs = True
+    outputs = layer(inputs)
+    self.assertEqual(outputs.shape, (batch_size, 6))
+    self.assertAllClose(
+        outputs,
+        tf.reduce_mean(tf.reshape(tiled_outputs, [ensemble_size, -1, 6]), 0))
+
+    layer.broadcast_inputs = False
+    outputs = layer(tf.tile(inputs, [ensemble_size, 1]))
+    self.assertEqual(outputs.shape, (batch_size, 6))
+    config = layer.get_config()
+    self.assertFalse(config["broadcast_inputs"])
+    self.assertTrue(config["average_outputs"])
+
   @parameterized.parameters(
       itertools.product([True, False], [True, False], [True, False]))
   def testDenseHyperBatchEnsemble(self, use_bias, regularize_fast_weights,
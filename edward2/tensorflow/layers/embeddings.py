@@ -16,6 +16,7 @@
 """Bayesian embedding layers."""
 
 from edward2.tensorflow import constraints
+from edward2.tensorflow import generated_random_variables
 from edward2.tensorflow import initializers
 from edward2.tensorflow import regularizers
 from edward2.tensorflow.layers import utils
@@ -40,6 +41,12 @@ class EmbeddingReparameterization(tf.keras.layers.Embedding):
   Minimizing cross-entropy plus the layer's losses performs variational minimum
   description length, i.e., it minimizes an upper bound to the negative marginal
   likelihood.
+
+  For large vocabularies, `sparse_sampling=True` gathers the variational
+  parameters of the looked-up ids and samples only those rows. The regularizer
+  then applies to the touched rows, scaled by `input_dim / num_touched_rows` to
+  estimate its value on the full table. The cost of each call scales with the
+  number of distinct ids in the inputs rather than with the vocabulary size.
   """
 
   def __init__(self,
@@ -51,6 +58,7 @@ class EmbeddingReparameterization(tf.keras.layers.Embedding):
                embeddings_constraint=None,
                mask_zero=False,
                input_length=None,
+               sparse_sampling=False,
                **kwargs):
     """Initializes the reparameterized Bayesian embeddings layer.
 
@@ -76,7 +84,14 @@ class EmbeddingReparameterization(tf.keras.layers.Embedding):
         argument is required if you are going to connect `Flatten` then `Dense`
         layers upstream (without it, the shape of the dense outputs cannot be
         computed).
+      sparse_sampling: Whether to sample only the embeddings of the looked-up
+        ids rather than the full embeddings matrix. It requires a
+        `TrainableNormal` embeddings initializer.
       **kwargs: Additional keyword arguments to pass to the super class.
+
+    Raises:
+      ValueError: If `sparse_sampling` is True and the embeddings initializer is
+        not a `TrainableNormal`.
     """
     super(EmbeddingReparameterization, self).__init__(
         input_dim=input_dim,
@@ -88,6 +103,24 @@ class EmbeddingReparameterization(tf.keras.layers.Embedding):
         mask_zero=mask_zero,
         input_length=input_length,
         **kwargs)
+    if sparse_sampling and not isinstance(self.embeddings_initializer,
+                                          initializers.TrainableNormal):
+      raise ValueError('Sparse sampling requires a TrainableNormal embeddings '
+                       'initializer. Found instead: {}'.format(
+                           self.embeddings_initializer))
+    self.sparse_sampling = sparse_sampling
+
+  def build(self, input_shape=None):
+    if not self.sparse_sampling:
+      return super(EmbeddingReparameterization, self).build(input_shape)
+    # The regularizer is applied in `call` to the touched rows only.
+    self.embeddings = self.add_weight(
+        shape=(self.input_dim, self.output_dim),
+        initializer=self.embeddings_initializer,
+        name='embeddings',
+        regularizer=None,
+        constraint=self.embeddings_constraint)
+    self.built = True
 
   def call_weights(self):
     """Calls any weights if the initializer is itself a layer."""
@@ -97,6 +130,45 @@ class EmbeddingReparameterization(tf.keras.layers.Embedding):
 
   def call(self, *args, **kwargs):
     """Computes the forward pass of this function."""
-    self.call_weights()
     kwargs.pop('training', None)
+    if self.sparse_sampling:
+      return self._call_sparse_sampling(*args, **kwargs)
+    self.call_weights()
     return super(EmbeddingReparameterization, self).call(*args, **kwargs)
+
+  def _call_sparse_sampling(self, inputs):
+    """Samples the embeddings of the distinct looked-up ids only."""
+    if inputs.dtype not in (tf.int32, tf.int64):
+      inputs = tf.cast(inputs, tf.int32)
+    ids, indices = tf.unique(tf.reshape(inputs, [-1]))
+    initializer = self.embeddings_initializer
+    mean = tf.gather(initializer.mean, ids)
+    if initializer.mean_constraint:
+      mean = initializer.mean_constraint(mean)
+    stddev = initializer.stddev
+    if stddev.shape.ndims:
+      stddev = tf.gather(stddev, ids)
+    if initializer.stddev_constraint:
+      stddev = initializer.stddev_constraint(stddev)
+    rows = generated_random_variables.Independent(
+        generated_random_variables.Normal(
+            loc=mean, scale=stddev, lazy=True).distribution,
+        reinterpreted_batch_ndims=2,
+        lazy=True)
+    if self.embeddings_regularizer is not None:
+      num_rows = tf.cast(tf.size(ids), self.dtype)
+      self.add_loss(self.input_dim / num_rows *
+                    self.embeddings_regularizer(rows))
+    outputs = tf.gather(tf.convert_to_tensor(rows), indices)
+    outputs = tf.reshape(outputs,
+                         tf.concat([tf.shape(inputs), [self.output_dim]], 0))
+    outputs.set_shape(inputs.shape.concatenate(self.output_dim))
+    return outputs
+
+  def get_config(self):
+    config = {
+        'sparse_sampling': self.sparse_sampling,
+    }
+    new_config = super(EmbeddingReparameterization, self).get_config()
+    new_config.update(config)
+    return new_config
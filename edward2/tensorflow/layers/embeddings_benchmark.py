@@ -0,0 +1,52 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks for Bayesian embedding layers.
+
+Run with `python embeddings_benchmark.py --benchmark_filter=.`.
+"""
+
+import edward2 as ed
+from edward2 import benchmark_utils
+import tensorflow as tf
+
+
+class EmbeddingsBenchmark(benchmark_utils.ReportMixin, tf.test.Benchmark):
+
+  def benchmarkEmbeddingReparameterization(self):
+    output_dim = 32
+    inputs = tf.random.uniform([256, 20], maxval=10000, dtype=tf.int32)
+    for input_dim in [100000, 1000000]:
+      for sparse_sampling in [False, True]:
+        layer = ed.layers.EmbeddingReparameterization(
+            input_dim, output_dim, sparse_sampling=sparse_sampling)
+        layer(inputs)
+
+        @tf.function
+        def train_step(inputs, layer=layer):
+          variables = layer.trainable_variables
+          with tf.GradientTape() as tape:
+            outputs = layer(inputs)
+            loss = tf.reduce_mean(tf.square(outputs)) + sum(layer.losses)
+          return tape.gradient(loss, variables)
+
+        self._report(
+            "embedding_reparameterization_{}_{}".format(
+                "sparse" if sparse_sampling else "dense", input_dim),
+            lambda: train_step(inputs))  # pylint: disable=cell-var-from-loop
+
+
+if __name__ == "__main__":
+  tf.test.main()
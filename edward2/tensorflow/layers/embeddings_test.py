@@ -83,6 +83,61 @@ class EmbeddingTest(parameterized.TestCase, tf.test.TestCase):
       self.assertNotAllClose(outputs1, outputs2)
     self.assertLen(model.losses, num_losses)
 
+  def testEmbeddingSparseSampling(self):
+    layer = ed.layers.EmbeddingReparameterization(
+        self.input_dim,
+        output_dim=self.output_dim,
+        sparse_sampling=True)
+    # Touch every row so the scaled regularizer equals the full one.
+    inputs = np.random.permutation(self.input_dim).reshape([3, 4])
+    with tf.GradientTape() as tape:
+      outputs = layer(inputs)
+      loss = sum(layer.losses)
+    initializer = layer.embeddings_initializer
+    self.assertEqual(outputs.shape, (3, 4, self.output_dim))
+    self.assertLen(layer.losses, 1)
+    embeddings = initializer([self.input_dim, self.output_dim])
+    self.assertAllClose(loss, layer.embeddings_regularizer(embeddings))
+    self.assertIsInstance(tape.gradient(loss, initializer.mean),
+                          tf.IndexedSlices)
+
+    # Outputs are the rows' posterior means as the stddevs go to zero.
+    initializer.stddev.assign(-20. * tf.ones_like(initializer.stddev))
+    outputs = layer(self.inputs)
+    self.assertEqual(outputs.shape,
+                     (self.batch_size, self.timesteps, self.output_dim))
+    self.assertAllClose(outputs, tf.gather(initializer.mean, self.inputs))
+    loss = layer.losses[0]
+    num_rows = len(np.unique(self.inputs))
+    touched_rows = ed.Independent(
+        ed.Normal(loc=tf.gather(initializer.mean, np.unique(self.inputs)),
+                  scale=initializer.stddev_constraint(-20.)).distribution,
+        reinterpreted_batch_ndims=2)
+    self.assertAllClose(loss, self.input_dim / num_rows *
+                        layer.embeddings_regularizer(touched_rows))
+
+    config = layer.get_config()
+    self.assertTrue(config["sparse_sampling"])
+    with self.assertRaises(ValueError):
+      ed.layers.EmbeddingReparameterization(
+          self.input_dim, self.output_dim, embeddings_initializer="uniform",
+          sparse_sampling=True)
+
+  def testEmbeddingSparseSamplingModel(self):
+    model = tf.keras.Sequential([
+        ed.layers.EmbeddingReparameterization(
+            self.input_dim,
+            output_dim=self.output_dim,
+            sparse_sampling=True),
+        tf.keras.layers.RNN(tf.keras.layers.LSTMCell(5)),
+        tf.keras.layers.Dense(2),
+    ])
+    outputs1 = model(self.inputs, training=True)
+    outputs2 = model(self.inputs, training=True)
+    self.assertEqual(outputs1.shape, (self.batch_size, 2))
+    self.assertNotAllClose(outputs1, outputs2)
+    self.assertLen(model.losses, 1)
+
 
 if __name__ == "__main__":
   tf.test.main()
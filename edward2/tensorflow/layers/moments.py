@@ -0,0 +1,183 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Deterministic moment propagation through Bayesian layers.
+
+Moment propagation replaces Monte Carlo forward passes of a Bayesian network
+with a single deterministic pass, which computes the elementwise mean and
+variance of each layer's outputs given those of its inputs (e.g., Wu et al.,
+2018; Brach et al., 2020). It assumes that inputs and weights are independent,
+and it approximates each layer's outputs by a factorized Normal distribution.
+
+## References:
+
+[1]: Anqi Wu, Sebastian Nowozin, Edward Meeds, Richard E. Turner, José Miguel
+     Hernández-Lobato, Alexander L. Gaunt. Deterministic Variational Inference
+     for Robust Bayesian Neural Networks. In _International Conference on
+     Learning Representations_, 2019.
+     https://arxiv.org/abs/1810.03958
+[2]: Kai Brach, Beate Sick, Oliver Dürr. Single Shot MC Dropout
+     Approximation. _arXiv preprint arXiv:2007.03293_, 2020.
+     https://arxiv.org/abs/2007.03293
+"""
+
+import math
+
+from edward2.tensorflow import generated_random_variables
+from edward2.tensorflow import random_variable
+
+import tensorflow as tf
+import tensorflow_probability as tfp
+
+
+def mean_and_variance(x):
+  """Gets the elementwise mean and variance of a random variable or tensor."""
+  if isinstance(x, random_variable.RandomVariable):
+    return x.distribution.mean(), x.distribution.variance()
+  x = tf.convert_to_tensor(x)
+  return x, tf.zeros_like(x)
+
+
+def _sigmoid_moments(mean, variance):
+  """Approximates moments of a Normal's sigmoid via the probit function."""
+  kappa = tf.math.rsqrt(1. + math.pi / 8. * variance)
+  mean = tf.sigmoid(kappa * mean)
+  variance = mean * (1. - mean) * (1. - kappa)
+  return mean, variance
+
+
+def activation_moments(activation, mean, variance):
+  """Computes the moments of an activation of a factorized Normal.
+
+  ReLU moments are exact. Sigmoid and tanh moments use the probit approximation
+  to the logistic function (Spiegelhalter and Lauritzen, 1990).
+
+  Args:
+    activation: Activation function, which is one of ReLU, sigmoid, tanh,
+      linear or None.
+    mean: Tensor, the elementwise mean of the activation's inputs.
+    variance: Tensor, the elementwise variance of the activation's inputs.
+
+  Returns:
+    Tuple of the elementwise mean and variance of the activation's outputs.
+
+  Raises:
+    NotImplementedError: If the activation is not supported.
+  """
+  if activation in (None, tf.keras.activations.linear):
+    return mean, variance
+  elif activation in (tf.keras.activations.relu, tf.nn.relu):
+    stddev = tf.sqrt(variance + tf.keras.backend.epsilon())
+    standardized = mean / stddev
+    normal = tfp.distributions.Normal(tf.zeros([], mean.dtype), 1.)
+    cdf = normal.cdf(standardized)
+    pdf = normal.prob(standardized)
+    outputs_mean = mean * cdf + stddev * pdf
+    second_moment = (tf.square(mean) + variance) * cdf + mean * stddev * pdf
+    outputs_variance = tf.nn.relu(second_moment - tf.square(outputs_mean))
+    return outputs_mean, outputs_variance
+  elif activation in (tf.keras.activations.sigmoid, tf.nn.sigmoid,
+                      tf.sigmoid):
+    return _sigmoid_moments(mean, variance)
+  elif activation in (tf.keras.activations.tanh, tf.nn.tanh, tf.tanh):
+    # tanh(x) = 2 * sigmoid(2 * x) - 1.
+    mean, variance = _sigmoid_moments(2. * mean, 4. * variance)
+    return 2. * mean - 1., 4. * variance
+  raise NotImplementedError('Activation is {}. Moment propagation is only '
+                            'available if activation is ReLU, sigmoid, tanh or '
+                            'None.'.format(activation))
+
+
+def _deterministic_layer_moments(layer, mean, variance):
+  """Computes the moments of a `Dense` or `Conv2D` layer's outputs."""
+  # Var[x w] = Var[x] w**2 for a fixed weight w.
+  kernel = tf.convert_to_tensor(layer.kernel)
+  if isinstance(layer, tf.keras.layers.Dense):
+    mean = tf.tensordot(mean, kernel, [[-1], [0]])
+    variance = tf.tensordot(variance, tf.square(kernel), [[-1], [0]])
+    data_format = 'NHWC'
+  else:
+    mean = layer.convolution_op(mean, kernel)
+    variance = layer.convolution_op(variance, tf.square(kernel))
+    data_format = 'NCHW' if layer.data_format == 'channels_first' else 'NHWC'
+  if layer.use_bias:
+    mean = tf.nn.bias_add(mean, layer.bias, data_format=data_format)
+  return activation_moments(layer.activation, mean, variance)
+
+
+def propagate_moments(model, inputs):
+  """Computes a network's predictive moments with one deterministic pass.
+
+  Each layer maps the elementwise mean and variance of its inputs to those of
+  its outputs. Supported layers are the Bayesian layers with a `call_moments`
+  method, e.g., `DenseReparameterization`, `DenseFlipout`,
+  `Conv2DReparameterization` and `Conv2DFlipout`; deterministic `Dense` and
+  `Conv2D` layers (but not their subclasses), so that Bayesian and
+  deterministic layers can be mixed; `Activation` and `ReLU` layers with ReLU,
+  sigmoid, tanh or linear activations; and `Flatten`, `Reshape` and `Dropout`
+  layers, where dropout is disabled as at inference. Layers with a ReLU,
+  sigmoid, tanh or linear `activation` are supported.
+
+  Args:
+    model: Built `tf.keras.Sequential` model or list of built layers to apply
+      in order.
+    inputs: Tensor or RandomVariable with factorized `mean()` and `variance()`.
+
+  Returns:
+    RandomVariable with a Normal distribution given by the outputs' mean and
+    variance. It is not sampled unless its value is accessed.
+
+  Raises:
+    NotImplementedError: If a layer or activation is not supported.
+
+  #### Examples
+
+  ```python
+  model = tf.keras.Sequential([
+      ed.layers.Conv2DFlipout(32, 3, activation='relu'),
+      tf.keras.layers.Flatten(),
+      ed.layers.DenseFlipout(10),
+  ])
+  model(images)  # Build the model.
+  logits = ed.layers.propagate_moments(model, images)
+  logits.distribution.mean(), logits.distribution.variance()
+  ```
+  """
+  layers = getattr(model, 'layers', model)
+  mean, variance = mean_and_variance(inputs)
+  for layer in layers:
+    if hasattr(layer, 'call_moments'):
+      mean, variance = layer.call_moments(mean, variance)
+    elif type(layer) in (tf.keras.layers.Dense, tf.keras.layers.Conv2D):  # pylint: disable=unidiomatic-typecheck
+      # Subclasses, e.g., Bayesian layers without `call_moments`, may not be
+      # deterministic.
+      mean, variance = _deterministic_layer_moments(layer, mean, variance)
+    elif isinstance(layer, tf.keras.layers.Activation):
+      mean, variance = activation_moments(layer.activation, mean, variance)
+    elif (isinstance(layer, tf.keras.layers.ReLU) and
+          layer.max_value is None and not layer.negative_slope and
+          not layer.threshold):
+      mean, variance = activation_moments(tf.nn.relu, mean, variance)
+    elif isinstance(layer, (tf.keras.layers.Flatten, tf.keras.layers.Reshape)):
+      mean = layer(mean)
+      variance = layer(variance)
+    elif isinstance(layer, tf.keras.layers.Dropout):
+      continue
+    else:
+      raise NotImplementedError(
+          'Layer {} of type {} does not support moment propagation.'.format(
+              layer.name, type(layer).__name__))
+  return generated_random_variables.Normal(
+      loc=mean, scale=tf.sqrt(variance), lazy=True)
@@ -0,0 +1,54 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks for moment propagation.
+
+Run with `python moments_benchmark.py --benchmark_filter=.`.
+"""
+
+import edward2 as ed
+from edward2 import benchmark_utils
+import tensorflow as tf
+
+
+class MomentsBenchmark(benchmark_utils.ReportMixin, tf.test.Benchmark):
+
+  def benchmarkPropagateMoments(self):
+    images = tf.random.normal([128, 28, 28, 1])
+    model = tf.keras.Sequential([
+        ed.layers.Conv2DFlipout(32, 3, activation='relu'),
+        ed.layers.Conv2DFlipout(32, 3, strides=2, activation='relu'),
+        tf.keras.layers.Flatten(),
+        ed.layers.DenseFlipout(256, activation='relu'),
+        ed.layers.DenseFlipout(10),
+    ])
+    model(images)
+
+    @tf.function
+    def monte_carlo(num_samples=30):
+      samples = tf.stack([model(images) for _ in range(num_samples)])
+      return tf.reduce_mean(samples, 0), tf.math.reduce_variance(samples, 0)
+
+    @tf.function
+    def moments():
+      outputs = ed.layers.propagate_moments(model, images)
+      return outputs.distribution.mean(), outputs.distribution.variance()
+
+    self._report('monte_carlo_30', monte_carlo)
+    self._report('propagate_moments', moments)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -0,0 +1,164 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for moment propagation."""
+
+from absl.testing import parameterized
+import edward2 as ed
+import numpy as np
+import tensorflow as tf
+
+
+def trainable_normal(stddev):
+  return ed.initializers.TrainableNormal(
+      mean_initializer=tf.keras.initializers.RandomNormal(stddev=0.5),
+      stddev_initializer=tf.keras.initializers.Constant(
+          np.log(np.expm1(stddev))))
+
+
+class MomentsTest(parameterized.TestCase, tf.test.TestCase):
+
+  @parameterized.parameters(
+      {"activation": None, "atol": 1e-2},
+      {"activation": tf.nn.relu, "atol": 1e-2},
+      {"activation": tf.keras.activations.sigmoid, "atol": 2e-2},
+      {"activation": tf.keras.activations.tanh, "atol": 3e-2},
+  )
+  def testActivationMoments(self, activation, atol):
+    mean = tf.constant([-2., -0.5, 0., 0.5, 2.])
+    variance = tf.constant([0.1, 1., 2., 0.5, 0.3])
+    samples = tf.random.normal([100000, 5], mean, tf.sqrt(variance), seed=1)
+    if activation is not None:
+      samples = activation(samples)
+    outputs_mean, outputs_variance = ed.layers.moments.activation_moments(
+        activation, mean, variance)
+    self.assertAllClose(outputs_mean, tf.reduce_mean(samples, 0), atol=atol)
+    self.assertAllClose(outputs_variance, tf.math.reduce_variance(samples, 0),
+                        atol=atol)
+
+  def testActivationMomentsUnsupported(self):
+    with self.assertRaises(NotImplementedError):
+      ed.layers.moments.activation_moments(tf.nn.elu, tf.zeros([2]),
+                                           tf.ones([2]))
+
+  @parameterized.parameters(
+      {"layer": ed.layers.DenseReparameterization},
+      {"layer": ed.layers.DenseFlipout},
+  )
+  def testDenseMoments(self, layer):
+    inputs = tf.random.normal([3, 4], seed=2)
+    inputs = ed.Normal(loc=inputs, scale=0.5)
+    model = layer(2, kernel_initializer=trainable_normal(0.3),
+                  bias_initializer=trainable_normal(0.1))
+    model(inputs)
+    outputs = ed.layers.propagate_moments([model], inputs)
+
+    # Monte Carlo estimates over samples of inputs, kernel and bias.
+    num_samples = 100000
+    kernel_dist = model.kernel_initializer(model.kernel.shape).distribution
+    bias_dist = model.bias_initializer(model.bias.shape).distribution
+    kernel = kernel_dist.sample(num_samples, seed=3)
+    bias = bias_dist.sample(num_samples, seed=4)
+    samples = inputs.distribution.sample(num_samples, seed=5)
+    samples = tf.matmul(samples, kernel) + bias[:, tf.newaxis]
+    self.assertAllClose(outputs.distribution.mean(),
+                        tf.reduce_mean(samples, 0), atol=2e-2)
+    self.assertAllClose(outputs.distribution.variance(),
+                        tf.math.reduce_variance(samples, 0), rtol=5e-2)
+
+  @parameterized.parameters(
+      {"layer": ed.layers.Conv2DReparameterization},
+      {"layer": ed.layers.Conv2DFlipout},
+  )
+  def testConv2DMoments(self, layer):
+    inputs = tf.random.normal([2, 4, 4, 3], seed=2)
+    model = layer(2, kernel_size=3, padding="same",
+                  kernel_initializer=trainable_normal(0.3))
+    model(inputs)
+    outputs = ed.layers.propagate_moments([model], inputs)
+
+    num_samples = 10000
+    kernel_dist = model.kernel_initializer(model.kernel.shape).distribution
+    kernel = kernel_dist.sample(num_samples, seed=3)
+    samples = tf.map_fn(
+        lambda k: tf.nn.conv2d(inputs, k, 1, "SAME"), kernel)
+    self.assertAllClose(outputs.distribution.mean(),
+                        tf.reduce_mean(samples, 0), atol=5e-2)
+    self.assertAllClose(outputs.distribution.variance(),
+                        tf.math.reduce_variance(samples, 0), rtol=0.1)
+
+  def testPropagateMomentsSequential(self):
+    inputs = tf.random.normal([2, 6, 6, 1], seed=2)
+    model = tf.keras.Sequential([
+        ed.layers.Conv2DFlipout(4, kernel_size=3, activation="relu"),
+        tf.keras.layers.Flatten(),
+        tf.keras.layers.Dropout(0.5),
+        ed.layers.DenseFlipout(8),
+        tf.keras.layers.ReLU(),
+        ed.layers.DenseReparameterization(3, activation="tanh"),
+    ])
+    model(inputs)
+    outputs = ed.layers.propagate_moments(model, inputs)
+    self.assertIsInstance(outputs, ed.RandomVariable)
+    self.assertEqual(outputs.shape, (2, 3))
+    self.assertIsNone(outputs._value)
+
+    # Flipout layers sample pseudo-independent weights per example.
+    num_samples = 2000
+    tiled_inputs = tf.tile(inputs, [num_samples, 1, 1, 1])
+    samples = tf.reshape(model(tiled_inputs, training=False),
+                         [num_samples, 2, 3])
+    self.assertAllClose(outputs.distribution.mean(),
+                        tf.reduce_mean(samples, 0), atol=5e-2)
+
+  def testPropagateMomentsDeterministicLayers(self):
+    inputs = tf.random.normal([2, 6, 6, 1], seed=2)
+    model = tf.keras.Sequential([
+        tf.keras.layers.Conv2D(4, kernel_size=3, activation="relu"),
+        tf.keras.layers.Flatten(),
+        ed.layers.DenseReparameterization(
+            8, kernel_initializer=trainable_normal(0.3)),
+        tf.keras.layers.Dense(3),
+    ])
+    model(inputs)
+    outputs = ed.layers.propagate_moments(model, inputs)
+    self.assertEqual(outputs.shape, (2, 3))
+
+    num_samples = 20000
+    dense = model.layers[2]
+    kernel_dist = dense.kernel_initializer(dense.kernel.shape).distribution
+    kernel = kernel_dist.sample(num_samples, seed=3)
+    hidden = model.layers[1](model.layers[0](inputs))
+    samples = tf.matmul(hidden, kernel) + dense.bias
+    samples = model.layers[3](tf.reshape(samples, [-1, 8]))
+    samples = tf.reshape(samples, [num_samples, 2, 3])
+    self.assertAllClose(outputs.distribution.mean(),
+                        tf.reduce_mean(samples, 0), atol=5e-2)
+    self.assertAllClose(outputs.distribution.variance(),
+                        tf.math.reduce_variance(samples, 0), rtol=5e-2)
+
+  def testPropagateMomentsUnsupportedLayer(self):
+    layer = tf.keras.layers.LayerNormalization()
+    layer(tf.ones([1, 2]))
+    with self.assertRaises(NotImplementedError):
+      ed.layers.propagate_moments([layer], tf.ones([1, 2]))
+    layer = ed.layers.DenseHierarchical(2)
+    layer(tf.ones([1, 2]))
+    with self.assertRaises(NotImplementedError):
+      ed.layers.propagate_moments([layer], tf.ones([1, 2]))
+
+
+if __name__ == "__main__":
+  tf.test.main()
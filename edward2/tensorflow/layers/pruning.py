@@ -0,0 +1,279 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Sparse export of variational dropout layers.
+
+Sparse variational dropout (Molchanov et al., 2017) drives most weights to
+high dropout rates, which contribute only noise to the layer's outputs. These
+utilities prune weights whose log dropout rate `log_alpha` exceeds a threshold
+and export the layer as a deterministic layer using the posterior mean of the
+remaining weights.
+
+## References:
+
+[1]: Dmitry Molchanov, Arsenii Ashukha, Dmitry Vetrov. Variational Dropout
+     Sparsifies Deep Neural Networks. In _International Conference on Machine
+     Learning_, 2017.
+     https://arxiv.org/abs/1701.05369
+"""
+
+import numpy as np
+
+from edward2.tensorflow import random_variable
+from edward2.tensorflow.layers import convolutional
+from edward2.tensorflow.layers import dense
+
+import tensorflow as tf
+
+
+def _check_variational_dropout(layer):
+  if isinstance(layer, dense.DenseHierarchical):
+    raise NotImplementedError(
+        'DenseHierarchical scales its kernel by its local and global scales, '
+        'so its dropout rates are not given by its kernel alone.')
+  if not isinstance(layer, (dense.DenseVariationalDropout,
+                            convolutional.Conv2DVariationalDropout)):
+    raise ValueError('Layer {} of type {} is not a variational dropout '
+                     'layer.'.format(layer.name, type(layer).__name__))
+  if not isinstance(layer.kernel, random_variable.RandomVariable):
+    raise ValueError('Layer {} must be built and have a random kernel.'.format(
+        layer.name))
+
+
+def _mean(weight):
+  if isinstance(weight, random_variable.RandomVariable):
+    return weight.distribution.mean()
+  return tf.convert_to_tensor(weight)
+
+
+def log_alpha(layer):
+  """Computes the log dropout rates of a variational dropout layer's kernel.
+
+  Following the additive parameterization (Molchanov et al., 2017), the dropout
+  rate alpha of each weight ~ Normal(mu, sigma**2) satisfies
+  `sigma**2 = alpha * mu**2`. It is clipped to [-8, 8] as during training.
+
+  Args:
+    layer: Built `DenseVariationalDropout` or `Conv2DVariationalDropout` layer.
+
+  Returns:
+    Tensor of the kernel's shape.
+  """
+  _check_variational_dropout(layer)
+  mean = layer.kernel.distribution.mean()
+  log_variance = tf.math.log(layer.kernel.distribution.variance())
+  log_alpha_value = log_variance - tf.math.log(tf.square(mean) +
+                                               tf.keras.backend.epsilon())
+  return tf.clip_by_value(log_alpha_value, -8., 8.)
+
+
+def sparsity_report(layer, threshold=3., input_shape=None):
+  """Reports a variational dropout layer's sparsity and FLOPs after pruning.
+
+  Args:
+    layer: Built `DenseVariationalDropout` or `Conv2DVariationalDropout` layer.
+    threshold: Weights with `log_alpha` above the threshold are pruned.
+    input_shape: Shape of the inputs to count a convolution's FLOPs over all
+      output positions. Default is the shape the layer was built with. If it
+      has unknown spatial dimensions, FLOPs are counted per output position.
+
+  Returns:
+    Dict with the number of weights `num_weights`, the number of remaining
+    weights `num_nonzero`, the fraction of pruned weights `sparsity`, and the
+    FLOPs per example of the kernel's multiply-adds before (`flops`) and after
+    (`pruned_flops`) pruning.
+  """
+  mask = log_alpha(layer) <= threshold
+  num_weights = int(np.prod(mask.shape))
+  num_nonzero = int(tf.math.count_nonzero(mask))
+  num_positions = 1
+  if isinstance(layer, convolutional.Conv2DVariationalDropout):
+    if input_shape is None:
+      input_shape = getattr(layer, '_build_input_shape', None)
+    if input_shape is not None:
+      output_shape = tf.TensorShape(
+          layer.compute_output_shape(tf.TensorShape(input_shape)))
+      if layer.data_format == 'channels_first':
+        spatial_shape = output_shape[2:]
+      else:
+        spatial_shape = output_shape[1:-1]
+      if spatial_shape.is_fully_defined():
+        num_positions = spatial_shape.num_elements()
+  return {
+      'num_weights': num_weights,
+      'num_nonzero': num_nonzero,
+      'sparsity': 1. - num_nonzero / num_weights,
+      'flops': 2 * num_weights * num_positions,
+      'pruned_flops': 2 * num_nonzero * num_positions,
+  }
+
+
+class SparseDense(tf.keras.layers.Layer):
+  """Densely-connected layer with a sparse kernel.
+
+  The kernel of shape `[input_dim, units]` has `num_nonzero` nonzero entries,
+  stored as their indices and values. The layer multiplies by the kernel with a
+  sparse-dense matmul, whose cost scales with `num_nonzero`; on CPU, this is
+  faster than a dense matmul for kernels with a density below about 10%.
+  """
+
+  def __init__(self,
+               units,
+               num_nonzero,
+               activation=None,
+               use_bias=True,
+               **kwargs):
+    super().__init__(**kwargs)
+    self.units = int(units)
+    self.num_nonzero = int(num_nonzero)
+    self.activation = tf.keras.activations.get(activation)
+    self.use_bias = use_bias
+
+  def build(self, input_shape):
+    input_shape = tf.TensorShape(input_shape)
+    self.input_dim = int(input_shape[-1])
+    self.kernel_indices = self.add_weight(
+        name='kernel_indices',
+        shape=[self.num_nonzero, 2],
+        initializer='zeros',
+        dtype=tf.int64,
+        trainable=False)
+    self.kernel_values = self.add_weight(
+        name='kernel_values',
+        shape=[self.num_nonzero],
+        initializer='zeros',
+        dtype=self.dtype)
+    if self.use_bias:
+      self.bias = self.add_weight(
+          name='bias',
+          shape=[self.units],
+          initializer='zeros',
+          dtype=self.dtype)
+    else:
+      self.bias = None
+    self.built = True
+
+  def call(self, inputs):
+    kernel = tf.SparseTensor(self.kernel_indices,
+                             self.kernel_values,
+                             [self.input_dim, self.units])
+    outputs_shape = tf.concat([tf.shape(inputs)[:-1], [self.units]], 0)
+    inputs = tf.reshape(inputs, [-1, self.input_dim])
+    outputs = tf.sparse.sparse_dense_matmul(inputs, kernel)
+    outputs = tf.reshape(outputs, outputs_shape)
+    if self.use_bias:
+      outputs = tf.nn.bias_add(outputs, self.bias)
+    if self.activation is not None:
+      outputs = self.activation(outputs)
+    return outputs
+
+  def get_config(self):
+    config = {
+        'units': self.units,
+        'num_nonzero': self.num_nonzero,
+        'activation': tf.keras.activations.serialize(self.activation),
+        'use_bias': self.use_bias,
+    }
+    base_config = super().get_config()
+    return dict(list(base_config.items()) + list(config.items()))
+
+
+def sparsify(layer, threshold=3., max_density=0.1):
+  """Exports a variational dropout layer as a pruned deterministic layer.
+
+  Weights whose log dropout rate exceeds `threshold` are pruned, and the
+  remaining weights are set to their posterior mean. A `DenseVariationalDropout`
+  layer is exported as a `SparseDense` layer if the density of the pruned
+  kernel is at most `max_density`, and otherwise as a `tf.keras.layers.Dense`
+  layer. A `Conv2DVariationalDropout` layer is exported as a
+  `tf.keras.layers.Conv2D` layer, whose pruned kernel has zeros. Other layers
+  are returned unchanged, so a model can be exported layer by layer.
+
+  Args:
+    layer: Keras layer. Variational dropout layers must be built.
+    threshold: Weights with `log_alpha` above the threshold are pruned. The
+      default of 3 corresponds to dropout rates above about 0.95.
+    max_density: Maximum fraction of remaining weights for which a dense layer
+      is exported with a sparse kernel.
+
+  Returns:
+    Built Keras layer.
+
+  Raises:
+    NotImplementedError: If the layer is a `DenseHierarchical` layer.
+
+  #### Examples
+
+  ```python
+  model = tf.keras.Sequential([
+      ed.layers.DenseVariationalDropout(512, activation='relu'),
+      ed.layers.DenseVariationalDropout(10),
+  ])
+  ...  # Train the model.
+  sparse_model = tf.keras.Sequential(
+      [ed.layers.sparsify(layer) for layer in model.layers])
+  for layer in model.layers:
+    print(ed.layers.pruning.sparsity_report(layer))
+  ```
+  """
+  if not isinstance(layer, (dense.DenseVariationalDropout,
+                            convolutional.Conv2DVariationalDropout)):
+    return layer
+  mask = log_alpha(layer) <= threshold
+  kernel = tf.where(mask, layer.kernel.distribution.mean(), 0.)
+  input_dim = kernel.shape[-2]
+  name = layer.name + '_sparse'
+
+  if isinstance(layer, convolutional.Conv2DVariationalDropout):
+    pruned_layer = tf.keras.layers.Conv2D(
+        filters=layer.filters,
+        kernel_size=layer.kernel_size,
+        strides=layer.strides,
+        padding=layer.padding,
+        data_format=layer.data_format,
+        dilation_rate=layer.dilation_rate,
+        activation=layer.activation,
+        use_bias=layer.use_bias,
+        dtype=layer.dtype,
+        name=name)
+    if layer.data_format == 'channels_first':
+      pruned_layer.build([None, input_dim, None, None])
+    else:
+      pruned_layer.build([None, None, None, input_dim])
+    pruned_layer.kernel.assign(kernel)
+  else:
+    num_nonzero = int(tf.math.count_nonzero(mask))
+    if num_nonzero <= max_density * np.prod(kernel.shape):
+      pruned_layer = SparseDense(layer.units,
+                                 num_nonzero=num_nonzero,
+                                 activation=layer.activation,
+                                 use_bias=layer.use_bias,
+                                 dtype=layer.dtype,
+                                 name=name)
+      pruned_layer.build([None, input_dim])
+      indices = tf.where(mask)
+      pruned_layer.kernel_indices.assign(indices)
+      pruned_layer.kernel_values.assign(tf.gather_nd(kernel, indices))
+    else:
+      pruned_layer = tf.keras.layers.Dense(layer.units,
+                                           activation=layer.activation,
+                                           use_bias=layer.use_bias,
+                                           dtype=layer.dtype,
+                                           name=name)
+      pruned_layer.build([None, input_dim])
+      pruned_layer.kernel.assign(kernel)
+  if layer.use_bias:
+    pruned_layer.bias.assign(_mean(layer.bias))
+  return pruned_layer
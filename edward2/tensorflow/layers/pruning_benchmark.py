@@ -0,0 +1,73 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for sparse export of variational dropout layers.
+
+Run with `python pruning_benchmark.py --benchmark_filter=.`.
+"""
+
+import edward2 as ed
+from edward2 import benchmark_utils
+import numpy as np
+import tensorflow as tf
+
+
+class PruningBenchmark(benchmark_utils.ReportMixin, tf.test.Benchmark):
+
+  def benchmarkSparsifyDense(self):
+    inputs = tf.random.normal([256, 784])
+    for sparsity in [0.9, 0.98]:
+      model = tf.keras.Sequential([
+          ed.layers.DenseVariationalDropout(1024, activation="relu"),
+          ed.layers.DenseVariationalDropout(1024, activation="relu"),
+          ed.layers.DenseVariationalDropout(10),
+      ])
+      model(inputs)
+      # Emulate a trained model, where most weights have high dropout rates.
+      for layer in model.layers:
+        mean = layer.kernel_initializer.mean
+        keep = np.random.rand(*mean.shape) >= sparsity
+        mean.assign(np.where(keep, mean.numpy() + 0.1, 1e-4))
+        layer.call_weights()
+      reports = [ed.layers.pruning.sparsity_report(layer)
+                 for layer in model.layers]
+      extras = {
+          "sparsity": 1. - (sum(r["num_nonzero"] for r in reports) /
+                            sum(r["num_weights"] for r in reports)),
+          "flops": sum(r["flops"] for r in reports),
+          "pruned_flops": sum(r["pruned_flops"] for r in reports),
+      }
+      sparse_model = tf.keras.Sequential(
+          [ed.layers.sparsify(layer) for layer in model.layers])
+      # Deterministic layers with the pruned kernels stored densely.
+      masked_model = tf.keras.Sequential(
+          [ed.layers.sparsify(layer, max_density=1.) for layer in model.layers])
+
+      compiled_model = tf.function(lambda x: model(x, training=False))  # pylint: disable=cell-var-from-loop
+      compiled_masked_model = tf.function(masked_model)
+      compiled_sparse_model = tf.function(sparse_model)
+      self._report("variational_dropout_{}".format(sparsity),
+                   lambda: compiled_model(inputs),  # pylint: disable=cell-var-from-loop
+                   num_iters=20)
+      self._report("masked_{}".format(sparsity),
+                   lambda: compiled_masked_model(inputs),  # pylint: disable=cell-var-from-loop
+                   num_iters=20)
+      self._report("sparsified_{}".format(sparsity),
+                   lambda: compiled_sparse_model(inputs),  # pylint: disable=cell-var-from-loop
+                   num_iters=20,
+                   extras=extras)
+
+
+if __name__ == "__main__":
+  tf.test.main()
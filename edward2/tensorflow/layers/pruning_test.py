@@ -0,0 +1,134 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for sparse export of variational dropout layers."""
+
+from absl.testing import parameterized
+import edward2 as ed
+import numpy as np
+import tensorflow as tf
+
+
+def prune_fraction(layer, fraction):
+  """Shrinks the posterior mean of a fraction of weights, raising log alpha."""
+  mean = layer.kernel_initializer.mean
+  keep = np.random.rand(*mean.shape) >= fraction
+  mean.assign(np.where(keep, np.random.normal(size=mean.shape), 1e-4))
+  layer.call_weights()
+
+
+class PruningTest(parameterized.TestCase, tf.test.TestCase):
+
+  def testLogAlpha(self):
+    layer = ed.layers.DenseVariationalDropout(3)
+    layer(tf.ones([1, 4]))
+    mean = layer.kernel.distribution.mean()
+    stddev = layer.kernel.distribution.stddev()
+    expected = tf.clip_by_value(
+        2. * tf.math.log(stddev) - tf.math.log(tf.square(mean) + 1e-7),
+        -8., 8.)
+    self.assertAllClose(ed.layers.pruning.log_alpha(layer), expected,
+                        atol=1e-4)
+
+  @parameterized.parameters(
+      {"fraction": 0.95, "expected_class": ed.layers.SparseDense},
+      {"fraction": 0.5, "expected_class": tf.keras.layers.Dense},
+  )
+  def testSparsifyDense(self, fraction, expected_class):
+    inputs = tf.random.normal([5, 3, 40])
+    layer = ed.layers.DenseVariationalDropout(30, activation="relu",
+                                              bias_initializer="he_normal")
+    layer(inputs)
+    prune_fraction(layer, fraction)
+    pruned_layer = ed.layers.sparsify(layer)
+    self.assertIsInstance(pruned_layer, expected_class)
+
+    mask = ed.layers.pruning.log_alpha(layer) <= 3.
+    kernel = tf.where(mask, layer.kernel.distribution.mean(), 0.)
+    expected_outputs = tf.nn.relu(
+        tf.tensordot(inputs, kernel, [[-1], [0]]) + layer.bias)
+    self.assertAllClose(pruned_layer(inputs), expected_outputs, atol=1e-5)
+
+    report = ed.layers.pruning.sparsity_report(layer)
+    num_nonzero = int(tf.math.count_nonzero(mask))
+    self.assertEqual(report["num_weights"], 40 * 30)
+    self.assertEqual(report["num_nonzero"], num_nonzero)
+    self.assertAllClose(report["sparsity"], fraction, atol=0.05)
+    self.assertEqual(report["flops"], 2 * 40 * 30)
+    self.assertEqual(report["pruned_flops"], 2 * num_nonzero)
+
+  def testSparsifyConv2D(self):
+    inputs = tf.random.normal([2, 8, 8, 3])
+    layer = ed.layers.Conv2DVariationalDropout(4, kernel_size=3,
+                                               strides=2, padding="same")
+    layer(inputs)
+    prune_fraction(layer, 0.9)
+    pruned_layer = ed.layers.sparsify(layer)
+    self.assertIsInstance(pruned_layer, tf.keras.layers.Conv2D)
+
+    mask = ed.layers.pruning.log_alpha(layer) <= 3.
+    kernel = tf.where(mask, layer.kernel.distribution.mean(), 0.)
+    expected_outputs = tf.nn.conv2d(inputs, kernel, 2, "SAME") + layer.bias
+    self.assertAllClose(pruned_layer(inputs), expected_outputs, atol=1e-5)
+
+    report = ed.layers.pruning.sparsity_report(layer)
+    num_nonzero = int(tf.math.count_nonzero(mask))
+    self.assertEqual(report["flops"], 2 * 3 * 3 * 3 * 4 * 4 * 4)
+    self.assertEqual(report["pruned_flops"], 2 * num_nonzero * 4 * 4)
+    report = ed.layers.pruning.sparsity_report(layer,
+                                               input_shape=[1, 16, 16, 3])
+    self.assertEqual(report["pruned_flops"], 2 * num_nonzero * 8 * 8)
+
+  def testSparsifyModel(self):
+    inputs = tf.random.normal([5, 20])
+    model = tf.keras.Sequential([
+        ed.layers.DenseVariationalDropout(30, activation="relu"),
+        tf.keras.layers.Dropout(0.1),
+        ed.layers.DenseVariationalDropout(2),
+    ])
+    model(inputs)
+    for layer in (model.layers[0], model.layers[2]):
+      prune_fraction(layer, 0.99)
+    sparse_model = tf.keras.Sequential(
+        [ed.layers.sparsify(layer) for layer in model.layers])
+    self.assertIs(sparse_model.layers[1], model.layers[1])
+    outputs = sparse_model(inputs)
+    self.assertEqual(outputs.shape, (5, 2))
+    self.assertAllClose(outputs, tf.function(sparse_model)(inputs))
+
+  def testSparsifyErrors(self):
+    layer = ed.layers.DenseHierarchical(2)
+    layer(tf.ones([1, 3]))
+    with self.assertRaises(NotImplementedError):
+      ed.layers.sparsify(layer)
+    with self.assertRaises(ValueError):
+      ed.layers.pruning.log_alpha(tf.keras.layers.Dense(2))
+
+  def testSparseDenseConfig(self):
+    layer = ed.layers.SparseDense(3, num_nonzero=2, activation="relu")
+    layer.build([None, 4])
+    layer.kernel_indices.assign([[0, 1], [3, 2]])
+    layer.kernel_values.assign([1., -2.])
+    layer.bias.assign([0.5, 0.5, 0.5])
+    new_layer = ed.layers.SparseDense.from_config(layer.get_config())
+    new_layer.build([None, 4])
+    new_layer.set_weights(layer.get_weights())
+    inputs = tf.ones([2, 4])
+    self.assertAllClose(new_layer(inputs), [[0.5, 1.5, 0.], [0.5, 1.5, 0.]])
+    self.assertLen(new_layer.trainable_weights, 2)
+
+
+if __name__ == "__main__":
+  tf.test.main()
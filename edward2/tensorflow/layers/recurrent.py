@@ -153,6 +153,12 @@ class LSTMCellReparameterization(tf.keras.layers.LSTMCell):
           self.recurrent_kernel.shape, self.dtype)
     if isinstance(self.bias_initializer, tf.keras.layers.Layer):
       self.bias = self.bias_initializer(self.bias.shape, self.dtype)
+    # Sample the weights now rather than on first use, which may be inside a
+    # loop over timesteps, in case an initializer's random variables are lazy
+    # (e.g., a `TrainableNormal` initializer with `lazy=True`).
+    for weight in (self.kernel, self.recurrent_kernel, self.bias):
+      if isinstance(weight, random_variable.RandomVariable):
+        _ = weight.value
     self.called_weights = True
 
   def get_initial_state(self, inputs=None, batch_size=None, dtype=None):
@@ -162,6 +168,18 @@ class LSTMCellReparameterization(tf.keras.layers.LSTMCell):
     return super(LSTMCellReparameterization, self).get_initial_state(
         inputs=inputs, batch_size=batch_size, dtype=dtype)
 
+  def _project_inputs(self, inputs):
+    """Computes the gates' input projections, e.g., of all timesteps at once."""
+    z = tf.keras.backend.dot(inputs, tf.convert_to_tensor(self.kernel))
+    if self.use_bias:
+      z = tf.keras.backend.bias_add(z, tf.convert_to_tensor(self.bias))
+    return z
+
+  def _project_recurrent_state(self, h_tm1):
+    """Computes the gates' recurrent projections."""
+    return tf.keras.backend.dot(h_tm1,
+                                tf.convert_to_tensor(self.recurrent_kernel))
+
   def _compute_carry_and_output(self, x, h_tm1, c_tm1):
     """Computes carry and output using split kernels."""
     x_i, x_f, x_c, x_o = x
@@ -219,18 +237,14 @@ class LSTMCellFlipout(LSTMCellReparameterization):
       batch_size = tf.shape(inputs)[0]
       dtype = inputs.dtype
     input_dim = self.kernel.shape[0]
-    self.sign_input = 2 * tf.random.uniform(
-        [batch_size, input_dim], minval=0, maxval=2, dtype=tf.int32) - 1
-    self.sign_output = 2 * tf.random.uniform(
-        [batch_size, 4 * self.units], minval=0, maxval=2, dtype=tf.int32) - 1
-    self.recurrent_sign_input = 2 * tf.random.uniform(
-        [batch_size, self.units], minval=0, maxval=2, dtype=tf.int32) - 1
-    self.recurrent_sign_output = 2 * tf.random.uniform(
-        [batch_size, 4 * self.units], minval=0, maxval=2, dtype=tf.int32) - 1
-    self.sign_input = tf.cast(self.sign_input, dtype)
-    self.sign_output = tf.cast(self.sign_output, dtype)
-    self.recurrent_sign_input = tf.cast(self.recurrent_sign_input, dtype)
-    self.recurrent_sign_output = tf.cast(self.recurrent_sign_output, dtype)
+    self.sign_input = utils.random_rademacher([batch_size, input_dim],
+                                              dtype=dtype)
+    self.sign_output = utils.random_rademacher([batch_size, 4 * self.units],
+                                               dtype=dtype)
+    self.recurrent_sign_input = utils.random_rademacher(
+        [batch_size, self.units], dtype=dtype)
+    self.recurrent_sign_output = utils.random_rademacher(
+        [batch_size, 4 * self.units], dtype=dtype)
 
   def get_initial_state(self, inputs=None, batch_size=None, dtype=None):
     """Get the initial state and side-effect sampling of stochastic weights."""
@@ -239,40 +253,105 @@ class LSTMCellFlipout(LSTMCellReparameterization):
     return super(LSTMCellFlipout, self).get_initial_state(
         inputs=inputs, batch_size=batch_size, dtype=dtype)
 
+  def call_weights(self):
+    """Calls any weights and splits them into their means and perturbations."""
+    super(LSTMCellFlipout, self).call_weights()
+    # Weight noise is reused across timesteps, so we compute the means and
+    # perturbations once per sample of the weights rather than per timestep.
+    if isinstance(self.kernel, random_variable.RandomVariable):
+      self.kernel_mean = self.kernel.distribution.mean()
+      self.kernel_perturbation = self.kernel - self.kernel_mean
+    if isinstance(self.recurrent_kernel, random_variable.RandomVariable):
+      self.recurrent_kernel_mean = self.recurrent_kernel.distribution.mean()
+      self.recurrent_kernel_perturbation = (
+          self.recurrent_kernel - self.recurrent_kernel_mean)
+
+  def _flipout_dot(self, inputs, kernel_mean, perturbation, sign_input,
+                   sign_output):
+    """Computes the four gates' pre-activations with two fused matmuls.
+
+    Args:
+      inputs: Tensor of shape `[batch_size, dim]`, or tuple of four such
+        tensors, one per gate (e.g., with per-gate dropout masks).
+      kernel_mean: Tensor of shape `[dim, 4 * units]`.
+      perturbation: Tensor of shape `[dim, 4 * units]`.
+      sign_input: Tensor of shape `[batch_size, dim]`.
+      sign_output: Tensor of shape `[batch_size, 4 * units]`.
+
+    Returns:
+      Tensor of shape `[batch_size, 4 * units]`.
+    """
+    if isinstance(inputs, (list, tuple)):
+      if all(gate_inputs is inputs[0] for gate_inputs in inputs[1:]):
+        inputs = inputs[0]
+      else:
+        inputs = tf.stack(inputs, axis=1)
+        kernel_mean = tf.reshape(kernel_mean, [-1, 4, self.units])
+        perturbation = tf.reshape(perturbation, [-1, 4, self.units])
+        outputs = tf.einsum('bgd,dgu->bgu', inputs, kernel_mean)
+        perturbed_outputs = tf.einsum(
+            'bgd,dgu->bgu', inputs * sign_input[:, tf.newaxis], perturbation)
+        outputs = tf.reshape(outputs, [-1, 4 * self.units])
+        perturbed_outputs = tf.reshape(perturbed_outputs, [-1, 4 * self.units])
+        return outputs + perturbed_outputs * sign_output
+    outputs = tf.keras.backend.dot(inputs, kernel_mean)
+    outputs += tf.keras.backend.dot(inputs * sign_input,
+                                    perturbation) * sign_output
+    return outputs
+
+  def _has_random_kernels(self):
+    return (isinstance(self.kernel, random_variable.RandomVariable) and
+            isinstance(self.recurrent_kernel, random_variable.RandomVariable))
+
+  def _project_inputs(self, inputs):
+    """Computes the gates' input projections, e.g., of all timesteps at once."""
+    if not self._has_random_kernels():
+      return super(LSTMCellFlipout, self)._project_inputs(inputs)
+    sign_input = self.sign_input
+    sign_output = self.sign_output
+    if inputs.shape.ndims == 3:
+      # Each example's sign flips are shared across timesteps.
+      sign_input = sign_input[:, tf.newaxis]
+      sign_output = sign_output[:, tf.newaxis]
+    z = self._flipout_dot(inputs,
+                          self.kernel_mean,
+                          self.kernel_perturbation,
+                          sign_input,
+                          sign_output)
+    if self.use_bias:
+      z = tf.keras.backend.bias_add(z, tf.convert_to_tensor(self.bias))
+    return z
+
+  def _project_recurrent_state(self, h_tm1):
+    """Computes the gates' recurrent projections."""
+    if not self._has_random_kernels():
+      return super(LSTMCellFlipout, self)._project_recurrent_state(h_tm1)
+    return self._flipout_dot(h_tm1,
+                             self.recurrent_kernel_mean,
+                             self.recurrent_kernel_perturbation,
+                             self.recurrent_sign_input,
+                             self.recurrent_sign_output)
+
   def _compute_carry_and_output(self, x, h_tm1, c_tm1):
-    """Computes carry and output using split kernels."""
+    """Computes carry and output using fused kernels."""
     if not isinstance(self.recurrent_kernel, random_variable.RandomVariable):
       return super(LSTMCellFlipout, self)._compute_carry_and_output(x,
                                                                     h_tm1,
                                                                     c_tm1)
-    x_i, x_f, x_c, x_o = x
-    h_tm1_i, h_tm1_f, h_tm1_c, h_tm1_o = h_tm1
-    kernel_mean = self.recurrent_kernel.distribution.mean()
-    perturbation = self.recurrent_kernel - kernel_mean
-    k_i, k_f, k_c, k_o = tf.split(kernel_mean, num_or_size_splits=4, axis=1)
-    p_i, p_f, p_c, p_o = tf.split(perturbation, num_or_size_splits=4, axis=1)
-    so_i, so_f, so_c, so_o = tf.split(self.recurrent_sign_output,
-                                      num_or_size_splits=4, axis=1)
-    z0 = (x_i + tf.keras.backend.dot(h_tm1_i, k_i) +
-          tf.keras.backend.dot(h_tm1_i * self.recurrent_sign_input, p_i) * so_i)
-    z1 = (x_f + tf.keras.backend.dot(h_tm1_f, k_f) +
-          tf.keras.backend.dot(h_tm1_f * self.recurrent_sign_input, p_f) * so_f)
-    z2 = (x_c + tf.keras.backend.dot(h_tm1_c, k_c) +
-          tf.keras.backend.dot(h_tm1_c * self.recurrent_sign_input, p_c) * so_c)
-    z3 = (x_o + tf.keras.backend.dot(h_tm1_o, k_o) +
-          tf.keras.backend.dot(h_tm1_o * self.recurrent_sign_input, p_o) * so_o)
-    i = self.recurrent_activation(z0)
-    f = self.recurrent_activation(z1)
-    c = f * c_tm1 + i * self.activation(z2)
-    o = self.recurrent_activation(z3)
-    return c, o
+    z = tf.concat(x, axis=1)
+    z += self._flipout_dot(h_tm1,
+                           self.recurrent_kernel_mean,
+                           self.recurrent_kernel_perturbation,
+                           self.recurrent_sign_input,
+                           self.recurrent_sign_output)
+    z = tf.split(z, num_or_size_splits=4, axis=1)
+    return self._compute_carry_and_output_fused(z, c_tm1)
 
   def call(self, inputs, states, training=None):
     # TODO(trandustin): Enable option for Flipout on only the kernel or
     # recurrent_kernel. If only one is a random variable, we currently default
     # to weight reparameterization.
-    if (not isinstance(self.kernel, random_variable.RandomVariable) or
-        not isinstance(self.recurrent_kernel, random_variable.RandomVariable)):
+    if not self._has_random_kernels():
       return super(LSTMCellFlipout, self).call(inputs, states, training)
     if not self.called_weights:
       self.call_weights()
@@ -286,65 +365,33 @@ class LSTMCellFlipout(LSTMCellReparameterization):
 
     if self.implementation == 1:
       if 0 < self.dropout < 1.:
-        inputs_i = inputs * dp_mask[0]
-        inputs_f = inputs * dp_mask[1]
-        inputs_c = inputs * dp_mask[2]
-        inputs_o = inputs * dp_mask[3]
-      else:
-        inputs_i = inputs
-        inputs_f = inputs
-        inputs_c = inputs
-        inputs_o = inputs
-      kernel_mean = self.kernel.distribution.mean()
-      perturbation = self.kernel - kernel_mean
-      k_i, k_f, k_c, k_o = tf.split(kernel_mean, num_or_size_splits=4, axis=1)
-      p_i, p_f, p_c, p_o = tf.split(perturbation, num_or_size_splits=4, axis=1)
-      so_i, so_f, so_c, so_o = tf.split(self.sign_output,
-                                        num_or_size_splits=4, axis=1)
-      x_i = (tf.keras.backend.dot(inputs_i, k_i) +
-             tf.keras.backend.dot(inputs_i * self.sign_input, p_i) * so_i)
-      x_f = (tf.keras.backend.dot(inputs_f, k_f) +
-             tf.keras.backend.dot(inputs_f * self.sign_input, p_f) * so_f)
-      x_c = (tf.keras.backend.dot(inputs_c, k_c) +
-             tf.keras.backend.dot(inputs_c * self.sign_input, p_c) * so_c)
-      x_o = (tf.keras.backend.dot(inputs_o, k_o) +
-             tf.keras.backend.dot(inputs_o * self.sign_input, p_o) * so_o)
+        inputs = tuple(inputs * dp_mask[i] for i in range(4))
+      z = self._flipout_dot(inputs,
+                            self.kernel_mean,
+                            self.kernel_perturbation,
+                            self.sign_input,
+                            self.sign_output)
       if self.use_bias:
-        b_i, b_f, b_c, b_o = tf.split(
-            self.bias, num_or_size_splits=4, axis=0)
-        x_i = tf.keras.backend.bias_add(x_i, b_i)
-        x_f = tf.keras.backend.bias_add(x_f, b_f)
-        x_c = tf.keras.backend.bias_add(x_c, b_c)
-        x_o = tf.keras.backend.bias_add(x_o, b_o)
-
+        z = tf.keras.backend.bias_add(z, self.bias)
       if 0 < self.recurrent_dropout < 1.:
-        h_tm1_i = h_tm1 * rec_dp_mask[0]
-        h_tm1_f = h_tm1 * rec_dp_mask[1]
-        h_tm1_c = h_tm1 * rec_dp_mask[2]
-        h_tm1_o = h_tm1 * rec_dp_mask[3]
-      else:
-        h_tm1_i = h_tm1
-        h_tm1_f = h_tm1
-        h_tm1_c = h_tm1
-        h_tm1_o = h_tm1
-      x = (x_i, x_f, x_c, x_o)
-      h_tm1 = (h_tm1_i, h_tm1_f, h_tm1_c, h_tm1_o)
+        h_tm1 = tuple(h_tm1 * rec_dp_mask[i] for i in range(4))
+      x = tf.split(z, num_or_size_splits=4, axis=1)
       c, o = self._compute_carry_and_output(x, h_tm1, c_tm1)
     else:
       if 0. < self.dropout < 1.:
         inputs = inputs * dp_mask[0]
-      kernel_mean = self.kernel.distribution.mean()
-      perturbation = self.kernel - kernel_mean
-      z = tf.keras.backend.dot(inputs, kernel_mean)
-      z += tf.keras.backend.dot(inputs * self.sign_input,
-                                perturbation) * self.sign_output
+      z = self._flipout_dot(inputs,
+                            self.kernel_mean,
+                            self.kernel_perturbation,
+                            self.sign_input,
+                            self.sign_output)
       if 0. < self.recurrent_dropout < 1.:
         h_tm1 = h_tm1 * rec_dp_mask[0]
-      recurrent_kernel_mean = self.recurrent_kernel.distribution.mean()
-      perturbation = self.recurrent_kernel - recurrent_kernel_mean
-      z += tf.keras.backend.dot(h_tm1, recurrent_kernel_mean)
-      z += tf.keras.backend.dot(h_tm1 * self.recurrent_sign_input,
-                                perturbation) * self.recurrent_sign_output
+      z += self._flipout_dot(h_tm1,
+                             self.recurrent_kernel_mean,
+                             self.recurrent_kernel_perturbation,
+                             self.recurrent_sign_input,
+                             self.recurrent_sign_output)
       if self.use_bias:
         z = tf.keras.backend.bias_add(z, self.bias)
 
@@ -637,6 +684,36 @@ class LSTMCellRank1(tf.keras.layers.LSTMCell):
     o = self.recurrent_activation(x_o + rec_o)
     return c, o
 
+  def _project_inputs(self, inputs):
+    """Computes the gates' input projections, e.g., of all timesteps at once."""
+    alpha = self.alpha_sample
+    gamma = self.gamma_sample
+    if self.use_bias:
+      bias = self.bias_sample
+    if inputs.shape.ndims == 3:
+      # Each example's rank-1 weights are shared across timesteps.
+      alpha = alpha[:, tf.newaxis]
+      gamma = gamma[:, tf.newaxis]
+      if self.use_bias:
+        bias = bias[:, tf.newaxis]
+    if self.use_additive_perturbation:
+      z = tf.keras.backend.dot(inputs + alpha, self.kernel) + gamma
+    else:
+      z = tf.keras.backend.dot(inputs * alpha, self.kernel) * gamma
+    if self.use_bias:
+      z += bias
+    return z
+
+  def _project_recurrent_state(self, h_tm1):
+    """Computes the gates' recurrent projections."""
+    if self.use_additive_perturbation:
+      return (tf.linalg.matmul(h_tm1 + self.recurrent_alpha_sample,
+                               self.recurrent_kernel) +
+              self.recurrent_gamma_sample)
+    return (tf.linalg.matmul(h_tm1 * self.recurrent_alpha_sample,
+                             self.recurrent_kernel) *
+            self.recurrent_gamma_sample)
+
   def _sample_weights(self, inputs=None, batch_size=None, dtype=None):
     """Samples any rank-1 weight tensor if the initializer is itself a layer."""
     if inputs is not None:
@@ -816,3 +893,147 @@ class LSTMCellRank1(tf.keras.layers.LSTMCell):
     """Sets the weights of the layer, from Numpy arrays."""
     self.sampled_weights = False
     super().set_weights(*args, **kwargs)
+
+
+# Keyword arguments of `tf.keras.layers.Layer`, which are passed to the
+# sequence layer rather than its cell.
+_LAYER_KWARGS = ('name', 'dtype', 'trainable', 'dynamic', 'input_dim',
+                 'input_shape', 'batch_input_shape', 'batch_size', 'weights',
+                 'autocast')
+
+
+class _LSTM(tf.keras.layers.Layer):
+  """Bayesian LSTM layer which runs a cell over whole sequences.
+
+  Unlike applying the cell with `tf.keras.layers.RNN`, the layer computes the
+  input projections of all timesteps with one matmul, and it only runs the
+  recurrent projections in a loop over timesteps. The cell samples its weights
+  once per sequence, on each call to the layer. Dropout uses one mask for all
+  gates, as for the cell's `implementation=2`, which is shared across
+  timesteps.
+  """
+
+  cell_class = None
+
+  def __init__(self,
+               units,
+               return_sequences=False,
+               return_state=False,
+               go_backwards=False,
+               **kwargs):
+    layer_kwargs = {key: kwargs.pop(key) for key in _LAYER_KWARGS
+                    if key in kwargs}
+    super().__init__(**layer_kwargs)
+    self.cell = self.cell_class(units,  # pylint: disable=not-callable
+                                dtype=layer_kwargs.get('dtype'),
+                                trainable=layer_kwargs.get('trainable', True),
+                                name='lstm_cell',
+                                **kwargs)
+    self.units = units
+    self.return_sequences = return_sequences
+    self.return_state = return_state
+    self.go_backwards = go_backwards
+    self.input_spec = tf.keras.layers.InputSpec(ndim=3)
+
+  def build(self, input_shape):
+    input_shape = tf.TensorShape(input_shape)
+    if not self.cell.built:
+      with tf.name_scope(self.cell.name):
+        self.cell.build(tf.TensorShape([input_shape[0], input_shape[-1]]))
+        self.cell.built = True
+    self.built = True
+
+  def call(self, inputs, initial_state=None, training=None):
+    cell = self.cell
+    # Sample the cell's weights for this call. This also gets its zero state.
+    zero_state = cell.get_initial_state(inputs=inputs,
+                                        batch_size=tf.shape(inputs)[0],
+                                        dtype=inputs.dtype)
+    if initial_state is None:
+      initial_state = zero_state
+    h0, c0 = initial_state
+
+    cell.reset_dropout_mask()
+    cell.reset_recurrent_dropout_mask()
+    dp_mask = cell.get_dropout_mask_for_cell(inputs[:, 0], training)
+    rec_dp_mask = cell.get_recurrent_dropout_mask_for_cell(h0, training)
+    if dp_mask is not None:
+      inputs = inputs * dp_mask[:, tf.newaxis]
+    z = cell._project_inputs(inputs)  # pylint: disable=protected-access
+    z = tf.transpose(z, [1, 0, 2])
+    if self.go_backwards:
+      z = tf.reverse(z, axis=[0])
+
+    timesteps = tf.shape(z)[0]
+    outputs_ta = tf.TensorArray(
+        z.dtype, size=timesteps if self.return_sequences else 0,
+        element_shape=h0.shape)
+
+    def step(t, h_tm1, c_tm1, outputs_ta):
+      h_tm1_masked = h_tm1 if rec_dp_mask is None else h_tm1 * rec_dp_mask
+      z_t = z[t] + cell._project_recurrent_state(h_tm1_masked)  # pylint: disable=protected-access
+      z_t = tf.split(z_t, num_or_size_splits=4, axis=1)
+      c, o = cell._compute_carry_and_output_fused(z_t, c_tm1)  # pylint: disable=protected-access
+      h = o * cell.activation(c)
+      if self.return_sequences:
+        outputs_ta = outputs_ta.write(t, h)
+      return t + 1, h, c, outputs_ta
+
+    _, h, c, outputs_ta = tf.while_loop(
+        lambda t, *_: t < timesteps,
+        step,
+        (tf.constant(0), h0, c0, outputs_ta),
+        parallel_iterations=32)
+    if self.return_sequences:
+      outputs = tf.transpose(outputs_ta.stack(), [1, 0, 2])
+    else:
+      outputs = h
+    if self.return_state:
+      return [outputs, h, c]
+    return outputs
+
+  def get_config(self):
+    config = self.cell.get_config()
+    for key in ('name', 'dtype', 'trainable'):
+      config.pop(key, None)
+    config.update(super().get_config())
+    config.update({
+        'return_sequences': self.return_sequences,
+        'return_state': self.return_state,
+        'go_backwards': self.go_backwards,
+    })
+    return config
+
+
+class LSTMReparameterization(_LSTM):
+  """Bayesian LSTM layer estimated via reparameterization.
+
+  The layer applies `LSTMCellReparameterization` to whole sequences of shape
+  `[batch_size, timesteps, input_dim]`. It takes the cell's arguments, and it
+  computes all timesteps' input projections at once.
+  """
+
+  cell_class = LSTMCellReparameterization
+
+
+class LSTMFlipout(_LSTM):
+  """Bayesian LSTM layer estimated via Flipout (Wen et al., 2018).
+
+  The layer applies `LSTMCellFlipout` to whole sequences of shape
+  `[batch_size, timesteps, input_dim]`. It takes the cell's arguments, and it
+  computes all timesteps' input projections at once. Each example's sign flips
+  are shared across timesteps.
+  """
+
+  cell_class = LSTMCellFlipout
+
+
+class LSTMRank1(_LSTM):
+  """A rank-1 Bayesian neural net LSTM layer (Dusenberry et al., 2020).
+
+  The layer applies `LSTMCellRank1` to whole sequences of shape
+  `[ensemble_size * examples_per_model, timesteps, input_dim]`. It takes the
+  cell's arguments, and it computes all timesteps' input projections at once.
+  """
+
+  cell_class = LSTMCellRank1
@@ -0,0 +1,58 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks for Bayesian recurrent cells and layers.
+
+Run with `python recurrent_benchmark.py --benchmark_filter=.`.
+"""
+
+import edward2 as ed
+from edward2 import benchmark_utils
+import tensorflow as tf
+
+
+class RecurrentBenchmark(benchmark_utils.ReportMixin, tf.test.Benchmark):
+
+  def benchmarkLSTMCellFlipout(self):
+    batch_size, dim, units = 32, 64, 128
+    for implementation in [1, 2]:
+      for timesteps in [10, 100]:
+        inputs = tf.random.normal([batch_size, timesteps, dim])
+        layer = tf.keras.layers.RNN(ed.layers.LSTMCellFlipout(
+            units, implementation=implementation))
+        compiled_layer = tf.function(layer)
+        self._report(
+            "lstm_cell_flipout_implementation{}_timesteps{}".format(
+                implementation, timesteps),
+            lambda: compiled_layer(inputs))  # pylint: disable=cell-var-from-loop
+
+  def benchmarkLSTM(self):
+    batch_size, timesteps, units = 32, 100, 128
+    for layer, cell in [
+        (ed.layers.LSTMReparameterization,
+         ed.layers.LSTMCellReparameterization),
+        (ed.layers.LSTMFlipout, ed.layers.LSTMCellFlipout),
+        (ed.layers.LSTMRank1, ed.layers.LSTMCellRank1),
+    ]:
+      for dim in [64, 512]:
+        inputs = tf.random.normal([batch_size, timesteps, dim])
+        rnn = tf.function(tf.keras.layers.RNN(cell(units)))
+        sequence_layer = tf.function(layer(units))
+        self._report("{}_rnn_dim{}".format(cell.__name__, dim),
+                     lambda: rnn(inputs))  # pylint: disable=cell-var-from-loop
+        self._report("{}_dim{}".format(layer.__name__, dim),
+                     lambda: sequence_layer(inputs))  # pylint: disable=cell-var-from-loop
+
+if __name__ == "__main__":
+  tf.test.main()
@@ -135,6 +135,65 @@ class RecurrentTest(parameterized.TestCase, tf.test.TestCase):
       self.assertNotAllClose(outputs1, outputs3)
     cell.get_config()
 
+  def testLSTMCellFlipoutImplementations(self):
+    """Tests that both implementations compute the same cell."""
+    batch_size, dim = 5, 12
+    hidden_size = 10
+    inputs = np.random.rand(batch_size, dim).astype(np.float32)
+    cell = ed.layers.LSTMCellFlipout(hidden_size,
+                                     recurrent_initializer="trainable_normal",
+                                     bias_initializer="trainable_normal",
+                                     implementation=1)
+    h0, c0 = cell.get_initial_state(inputs)
+    state = (h0 + np.random.rand(1, hidden_size).astype(np.float32), c0)
+    outputs1, (_, carry1) = cell(inputs, state)
+    cell.implementation = 2
+    outputs2, (_, carry2) = cell(inputs, state)
+    self.assertAllClose(outputs1, outputs2)
+    self.assertAllClose(carry1, carry2)
+
+  def testLSTMCellFlipoutDropout(self):
+    """Tests per-gate dropout masks against a per-gate computation."""
+    batch_size, dim = 5, 12
+    hidden_size = 10
+    inputs = np.random.rand(batch_size, dim).astype(np.float32)
+    cell = ed.layers.LSTMCellFlipout(hidden_size,
+                                     recurrent_initializer="trainable_normal",
+                                     dropout=0.5,
+                                     recurrent_dropout=0.5,
+                                     implementation=1)
+    h0, c0 = cell.get_initial_state(inputs)
+    h0 += np.random.rand(1, hidden_size).astype(np.float32)
+    c0 += np.random.rand(1, hidden_size).astype(np.float32)
+    outputs, _ = cell(inputs, (h0, c0), training=True)
+
+    dp_mask = cell.get_dropout_mask_for_cell(inputs, True, count=4)
+    rec_dp_mask = cell.get_recurrent_dropout_mask_for_cell(h0, True, count=4)
+    kernel = tf.convert_to_tensor(cell.kernel)
+    kernel_mean = cell.kernel.distribution.mean()
+    recurrent_kernel = tf.convert_to_tensor(cell.recurrent_kernel)
+    recurrent_kernel_mean = cell.recurrent_kernel.distribution.mean()
+    gates = []
+    for i in range(4):
+      units = slice(i * hidden_size, (i + 1) * hidden_size)
+      x = inputs * dp_mask[i]
+      h = h0 * rec_dp_mask[i]
+      gates.append(
+          tf.matmul(x, kernel_mean[:, units]) +
+          tf.matmul(x * cell.sign_input,
+                    kernel[:, units] - kernel_mean[:, units]) *
+          cell.sign_output[:, units] +
+          tf.matmul(h, recurrent_kernel_mean[:, units]) +
+          tf.matmul(h * cell.recurrent_sign_input,
+                    recurrent_kernel[:, units] -
+                    recurrent_kernel_mean[:, units]) *
+          cell.recurrent_sign_output[:, units] +
+          cell.bias[units])
+    c = (tf.sigmoid(gates[1]) * c0 +
+         tf.sigmoid(gates[0]) * tf.tanh(gates[2]))
+    expected_outputs = tf.sigmoid(gates[3]) * tf.tanh(c)
+    self.assertAllClose(outputs, expected_outputs)
+
   @parameterized.parameters(
       {"lstm_cell": ed.layers.LSTMCellFlipout},
       {"lstm_cell": ed.layers.LSTMCellReparameterization},
@@ -387,6 +446,77 @@ class RecurrentTest(parameterized.TestCase, tf.test.TestCase):
     self.assertAllClose(outputs2, outputs3)
     self.assertLen(model.losses, 4)
 
+  @parameterized.parameters(
+      {"layer": ed.layers.LSTMReparameterization, "num_losses": 2,
+       "kwargs": {}},
+      {"layer": ed.layers.LSTMFlipout, "num_losses": 2, "kwargs": {}},
+      {"layer": ed.layers.LSTMRank1, "num_losses": 4,
+       "kwargs": {"ensemble_size": 2}},
+      {"layer": ed.layers.LSTMRank1, "num_losses": 4,
+       "kwargs": {"ensemble_size": 2, "use_additive_perturbation": True}},
+  )
+  def testLSTM(self, layer, num_losses, kwargs):
+    """Tests that the layer is the same as applying its cell per timestep."""
+    batch_size, timesteps, dim = 4, 3, 12
+    hidden_size = 10
+    inputs = np.random.rand(batch_size, timesteps, dim).astype(np.float32)
+    layer = layer(hidden_size, return_sequences=True, return_state=True,
+                  **kwargs)
+    outputs1, h1, c1 = layer(inputs)
+    outputs2, _, _ = layer(inputs)
+    state = (tf.zeros([1, hidden_size]), tf.zeros([1, hidden_size]))
+    outputs3 = []
+    for t in range(timesteps):
+      out, state = layer.cell(inputs[:, t, :], state)
+      outputs3.append(out)
+    outputs3 = tf.stack(outputs3, axis=1)
+    self.assertEqual(outputs1.shape, (batch_size, timesteps, hidden_size))
+    self.assertAllClose(outputs1[:, -1], h1)
+    self.assertEqual(c1.shape, (batch_size, hidden_size))
+    # The layer samples the cell's weights on each call.
+    self.assertNotAllClose(outputs1, outputs2)
+    self.assertAllClose(outputs2, outputs3)
+    self.assertLen(layer.losses, num_losses)
+
+    new_layer = layer.__class__.from_config(layer.get_config())
+    self.assertEqual(new_layer.units, hidden_size)
+    self.assertTrue(new_layer.return_sequences)
+    self.assertTrue(new_layer.return_state)
+    self.assertEqual(new_layer.cell.get_config()["units"], hidden_size)
+
+  def testLSTMOptions(self):
+    batch_size, timesteps, dim = 4, 3, 12
+    hidden_size = 10
+    inputs = np.random.rand(batch_size, timesteps, dim).astype(np.float32)
+    layer = ed.layers.LSTMFlipout(hidden_size, go_backwards=True,
+                                  dropout=0.5, recurrent_dropout=0.5)
+    initial_state = (tf.ones([batch_size, hidden_size]),
+                     tf.ones([batch_size, hidden_size]))
+    outputs = layer(inputs, initial_state=initial_state, training=True)
+    self.assertEqual(outputs.shape, (batch_size, hidden_size))
+
+    # Without dropout, going backwards is the same as reversing the inputs.
+    layer = ed.layers.LSTMReparameterization(hidden_size, go_backwards=True)
+    outputs = layer(inputs, initial_state=initial_state)
+    state = initial_state
+    for t in reversed(range(timesteps)):
+      expected_outputs, state = layer.cell(inputs[:, t, :], state)
+    self.assertAllClose(outputs, expected_outputs)
+
+  def testLSTMModel(self):
+    batch_size, timesteps, dim = 4, 3, 12
+    inputs = np.random.rand(batch_size, timesteps, dim).astype(np.float32)
+    labels = np.random.rand(batch_size, 2).astype(np.float32)
+    model = tf.keras.Sequential([
+        ed.layers.LSTMFlipout(10, return_sequences=True),
+        ed.layers.LSTMReparameterization(2),
+    ])
+    model.compile(tf.keras.optimizers.Adam(0.1), "mse")
+    model.fit(inputs, labels, epochs=2, verbose=0)
+    outputs = tf.function(model)(inputs)
+    self.assertEqual(outputs.shape, (batch_size, 2))
+    self.assertLen(model.losses, 4)
+
 
 if __name__ == "__main__":
   tf.test.main()
@@ -23,6 +23,8 @@
 """
 
 import functools
+import weakref
+from edward2.tensorflow import initializers
 import numpy as np
 import tensorflow as tf
 import tensorflow.compat.v1 as tf1
@@ -74,6 +76,104 @@ def add_weight(cls):
   return cls
 
 
+def lazy_initializer(initializer):
+  """Returns a `TrainableNormal` initializer whose samples are lazy.
+
+  The initializer is copied rather than modified, as it may be shared with
+  other layers. Other initializers are returned as is.
+
+  Args:
+    initializer: Initializer of a layer's weight.
+
+  Returns:
+    The initializer, or a copy of it with `lazy=True` if it is a
+    `TrainableNormal` which samples eagerly.
+  """
+  if (not isinstance(initializer, initializers.TrainableNormal) or
+      initializer.lazy):
+    return initializer
+  config = initializer.get_config()
+  config['lazy'] = True
+  return initializer.__class__.from_config(config)
+
+
+# Bit masks to unpack signs from random integers in [0, 2**30).
+_RADEMACHER_BITS = np.left_shift(1, np.arange(30)).astype(np.int32)
+
+
+def random_rademacher(shape, dtype=tf.float32):
+  """Samples Rademacher random signs, i.e., -1 or 1 with equal probability.
+
+  Rather than drawing one random integer per sign, this draws one random integer
+  per 30 signs and unpacks its bits. This reduces the cost of drawing the sign
+  flips of Flipout layers, which need as many signs as inputs and outputs.
+
+  Args:
+    shape: 1-D integer Tensor or Python list, the shape of the output.
+    dtype: Dtype of the output.
+
+  Returns:
+    Tensor of the given shape and dtype with elements in {-1, 1}.
+  """
+  shape = tf.convert_to_tensor(shape, dtype=tf.int32)
+  size = tf.reduce_prod(shape)
+  num_bits = _RADEMACHER_BITS.shape[0]
+  words = tf.random.uniform([(size + num_bits - 1) // num_bits, 1],
+                            maxval=1 << num_bits,
+                            dtype=tf.int32)
+  signs = tf.bitwise.bitwise_and(words, _RADEMACHER_BITS) > 0
+  signs = tf.reshape(tf.reshape(signs, [-1])[:size], shape)
+  return tf.where(signs, tf.ones([], dtype), -tf.ones([], dtype))
+
+
+def sample_outputs(model, inputs, num_samples, **kwargs):
+  """Computes a Bayesian model's outputs under multiple weight samples.
+
+  Rather than calling the model once per sample in a Python loop, this
+  vectorizes its forward pass over samples with `tf.vectorized_map`: each
+  weight is sampled `num_samples` times at once, and each layer's computation
+  is batched over a leading sample dimension. Operations which cannot be
+  vectorized, e.g., convolutions whose filter varies across samples, fall back
+  to a `tf.while_loop` within the same computation. The computation is
+  compiled with `tf.function` once per model.
+
+  Args:
+    model: Callable, e.g., a `tf.keras.Model` of Bayesian layers, which samples
+      its weights on each call. It is built if it is a Keras model which is not
+      built yet.
+    inputs: Nested structure of Tensors to pass to the model.
+    num_samples: Integer, the number of weight samples.
+    **kwargs: Keyword arguments to pass to the model, e.g., `training`.
+
+  Returns:
+    Nested structure of Tensors with the structure of the model's outputs and
+    shape `[num_samples, ...]`. Random variable outputs are converted to their
+    values.
+  """
+  if not getattr(model, 'built', True):
+    model(inputs, **kwargs)
+  # Compile once per model; otherwise `tf.vectorized_map` retraces the model on
+  # each eager call. The compiled function refers to the model weakly so that
+  # caching it does not keep the model alive.
+  compiled_sample_outputs = _compiled_sample_outputs.get(model)
+  if compiled_sample_outputs is None:
+    compiled_sample_outputs = tf.function(
+        functools.partial(_sample_outputs, weakref.ref(model)),
+        autograph=False)
+    _compiled_sample_outputs[model] = compiled_sample_outputs
+  return compiled_sample_outputs(inputs, num_samples, **kwargs)
+
+
+_compiled_sample_outputs = weakref.WeakKeyDictionary()
+
+
+def _sample_outputs(model_ref, inputs, num_samples, **kwargs):
+  model = model_ref()
+  def _sample_outputs_fn(_):
+    return tf.nest.map_structure(tf.convert_to_tensor, model(inputs, **kwargs))
+  return tf.vectorized_map(_sample_outputs_fn, tf.range(num_samples))
+
+
 def one_hot_argmax(inputs, temperature, axis=-1):
   """Returns one-hot of argmax with backward pass set to softmax-temperature."""
   vocab_size = inputs.shape[-1]
@@ -333,12 +433,12 @@ def smart_constant_value(pred):
   Raises:
     TypeError: If `pred` is not a Tensor or bool.
   """
-  if pred in {0, 1}:  # Accept 1/0 as valid boolean values
+  if tf.is_tensor(pred):
+    pred_value = tf.get_static_value(pred)
+  elif pred in {0, 1}:  # Accept 1/0 as valid boolean values
     pred_value = bool(pred)
   elif isinstance(pred, bool):
     pred_value = pred
-  elif tf.is_tensor(pred):
-    pred_value = tf.get_static_value(pred)
   else:
     raise TypeError('`pred` must be a Tensor, or a Python bool, or 1 or 0. '
                     'Found instead: %s' % pred)
@@ -0,0 +1,64 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks for layer utilities.
+
+Run with `python utils_benchmark.py --benchmark_filter=.`.
+"""
+
+import edward2 as ed
+from edward2 import benchmark_utils
+import tensorflow as tf
+
+
+class UtilsBenchmark(benchmark_utils.ReportMixin, tf.test.Benchmark):
+
+  def _benchmark_sample_outputs(self, name, model, inputs, num_samples=30):
+    model(inputs)  # Build the model.
+
+    def loop():
+      return tf.stack([tf.convert_to_tensor(model(inputs))
+                       for _ in range(num_samples)])
+
+    self._report('{}_loop'.format(name), loop, num_iters=5)
+    self._report('{}_compiled_loop'.format(name), tf.function(loop),
+                 num_iters=5)
+    self._report(
+        '{}_sample_outputs'.format(name),
+        lambda: ed.layers.sample_outputs(model, inputs, num_samples),
+        num_iters=5)
+
+  def benchmarkSampleOutputsDense(self):
+    model = tf.keras.Sequential([
+        ed.layers.DenseReparameterization(512, activation='relu'),
+        ed.layers.DenseFlipout(512, activation='relu'),
+        ed.layers.DenseReparameterization(10),
+    ])
+    self._benchmark_sample_outputs('dense', model,
+                                   tf.random.normal([32, 784]))
+
+  def benchmarkSampleOutputsConv2D(self):
+    model = tf.keras.Sequential([
+        ed.layers.Conv2DReparameterization(16, 3, activation='relu'),
+        tf.keras.layers.Flatten(),
+        ed.layers.DenseReparameterization(128, activation='relu'),
+        ed.layers.DenseReparameterization(10),
+    ])
+    self._benchmark_sample_outputs('conv2d', model,
+                                   tf.random.normal([32, 28, 28, 1]))
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -15,6 +15,9 @@
 
 """Tests for utilities."""
 
+import gc
+import weakref
+
 from absl.testing import parameterized
 import edward2 as ed
 import numpy as np
@@ -49,6 +52,54 @@ class UtilsTest(parameterized.TestCase, tf.test.TestCase):
     for weight in regularizer.weights:
       self.assertTrue(np.any([weight is lweight for lweight in layer.weights]))
 
+  @parameterized.parameters(
+      ([7],),
+      ([3, 50],),
+      ([2, 3, 31],),
+  )
+  def testRandomRademacher(self, shape):
+    signs = ed.layers.utils.random_rademacher(shape, dtype=tf.float64)
+    self.assertEqual(signs.dtype, tf.float64)
+    self.assertEqual(signs.shape, shape)
+    self.assertAllEqual(tf.abs(signs), tf.ones(shape, tf.float64))
+
+  def testRandomRademacherMoments(self):
+    signs = ed.layers.utils.random_rademacher([100, 1000])
+    self.assertAllClose(tf.reduce_mean(signs), 0., atol=0.01)
+    # Signs unpacked from the same random integer are uncorrelated.
+    self.assertAllClose(tf.reduce_mean(signs[:, 1:] * signs[:, :-1]), 0.,
+                        atol=0.01)
+
+  def testSampleOutputs(self):
+    inputs = tf.random.normal([3, 6, 6, 1])
+    model = tf.keras.Sequential([
+        ed.layers.Conv2DReparameterization(2, 3, activation='relu'),
+        tf.keras.layers.Flatten(),
+        ed.layers.DenseReparameterization(4, local_reparameterization=True),
+    ])
+    outputs = ed.layers.sample_outputs(model, inputs, num_samples=5)
+    self.assertEqual(outputs.shape, (5, 3, 4))
+    self.assertNotAllClose(outputs[0], outputs[1])
+
+  def testSampleOutputsDeterministic(self):
+    inputs = tf.random.normal([3, 2])
+    model = tf.keras.layers.Dense(4)
+    outputs = ed.layers.sample_outputs(model, inputs, num_samples=5)
+    self.assertEqual(outputs.shape, (5, 3, 4))
+    for i in range(5):
+      self.assertAllClose(outputs[i], model(inputs))
+
+  def testSampleOutputsReleasesModel(self):
+    def sample_outputs():
+      # Build the model in its own frame so only the cache may refer to it.
+      inputs = tf.random.normal([3, 2])
+      model = tf.keras.Sequential([ed.layers.DenseReparameterization(4)])
+      ed.layers.sample_outputs(model, inputs, num_samples=5)
+      return weakref.ref(model)
+    model_ref = sample_outputs()
+    gc.collect()
+    self.assertIsNone(model_ref())
+
   def testOneHotAddExactHard(self):
     inputs = tf.constant([[0., 1., 0.],
                           [0., 0., 1.]])
@@ -0,0 +1,109 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Plates for vectorizing conditionally independent random variables."""
+
+import contextlib
+import contextvars
+
+from edward2.trace import trace
+from edward2.trace import traceable
+
+# Names of the plates active in the current context, from outermost to
+# innermost.
+_active_plates = contextvars.ContextVar("edward2_active_plates", default=())
+
+
+@contextlib.contextmanager
+def plate(size, name=None, dim=None):
+  """Context manager for vectorizing conditionally independent random variables.
+
+  Random variables created inside a plate are batched over `size` independent
+  copies: their distribution is broadcast to have a batch dimension of `size`
+  at position `dim` of its batch shape. This replaces a Python loop creating
+  `size` random variables, one per copy, with a single random variable. Tracers
+  such as `tape` and `condition`, and `make_log_joint_fn`, therefore operate on
+  one batched site, whose value is conditioned and scored as a whole.
+
+  Random variables whose distribution already depends on other random
+  variables in the plate are batched along the plate's dimension by
+  broadcasting. Plates may be nested, in which case each plate batches along
+  its own dimension. By default, the outermost plate uses the rightmost batch
+  dimension and each nested plate the dimension to its left.
+
+  Only random variables built by `ed.make_random_variable`, e.g., `ed.Normal`,
+  are batched; other traceable operations are unchanged.
+
+  Args:
+    size: Python integer, the number of independent copies.
+    name: Optional name of the plate. Nested plates must have distinct names.
+    dim: Optional negative Python integer, the batch dimension of the plate
+      counting from the right. Default is to use the dimension to the left of
+      the plates it is nested in.
+
+  Yields:
+    None.
+
+  Raises:
+    ValueError: If `dim` is not negative, or `name` or `dim` is already used by
+      an enclosing plate.
+
+  #### Examples
+
+  ```python
+  import edward2 as ed
+
+  def model():
+    loc = ed.Normal(loc=0., scale=1., name="loc")
+    with ed.plate(100, name="data"):
+      scale = ed.LogNormal(loc=0., scale=1., name="scale")
+      x = ed.Normal(loc=loc, scale=scale, name="x")
+    return x
+
+  with ed.tape() as model_tape:
+    x = model()
+
+  assert model_tape["loc"].shape == []
+  assert model_tape["scale"].shape == [100]
+  assert x.shape == [100]
+  ```
+  """
+  active_plates = _active_plates.get()
+  if dim is None:
+    dim = -len(active_plates) - 1
+  if dim >= 0:
+    raise ValueError("dim must be negative; got {}.".format(dim))
+  for active_name, active_dim in active_plates:
+    if name is not None and name == active_name:
+      raise ValueError("Plate {} is already active.".format(name))
+    if dim == active_dim:
+      raise ValueError("Plate {} uses dim {}, which is already used by plate "
+                       "{}.".format(name, dim, active_name))
+
+  def _plate(f, *args, **kwargs):
+    """Broadcasts random variables along the plate's batch dimension."""
+    if getattr(f, "accepts_plate_shape", False):
+      plate_shape = list(kwargs.get("plate_shape", ()))
+      plate_shape = [1] * (-dim - len(plate_shape)) + plate_shape
+      plate_shape[dim] = size
+      kwargs["plate_shape"] = tuple(plate_shape)
+    return traceable(f)(*args, **kwargs)
+
+  token = _active_plates.set(active_plates + ((name, dim),))
+  try:
+    with trace(_plate):
+      yield
+  finally:
+    _active_plates.reset(token)
@@ -0,0 +1,101 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for plates."""
+
+import edward2 as ed
+import numpy as np
+import tensorflow as tf
+
+
+def model():
+  loc = ed.Normal(loc=0., scale=1., name="loc")
+  with ed.plate(5, name="data"):
+    scale = ed.LogNormal(loc=0., scale=1., name="scale")
+    x = ed.Normal(loc=loc, scale=scale, name="x")
+  return x
+
+
+class PlatesTest(tf.test.TestCase):
+
+  def testPlateShapes(self):
+    with ed.tape() as model_tape:
+      x = model()
+    self.assertEqual(list(model_tape.keys()), ["loc", "scale", "x"])
+    self.assertEqual(model_tape["loc"].shape, [])
+    self.assertEqual(model_tape["scale"].shape, [5])
+    self.assertEqual(x.shape, [5])
+    self.assertEqual(x.distribution.batch_shape, [5])
+
+  def testPlateSampleShape(self):
+    with ed.plate(5):
+      x = ed.Normal(loc=0., scale=1., sample_shape=2)
+    self.assertEqual(x.shape, [2, 5])
+
+  def testNestedPlates(self):
+    with ed.plate(3, name="outer"):
+      x = ed.Normal(loc=0., scale=1.)
+      with ed.plate(4, name="inner"):
+        y = ed.Normal(loc=x, scale=1.)
+    self.assertEqual(x.shape, [3])
+    self.assertEqual(y.shape, [4, 3])
+
+  def testPlateDim(self):
+    with ed.plate(3, dim=-2):
+      x = ed.Normal(loc=tf.zeros([2]), scale=1.)
+    self.assertEqual(x.shape, [3, 2])
+
+  def testPlateCondition(self):
+    value = tf.range(5, dtype=tf.float32)
+    with ed.condition(x=value):
+      x = model()
+    self.assertAllEqual(x.value, value)
+
+  def testPlateLogJoint(self):
+    log_joint = ed.make_log_joint_fn(model)
+    loc = 0.3
+    scale = np.linspace(0.5, 2., 5).astype(np.float32)
+    x = np.linspace(-1., 1., 5).astype(np.float32)
+    expected = ed.Normal(loc=0., scale=1.).distribution.log_prob(loc)
+    for i in range(5):
+      expected += ed.LogNormal(
+          loc=0., scale=1.).distribution.log_prob(scale[i])
+      expected += ed.Normal(loc=loc, scale=scale[i]).distribution.log_prob(x[i])
+    self.assertAllClose(log_joint(loc=loc, scale=scale, x=x), expected)
+
+  def testPlateIgnoresOtherOperations(self):
+    @ed.traceable
+    def f(x, name=None):
+      del name  # unused
+      return x
+
+    with ed.plate(5):
+      self.assertEqual(f(1., name="f"), 1.)
+
+  def testPlateErrors(self):
+    with self.assertRaises(ValueError):
+      with ed.plate(3, dim=0):
+        pass
+    with ed.plate(3, name="data"):
+      with self.assertRaises(ValueError):
+        with ed.plate(4, name="data"):
+          pass
+      with self.assertRaises(ValueError):
+        with ed.plate(4, dim=-1):
+          pass
+
+
+if __name__ == "__main__":
+  tf.test.main()
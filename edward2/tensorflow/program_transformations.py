@@ -20,12 +20,19 @@ from edward2.trace import trace
 import tensorflow as tf
 
 
-def make_log_joint_fn(model):
+def make_log_joint_fn(model, compile=False):  # pylint: disable=redefined-builtin
   """Takes Edward probabilistic program and returns its log joint function.
 
   Args:
     model: Python callable which executes the generative process of a
       computable probability distribution using `ed.RandomVariable`s.
+    compile: Whether to wrap the log-joint function in a `tf.function`. The
+      model is then traced once per input signature rather than re-executed in
+      Python on every call. The returned function records the names of the
+      random variables visited during the last trace in its `sites` attribute
+      and the number of times it was traced in its `trace_count` attribute.
+      Pass `Tensor`s rather than Python scalars as inputs in order to avoid
+      retracing.
 
   Returns:
     A log-joint probability function. Its inputs are `model`'s original inputs
@@ -56,7 +63,20 @@ def make_log_joint_fn(model):
   output = log_joint(features, coeffs=coeffs_value, outcomes=outcomes_value)
   ```
 
+  For repeated evaluation, e.g., within an MCMC loop, compile the log-joint
+  function so that the Python overhead of tracing the model is paid only once.
+
+  ```python
+  log_joint = ed.make_log_joint_fn(logistic_regression, compile=True)
+  output = log_joint(features, coeffs=coeffs_value, outcomes=outcomes_value)
+  output = log_joint(features, coeffs=coeffs_value, outcomes=outcomes_value)
+  assert log_joint.trace_count == 1
+  assert log_joint.sites == ["coeffs", "outcomes"]
+  ```
+
   """
+  model_argnames = _get_function_argnames(model)
+
   def log_joint_fn(*args, **kwargs):
     """Log-probability of inputs according to a joint probability distribution.
 
@@ -76,6 +96,7 @@ def make_log_joint_fn(model):
         `**kwargs`.
     """
     log_probs = []
+    sites = []
 
     def tracer(rv_constructor, *rv_args, **rv_kwargs):
       """Overrides a random variable's `value` and accumulates its log-prob."""
@@ -93,27 +114,120 @@ def make_log_joint_fn(model):
       rv = rv_constructor(*rv_args, **rv_kwargs)
       log_prob = tf.reduce_sum(rv.distribution.log_prob(rv.value))
       log_probs.append(log_prob)
+      sites.append(rv_name)
       return rv
 
-    model_kwargs = _get_function_inputs(model, kwargs)
+    model_kwargs = {k: v for k, v in kwargs.items() if k in model_argnames}
     with trace(tracer):
       model(*args, **model_kwargs)
     log_prob = sum(log_probs)
+    if compile:
+      compiled_log_joint_fn.sites = sites
+      compiled_log_joint_fn.trace_count += 1
     return log_prob
-  return log_joint_fn
 
+  if not compile:
+    return log_joint_fn
+  compiled_log_joint_fn = tf.function(log_joint_fn)
+  compiled_log_joint_fn.sites = []
+  compiled_log_joint_fn.trace_count = 0
+  return compiled_log_joint_fn
+
+
+def make_batched_log_joint_fn(model):
+  """Takes Edward probabilistic program and returns its batched log joint.
 
-def _get_function_inputs(f, src_kwargs):
-  """Filters inputs to be compatible with function `f`'s signature.
+  The batched log-joint function evaluates many settings of the random
+  variables in one pass: each random variable's value carries an additional
+  leading sample dimension, and the output is a vector of log-joints, one per
+  sample. This is useful to score many posterior samples at once, where
+  calling `make_log_joint_fn`'s output in a loop would execute the model in
+  Python once per sample.
+
+  The model is executed once and vectorized over the sample dimension with
+  `tf.vectorized_map`. The distributions' ops therefore broadcast over all
+  samples even if the model is written for a single setting of its random
+  variables. Ops without a vectorized implementation fall back to a
+  `tf.while_loop` over samples.
 
   Args:
-    f: Function according to whose input signature we filter arguments.
-    src_kwargs: Keyword arguments to filter according to `f`.
+    model: Python callable which executes the generative process of a
+      computable probability distribution using `ed.RandomVariable`s.
 
   Returns:
-    kwargs: Dict of key-value pairs in `src_kwargs` which exist in `f`'s
-      signature.
+    A batched log-joint probability function. Its inputs are `model`'s
+    original inputs, which are shared across samples, and random variables
+    which appear during the program execution, each with a leading sample
+    dimension of equal size. Its output is a tf.Tensor of shape
+    `[num_samples]`.
+
+  #### Examples
+
+  ```python
+  import edward2 as ed
+
+  def logistic_regression(features):
+    coeffs = ed.Normal(loc=0., scale=1.,
+                       sample_shape=features.shape[1], name="coeffs")
+    outcomes = ed.Bernoulli(logits=tf.tensordot(features, coeffs, [[1], [0]]),
+                            name="outcomes")
+    return outcomes
+
+  batched_log_joint = ed.make_batched_log_joint_fn(logistic_regression)
+
+  features = tf.random.normal([3, 2])
+  coeffs_samples = tf.random.normal([1000, 2])
+  outcomes_samples = tf.round(tf.random.uniform([1000, 3]))
+  output = batched_log_joint(features,
+                             coeffs=coeffs_samples,
+                             outcomes=outcomes_samples)
+  assert output.shape == (1000,)
+  ```
+
   """
+  log_joint_fn = make_log_joint_fn(model)
+  model_argnames = _get_function_argnames(model)
+
+  def batched_log_joint_fn(*args, **kwargs):
+    """Log-probabilities of inputs with a leading sample dimension.
+
+    Args:
+      *args: Positional arguments. They are the model's original inputs and can
+        alternatively be specified as part of `kwargs`.
+      **kwargs: Keyword arguments, where for each key-value pair `k` and `v`,
+        `v[i]` is passed as a `value` to the random variable(s) whose keyword
+        argument `name` during construction is equal to `k` when evaluating
+        the `i`th sample. Keyword arguments which are the model's original
+        inputs have no sample dimension.
+
+    Returns:
+      tf.Tensor of shape `[num_samples]`, which represents the model's
+      log-probability summed over all Edward random variables and their
+      dimensions for each sample.
+
+    Raises:
+      TypeError: If a random variable in the model has no specified value in
+        `**kwargs`.
+    """
+    model_kwargs = {}
+    values = {}
+    for k, v in kwargs.items():
+      if k in model_argnames:
+        model_kwargs[k] = v
+      else:
+        values[k] = tf.convert_to_tensor(v)
+
+    def sample_log_joint_fn(sample_values):
+      sample_kwargs = dict(model_kwargs)
+      sample_kwargs.update(sample_values)
+      return log_joint_fn(*args, **sample_kwargs)
+
+    return tf.vectorized_map(sample_log_joint_fn, values)
+  return batched_log_joint_fn
+
+
+def _get_function_argnames(f):
+  """Returns the names of the arguments in function `f`'s signature."""
   if hasattr(f, "_func"):  # functions returned by tf.make_template
     f = f._func  # pylint: disable=protected-access
 
@@ -121,6 +235,4 @@ def _get_function_inputs(f, src_kwargs):
     argspec = inspect.getfullargspec(f)  # pytype: disable=module-attr
   except AttributeError:
     argspec = inspect.getargspec(f)
-
-  fkwargs = {k: v for k, v in src_kwargs.items() if k in argspec.args}
-  return fkwargs
+  return frozenset(argspec.args)
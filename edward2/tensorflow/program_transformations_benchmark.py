@@ -0,0 +1,75 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks for program transformations.
+
+Run with `python program_transformations_benchmark.py --benchmark_filter=.`.
+"""
+
+import edward2 as ed
+from edward2 import benchmark_utils
+import tensorflow as tf
+
+
+def logistic_regression(features):
+  coeffs = ed.Normal(loc=0., scale=1.,
+                     sample_shape=features.shape[1], name="coeffs")
+  outcomes = ed.Bernoulli(logits=tf.tensordot(features, coeffs, [[1], [0]]),
+                          name="outcomes")
+  return outcomes
+
+
+class ProgramTransformationsBenchmark(benchmark_utils.ReportMixin,
+                                      tf.test.Benchmark):
+
+  def benchmarkBatchedLogJoint(self):
+    for num_samples in [10, 100, 1000]:
+      features = tf.random.normal([100, 5])
+      coeffs = tf.random.normal([num_samples, 5])
+      outcomes = tf.round(tf.random.uniform([num_samples, 100]))
+      log_joint = ed.make_log_joint_fn(logistic_regression)
+      batched_log_joint = ed.make_batched_log_joint_fn(logistic_regression)
+
+      def loop():
+        return tf.stack([  # pylint: disable=cell-var-from-loop
+            log_joint(features, coeffs=coeffs[i], outcomes=outcomes[i])
+            for i in range(num_samples)])
+
+      def batched():
+        return batched_log_joint(  # pylint: disable=cell-var-from-loop
+            features, coeffs=coeffs, outcomes=outcomes)
+
+      self._report("loop_log_joint_{}".format(num_samples), loop)
+      self._report("batched_log_joint_{}".format(num_samples), batched)
+
+  def benchmarkCompiledLogJoint(self):
+    features = tf.random.normal([100, 5])
+    coeffs = tf.random.normal([5])
+    outcomes = tf.round(tf.random.uniform([100]))
+    log_joint = ed.make_log_joint_fn(logistic_regression)
+    compiled_log_joint = ed.make_log_joint_fn(logistic_regression,
+                                              compile=True)
+    self._report(
+        "eager_log_joint",
+        lambda: log_joint(features, coeffs=coeffs, outcomes=outcomes),
+        num_iters=100)
+    self._report(
+        "compiled_log_joint",
+        lambda: compiled_log_joint(features, coeffs=coeffs, outcomes=outcomes),
+        num_iters=100)
+
+
+if __name__ == "__main__":
+  tf.test.main()
@@ -85,6 +85,53 @@ class ProgramTransformationsTest(tf.test.TestCase):
 
     self.assertEqual(actual_log_prob, expected_log_prob)
 
+  def testMakeLogJointFnCompiled(self):
+    """Test `make_log_joint_fn` with `compile=True` traces only once."""
+    def normal_with_unknown_mean():
+      loc = ed.Normal(loc=0., scale=1., name="loc")
+      x = ed.Normal(loc=loc, scale=0.5, sample_shape=5, name="x")
+      return x
+
+    log_joint = ed.make_log_joint_fn(normal_with_unknown_mean)
+    compiled_log_joint = ed.make_log_joint_fn(normal_with_unknown_mean,
+                                              compile=True)
+    self.assertEqual(compiled_log_joint.trace_count, 0)
+    for _ in range(3):
+      loc_value = tf.random.normal([])
+      x_value = tf.random.normal([5])
+      self.assertAllClose(log_joint(loc=loc_value, x=x_value),
+                          compiled_log_joint(loc=loc_value, x=x_value))
+    self.assertEqual(compiled_log_joint.trace_count, 1)
+    self.assertEqual(compiled_log_joint.sites, ["loc", "x"])
+
+  def testMakeBatchedLogJointFn(self):
+    """Test `make_batched_log_joint_fn` agrees with per-sample log-joints."""
+    def linear_regression(features, prior_precision):
+      w = ed.Normal(loc=0.,
+                    scale=tf.math.rsqrt(prior_precision),
+                    sample_shape=features.shape[1],
+                    name="w")
+      y = ed.Normal(loc=tf.tensordot(features, w, [[1], [0]]),
+                    scale=1.,
+                    name="y")
+      return y
+
+    num_samples = 4
+    features = tf.random.normal([3, 2])
+    prior_precision = 0.5
+    w_samples = tf.random.normal([num_samples, 2])
+    y_samples = tf.random.normal([num_samples, 3])
+
+    log_joint = ed.make_log_joint_fn(linear_regression)
+    batched_log_joint = ed.make_batched_log_joint_fn(linear_regression)
+    expected_log_probs = [
+        log_joint(features, prior_precision, w=w_samples[i], y=y_samples[i])
+        for i in range(num_samples)]
+    actual_log_probs = batched_log_joint(
+        features, prior_precision=prior_precision, w=w_samples, y=y_samples)
+    self.assertEqual(actual_log_probs.shape, (num_samples,))
+    self.assertAllClose(expected_log_probs, actual_log_probs)
+
   def testMakeLogJointFnDynamic(self):
     """Test `make_log_joint_fn` on Edward program with stochastic control flow.
 
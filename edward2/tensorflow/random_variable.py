@@ -15,9 +15,22 @@
 
 """Random variable."""
 
+import collections
+import contextlib
+import contextvars
 import functools
 import tensorflow as tf
 
+# Counters of the ops issued by random variables, one per active `count_ops`
+# context. Stored in a `contextvars.ContextVar` so that each thread and each
+# asyncio task only counts its own ops. Empty unless instrumentation is enabled.
+_op_counters = contextvars.ContextVar("edward2_op_counters", default=())
+
+
+def _count_op(name):
+  for counter in _op_counters.get():
+    counter[name] += 1
+
 
 class RandomVariable(object):
   """Class for random variables.
@@ -59,10 +72,14 @@ class RandomVariable(object):
   ```
   """
 
+  __slots__ = ("_distribution", "_sample_shape", "_value", "_value_shape",
+               "__weakref__")
+
   def __init__(self,
                distribution,
                sample_shape=(),
-               value=None):
+               value=None,
+               lazy=False):
     """Create a new random variable.
 
     Args:
@@ -74,6 +91,13 @@ class RandomVariable(object):
       value: tf.Tensor to associate with random variable. Must have shape
         `sample_shape + distribution.batch_shape + distribution.event_shape`.
         Default is to sample from random variable according to `sample_shape`.
+      lazy: Whether to defer sampling the value until it is first accessed. The
+        random variable's shape is then computed statically from
+        `sample_shape + distribution.batch_shape + distribution.event_shape`.
+        This avoids sampling random variables which are only used for their
+        distribution, e.g., to compute log-probabilities or KL divergences.
+        The value must be accessed in the same graph context as the random
+        variable's construction.
 
     Raises:
       ValueError: `value` has incompatible shape with
@@ -83,15 +107,64 @@ class RandomVariable(object):
     self._sample_shape = sample_shape
     if tf.is_tensor(value):
       value_shape = value.shape
-      expected_value_shape = self.sample_shape.concatenate(
-          self.distribution.batch_shape).concatenate(
-              self.distribution.event_shape)
+      expected_value_shape = self._expected_value_shape()
       if not value_shape.is_compatible_with(expected_value_shape):
         raise ValueError(
             "Incompatible shape for initialization argument 'value'. "
             "Expected %s, got %s." % (expected_value_shape, value_shape))
+    if value is not None:
+      # Cast once here rather than on each access of `value`, which every
+      # overloaded operator and tensor conversion goes through.
+      if _op_counters.get():
+        _count_op("cast")
+      value = tf.cast(value, distribution.dtype)
     self._value = value
-    self._value_shape = self.value.shape
+    if lazy and value is None:
+      self._value_shape = self._expected_value_shape()
+    else:
+      self._value_shape = self.value.shape
+
+  def _expected_value_shape(self):
+    return self.sample_shape.concatenate(
+        self.distribution.batch_shape).concatenate(
+            self.distribution.event_shape)
+
+  @staticmethod
+  @contextlib.contextmanager
+  def count_ops():
+    """Context manager which counts ops issued by random variables.
+
+    This instruments the ops that random variables add to the computation:
+    sampling their value (`"sample"`), casting a given value to the
+    distribution's dtype (`"cast"`), and converting the random variable to a
+    tensor, either explicitly or via an overloaded operator (`"convert"`).
+
+    Only ops issued by the current thread or asyncio task are counted.
+
+    Yields:
+      A `collections.Counter` which maps each op name to the number of times
+      it was issued within the context.
+
+    #### Examples
+
+    ```python
+    import edward2 as ed
+
+    def model():
+      x = ed.Normal(loc=0., scale=1., name="x")
+      return x + x
+
+    with ed.RandomVariable.count_ops() as counts:
+      model()
+    assert counts == {"sample": 1, "convert": 2}
+    ```
+    """
+    counter = collections.Counter()
+    token = _op_counters.set(_op_counters.get() + (counter,))
+    try:
+      yield counter
+    finally:
+      _op_counters.reset(token)
 
   @property
   def distribution(self):
@@ -101,6 +174,8 @@ class RandomVariable(object):
   @property
   def dtype(self):
     """`Dtype` of elements in this random variable."""
+    if self._value is None:
+      return self.distribution.dtype
     return self.value.dtype
 
   @property
@@ -133,15 +208,16 @@ class RandomVariable(object):
   def value(self):
     """Get tensor that the random variable corresponds to."""
     if self._value is None:
+      if _op_counters.get():
+        _count_op("sample")
       try:
         self._value = self.distribution.sample(self.sample_shape_tensor())
+        self._value_shape = self._value.shape
       except NotImplementedError:
         raise NotImplementedError(
             "sample is not implemented for {0}. You must either pass in the "
             "value argument or implement sample for {0}."
             .format(self.distribution.__class__.__name__))
-    else:
-      self._value = tf.cast(self._value, self.distribution.dtype)
     return self._value
 
   def __str__(self):
@@ -217,6 +293,8 @@ def _overload_operator(cls, op):
   """
   @functools.wraps(getattr(tf.Tensor, op))
   def _run_op(a, *args):
+    if _op_counters.get():
+      _count_op("convert")
     return getattr(tf.Tensor, op)(a.value, *args)
 
   setattr(cls, op, _run_op)
@@ -228,6 +306,8 @@ def _tensor_conversion_function(v, dtype=None, name=None, as_ref=False):
     raise ValueError(
         "Incompatible type conversion requested to type '%s' for variable "
         "of type '%s'" % (dtype.name, v.dtype.name))
+  if _op_counters.get():
+    _count_op("convert")
   return v.value
 
 
@@ -16,6 +16,7 @@
 """Tests for random variable."""
 
 import re
+import threading
 from absl.testing import parameterized
 import edward2 as ed
 import numpy as np
@@ -64,6 +65,52 @@ class RandomVariableTest(parameterized.TestCase, tf.test.TestCase):
     with self.assertRaises(NotImplementedError):
       _ = ed.RandomVariable(FakeDistributionNoSample())
 
+  def testConstructorLazy(self):
+    x = ed.RandomVariable(FakeDistributionNoSample(), lazy=True)
+    with self.assertRaises(NotImplementedError):
+      _ = x.value
+
+    x = ed.Normal(loc=tf.zeros([3]), scale=1., sample_shape=2, lazy=True)
+    self.assertEqual(x.shape, [2, 3])
+    self.assertEqual(x.dtype, tf.float32)
+    self.assertAllEqual(x.distribution.log_prob(tf.zeros([2, 3])).shape,
+                        [2, 3])
+    self.assertEqual(x.value.shape, [2, 3])
+    self.assertIs(x.value, x.value)
+
+  def testValueCastOnce(self):
+    x = ed.RandomVariable(tfp.distributions.Normal(0., 1.), value=1)
+    self.assertEqual(x.value.dtype, tf.float32)
+    self.assertIs(x.value, x.value)
+
+  def testCountOps(self):
+    def model():
+      x = ed.Normal(loc=0., scale=1., name="x")
+      y = ed.Normal(loc=0., scale=1., value=1, name="y")
+      return tf.convert_to_tensor(x) + x * y
+
+    with ed.RandomVariable.count_ops() as counts:
+      model()
+    self.assertEqual(counts, {"sample": 1, "cast": 1, "convert": 3})
+    model()
+    self.assertEqual(counts, {"sample": 1, "cast": 1, "convert": 3})
+
+  def testCountOpsIgnoresOtherThreads(self):
+    def model():
+      x = ed.Normal(loc=0., scale=1., name="x")
+      return tf.convert_to_tensor(x)
+
+    with ed.RandomVariable.count_ops() as counts:
+      thread = threading.Thread(target=model)
+      thread.start()
+      thread.join()
+    self.assertEqual(counts, {})
+
+  def testSlots(self):
+    x = ed.RandomVariable(tfp.distributions.Normal(0., 1.))
+    with self.assertRaises(AttributeError):
+      x.attribute = 1.
+
   def testGradientsFirstOrder(self):
     x = ed.RandomVariable(tfp.distributions.Normal(0., 1.))
     def f(x):
@@ -176,11 +176,11 @@ class NormalKLDivergence(tf.keras.regularizers.Regularizer):
     """Computes regularization given an input ed.RandomVariable."""
     if not isinstance(x, random_variable.RandomVariable):
       raise ValueError('Input must be an ed.RandomVariable.')
+    event_shape = x.distribution.event_shape_tensor()
     prior = generated_random_variables.Independent(
         generated_random_variables.Normal(
-            loc=tf.broadcast_to(self.mean, x.distribution.event_shape),
-            scale=tf.broadcast_to(self.stddev, x.distribution.event_shape)
-        ).distribution,
+            loc=tf.broadcast_to(self.mean, event_shape),
+            scale=tf.broadcast_to(self.stddev, event_shape)).distribution,
         reinterpreted_batch_ndims=len(x.distribution.event_shape))
     regularization = x.distribution.kl_divergence(prior.distribution)
     return self.scale_factor * regularization
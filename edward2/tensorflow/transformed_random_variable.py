@@ -15,8 +15,8 @@
 
 """Reversible layers."""
 
-from edward2 import trace
 from edward2.tensorflow import random_variable
+from edward2.trace import traceable
 import tensorflow as tf
 import tensorflow_probability as tfp
 
@@ -106,7 +106,7 @@ class TransformedDistribution(tfp.distributions.Distribution):
     return entropy
 
 
-@trace.traceable
+@traceable
 def TransformedRandomVariable(rv,  # pylint: disable=invalid-name
                               reversible_layer,
                               name=None,
@@ -16,33 +16,142 @@
 """Tracing mechanism for controlling the execution of programs."""
 
 import contextlib
+import contextvars
 import functools
 import threading
 
 
-class _TracerStack(threading.local):
-  """A thread-local stack of tracers."""
+def _apply(f, *args, **kwargs):
+  return f(*args, **kwargs)
+
+
+class _ThreadLocalStorage(threading.local):
 
   def __init__(self):
-    super(_TracerStack, self).__init__()
-    self.stack = [lambda f, *args, **kwargs: f(*args, **kwargs)]
+    super(_ThreadLocalStorage, self).__init__()
+    self.stack = (_apply,)
+
+
+class _TracerStack(object):
+  """A stack of tracers local to the current context.
+
+  The stack is an immutable tuple stored in a `contextvars.ContextVar`, so that
+  each thread and each asyncio task operates on its own stack: a task inherits
+  the tracers active when it was created, and tracers it enters are not seen
+  by other tasks interleaving on the same thread. Pushing or popping a tracer
+  sets a new tuple and returns a token which restores the previous one.
+
+  For compatibility, the stack can instead be stored per thread, in which case
+  tasks running on the same thread share it.
+  """
+
+  def __init__(self):
+    self._context_var = contextvars.ContextVar("edward2_tracer_stack",
+                                               default=(_apply,))
+    self._thread_local = _ThreadLocalStorage()
+    self.use_thread_local(False)
+
+  def use_thread_local(self, enable):
+    """Sets whether to store the stack per thread rather than per context."""
+    if enable:
+      self.get = self._thread_local_get
+      self.set = self._thread_local_set
+      self.reset = self._thread_local_reset
+    else:
+      self.get = self._context_var.get
+      self.set = self._context_var.set
+      self.reset = self._context_var.reset
+
+  def _thread_local_get(self):
+    return self._thread_local.stack
+
+  def _thread_local_set(self, stack):
+    token = self._thread_local.stack
+    self._thread_local.stack = stack
+    return token
+
+  def _thread_local_reset(self, token):
+    self._thread_local.stack = token
 
 
 _tracer_stack = _TracerStack()
 
 
+def use_thread_local_tracer_stack(enable=True):
+  """Sets whether tracers are stored per thread instead of per context.
+
+  By default, the stack of tracers is local to the current context (see
+  `contextvars`): each thread and each asyncio task has its own tracers, so
+  that coroutines interleaving on one event-loop thread can each execute
+  programs under their own `condition`, `tape`, etc. Enabling this restores
+  the previous behavior where the stack is thread-local and shared by all
+  tasks on a thread.
+
+  This must be called while no tracers are active.
+
+  Args:
+    enable: Whether to store the stack of tracers per thread.
+  """
+  _tracer_stack.use_thread_local(enable)
+
+
+def get_active_tracers():
+  """Returns the tracers active in the current context, innermost last."""
+  return _tracer_stack.get()[1:]
+
+
 @contextlib.contextmanager
+def set_active_tracers(tracers):
+  """Context manager which replaces the active tracers with `tracers`.
+
+  Together with `get_active_tracers`, this lets one execute a program under the
+  tracers of another context, e.g., in a worker thread.
+
+  Args:
+    tracers: Tuple of tracers, innermost last.
+
+  Yields:
+    None.
+  """
+  token = _tracer_stack.set(_tracer_stack.get()[:1] + tuple(tracers))
+  try:
+    yield
+  finally:
+    _tracer_stack.reset(token)
+
+
+class _TraceContext(object):
+  """Context manager which pushes a tracer onto the stack.
+
+  This avoids the overhead of a generator-based context manager, as tracing
+  contexts are often entered once per program execution, e.g., when evaluating
+  a log-joint function.
+  """
+
+  __slots__ = ("_tracer", "_token")
+
+  def __init__(self, tracer):
+    self._tracer = tracer
+    self._token = None
+
+  def __enter__(self):
+    self._token = _tracer_stack.set(_tracer_stack.get() + (self._tracer,))
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    _tracer_stack.reset(self._token)
+
+
 def trace(tracer):
   """Python context manager for tracing.
 
   Upon entry, a trace context manager pushes an tracer onto a
-  thread-local stack. Upon exiting, it pops the tracer from the stack.
+  context-local stack. Upon exiting, it pops the tracer from the stack.
 
   Args:
     tracer: Function which takes a callable `f` and inputs `*args`, `**kwargs`.
 
-  Yields:
-    None.
+  Returns:
+    A context manager which yields None.
 
   #### Examples
 
@@ -71,16 +180,12 @@ def trace(tracer):
   by default, we could have called it directly. Refer also to the example in
   `get_next_tracer()` for more details on nested tracers.
   """
-  try:
-    _tracer_stack.stack.append(tracer)
-    yield
-  finally:
-    _tracer_stack.stack.pop()
+  return _TraceContext(tracer)
 
 
 @contextlib.contextmanager
 def get_next_tracer():
-  """Yields the top-most tracer on the thread-local trace stack.
+  """Yields the top-most tracer on the context-local trace stack.
 
   Operations may be traced by multiple nested tracers. Once reached,
   an operation can be forwarded through nested tracers until resolved.
@@ -88,7 +193,7 @@ def get_next_tracer():
   argument (`f`) as an `traceable`. To avoid nesting, manipulate the
   computation without using `traceable`.
 
-  This function allows for nesting by manipulating the thread-local tracer
+  This function allows for nesting by manipulating the context-local tracer
   stack, so that operations are traced in the order of tracer nesting.
 
   #### Examples
@@ -151,21 +256,23 @@ def get_next_tracer():
   a random draw from Normal(0., 1.) doubled, and `y` is a constant 0.84, thus
   z = 2 * Normal(0., 1.) + 0.84.
   """
+  stack = _tracer_stack.get()
+  token = _tracer_stack.set(stack[:-1])
   try:
-    tracer = _tracer_stack.stack.pop()
-    yield tracer
+    yield stack[-1]
   finally:
-    _tracer_stack.stack.append(tracer)
+    _tracer_stack.reset(token)
 
 
 def traceable(func):
   """Decorator that wraps `func` so that its execution is traced.
 
-  The wrapper passes `func` to the tracer for the current thread.
+  The wrapper passes `func` to the tracer for the current context.
 
   If there is no next tracer, we perform an "immediate" call to `func`.
   That is, `func` terminates without forwarding its execution to another
-  tracer.
+  tracer. In particular, when no tracers are installed, the wrapper calls
+  `func` directly without manipulating the stack.
 
   Args:
     func: Function to wrap.
@@ -175,7 +282,16 @@ def traceable(func):
   """
   @functools.wraps(func)
   def func_wrapped(*args, **kwargs):
-    with get_next_tracer() as tracer:
-      return tracer(func, *args, **kwargs)
+    stack = _tracer_stack.get()
+    if len(stack) <= 1:
+      # Only the default tracer, which applies `func`, remains on the stack.
+      return func(*args, **kwargs)
+    # Equivalent to `get_next_tracer()`, inlined to avoid the overhead of a
+    # generator-based context manager.
+    token = _tracer_stack.set(stack[:-1])
+    try:
+      return stack[-1](func, *args, **kwargs)
+    finally:
+      _tracer_stack.reset(token)
 
   return func_wrapped
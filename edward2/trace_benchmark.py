@@ -0,0 +1,70 @@
+# coding=utf-8
+# Copyright 2020 The Edward2 Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks for tracing.
+
+Run with `python -m edward2.trace_benchmark --benchmark_filter=.`.
+"""
+
+import contextlib
+import time
+
+import edward2 as ed
+import tensorflow as tf
+
+
+def passthrough_tracer(f, *args, **kwargs):
+  return ed.traceable(f)(*args, **kwargs)
+
+
+class TraceBenchmark(tf.test.Benchmark):
+
+  def benchmarkRandomVariableConstruction(self):
+    num_rvs = 1000
+    loc = tf.zeros([])
+    value = tf.zeros([])
+    for num_tracers in [0, 1, 5]:
+      with contextlib.ExitStack() as stack:
+        for _ in range(num_tracers):
+          stack.enter_context(ed.trace(passthrough_tracer))
+        start = time.time()
+        for _ in range(num_rvs):
+          ed.Normal(loc=loc, scale=1., value=value, name="x")
+        wall_time = time.time() - start
+      self.report_benchmark(
+          name="random_variable_construction_{}_tracers".format(num_tracers),
+          iters=num_rvs,
+          wall_time=wall_time / num_rvs,
+          extras={"random_variables_per_second": num_rvs / wall_time})
+
+  def benchmarkTraceableCall(self):
+    num_calls = 100000
+    func = ed.traceable(lambda x, name=None: x)
+    for num_tracers in [0, 1, 5]:
+      with contextlib.ExitStack() as stack:
+        for _ in range(num_tracers):
+          stack.enter_context(ed.trace(passthrough_tracer))
+        start = time.time()
+        for _ in range(num_calls):
+          func(1., name="x")
+        wall_time = time.time() - start
+      self.report_benchmark(
+          name="traceable_call_{}_tracers".format(num_tracers),
+          iters=num_calls,
+          wall_time=wall_time / num_calls)
+
+
+if __name__ == "__main__":
+  tf.test.main()
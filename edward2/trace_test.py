@@ -15,8 +15,12 @@
 
 """Tests for tracing."""
 
+import asyncio
+
 from absl.testing import parameterized
 import edward2 as ed
+from edward2.trace import get_active_tracers
+from edward2.trace import set_active_tracers
 import tensorflow as tf
 
 
@@ -101,6 +105,25 @@ class TraceTest(parameterized.TestCase, tf.test.TestCase):
     value = 1. + 0.42
     self.assertAlmostEqual(z, value, places=5)
 
+  def testNestedTraceable(self):
+    @ed.traceable
+    def inner(x, name=None):
+      del name  # unused
+      return x + 1.
+
+    @ed.traceable
+    def outer(x, name=None):
+      del name  # unused
+      return 2. * inner(x, name="inner")
+
+    def double(f, *args, **kwargs):
+      return 2. * ed.traceable(f)(*args, **kwargs)
+
+    self.assertEqual(outer(1., name="outer"), 4.)
+    with ed.trace(double):
+      self.assertEqual(outer(1., name="outer"), 8.)
+    self.assertEqual(outer(1., name="outer"), 4.)
+
   def testTraceException(self):
     def f():
       raise NotImplementedError()
@@ -119,6 +142,50 @@ class TraceTest(parameterized.TestCase, tf.test.TestCase):
 
     self.assertEqual(old_tracer, new_tracer)
 
+  def testTraceAsyncio(self):
+    @ed.traceable
+    def f(name=None, value=None):
+      del name  # unused
+      return value
+
+    async def run(value):
+      with ed.condition(x=value):
+        # Yield to the other coroutine while this one's tracer is active.
+        await asyncio.sleep(0)
+        return f(name="x")
+
+    async def main():
+      return await asyncio.gather(run(1), run(2))
+
+    self.assertEqual(asyncio.run(main()), [1, 2])
+
+  def testUseThreadLocalTracerStack(self):
+    def tracer(f, *args, **kwargs):
+      return 2. * ed.traceable(f)(*args, **kwargs)
+
+    f = ed.traceable(lambda x: x)
+    ed.use_thread_local_tracer_stack()
+    try:
+      with ed.trace(tracer):
+        self.assertEqual(f(1.), 2.)
+      self.assertEqual(f(1.), 1.)
+    finally:
+      ed.use_thread_local_tracer_stack(False)
+
+  def testSetActiveTracers(self):
+    def tracer(f, *args, **kwargs):
+      return 2. * ed.traceable(f)(*args, **kwargs)
+
+    f = ed.traceable(lambda x: x)
+    with ed.trace(tracer):
+      tracers = get_active_tracers()
+      self.assertEqual(tracers, (tracer,))
+      with set_active_tracers(()):
+        self.assertEqual(f(1.), 1.)
+    with set_active_tracers(tracers):
+      self.assertEqual(f(1.), 2.)
+    self.assertEqual(get_active_tracers(), ())
+
 
 if __name__ == "__main__":
   tf.test.main()
@@ -17,12 +17,16 @@
 
 This file collects common tracing operations, i.e., traces that each control the
 execution of programs in a specific manner. For example, 'condition' traces a
-program and fixes the value of random variables; and 'tape' traces the program
-and records the executed random variables onto an ordered dictionary.
+program and fixes the value of random variables; 'tape' traces the program
+and records the executed random variables onto an ordered dictionary; and
+'memoize' traces the program and reuses random variables from previous
+executions whose inputs are unchanged.
 """
 
 import collections
 import contextlib
+import functools
+import operator
 from edward2.trace import trace
 from edward2.trace import traceable
 
@@ -65,30 +69,234 @@ def condition(**model_kwargs):
   ratings.distribution.log_prob(data)
   ```
   """
-  def _condition(f, *args, **kwargs):
-    """Sets random variable values to its aligned value."""
+  # The tracer is a partial of a module-level function so that it can be
+  # pickled, e.g., to propagate it to process workers in `ed.parallel_map`.
+  with trace(functools.partial(_condition, model_kwargs)):
+    yield
+
+
+def _condition(model_kwargs, f, *args, **kwargs):
+  """Sets random variable values to its aligned value."""
+  name = kwargs.get("name")
+  if name in model_kwargs:
+    kwargs["value"] = model_kwargs[name]
+  return traceable(f)(*args, **kwargs)
+
+
+class SiteCache(object):
+  """Least-recently-used cache of traced operations for `memoize`.
+
+  Each entry maps a key of an operation's `name` and arguments to the
+  operation's output. Arguments are compared by value if they are Python
+  scalars, strings, NumPy arrays or eager `tf.Tensor`s with at most 64
+  elements, or nested tuples, lists, or dicts thereof, and by identity
+  otherwise (e.g., for random variables, graph tensors and larger arrays).
+  Floating point values are compared by their representation, so that `0.` and
+  `-0.` differ. The cache holds references to the arguments of each entry so
+  that their identities remain valid.
+
+  Attributes:
+    capacity: Maximum number of entries, or None if unbounded.
+    hits: Number of operations whose output was reused.
+    misses: Number of operations which were executed.
+  """
+
+  def __init__(self, capacity=None):
+    self.capacity = capacity
+    self.hits = 0
+    self.misses = 0
+    self._entries = collections.OrderedDict({})
+
+  def __len__(self):
+    return len(self._entries)
+
+  def clear(self):
+    """Removes all entries and resets the statistics."""
+    self.hits = 0
+    self.misses = 0
+    self._entries.clear()
+
+  def lookup(self, key):
+    """Returns the output cached at `key`, or None if there is none."""
+    entry = self._entries.get(key)
+    if entry is None:
+      return None
+    self._entries.move_to_end(key)
+    return entry[0]
+
+  def insert(self, key, output, args):
+    """Caches `output` at `key`, evicting the least recently used entry."""
+    self._entries[key] = (output, args)
+    self._entries.move_to_end(key)
+    if self.capacity is not None and len(self._entries) > self.capacity:
+      self._entries.popitem(last=False)
+
+
+# Maximum number of elements of arrays and eager tensors compared by value.
+_MAX_VALUE_KEY_SIZE = 64
+
+
+def _cache_key(x):
+  """Returns a hashable key comparing `x` by value or else by identity."""
+  if isinstance(x, (float, complex)):
+    # Unlike equality, the representation distinguishes `0.` from `-0.`.
+    return (type(x), repr(x))
+  elif x is None or isinstance(x, (bool, int, str, bytes)):
+    return (type(x), x)
+  elif isinstance(x, (tuple, list)):
+    return (type(x),) + tuple(_cache_key(v) for v in x)
+  elif isinstance(x, dict):
+    return (dict,) + tuple(sorted((k, _cache_key(v)) for k, v in x.items()))
+  elif not hasattr(x, "distribution"):
+    # Compare small arrays and eager tensors by value, as deterministic
+    # computation between random variables, e.g., a reduction, returns new but
+    # equal arrays on each execution. Larger ones are compared by identity:
+    # copying them to the host to compare values can cost more than the
+    # operation being cached. Random variables are compared by identity.
+    try:
+      shape = tuple(x.shape)
+      if functools.reduce(operator.mul, shape, 1) <= _MAX_VALUE_KEY_SIZE:
+        array = x.numpy() if hasattr(x, "numpy") else x
+        return (str(array.dtype), shape, array.tobytes())
+    except (AttributeError, NotImplementedError, TypeError, ValueError):
+      pass
+  return (id, id(x))
+
+
+@contextlib.contextmanager
+def memoize(cache=None, capacity=None):
+  """Context manager for reusing operations across program executions.
+
+  Each named traceable operation executed in this context is looked up in a
+  cache keyed by the operation, its `name` and its arguments. If the same
+  operation was executed with the same arguments before, its previous output
+  is returned without executing it again. Otherwise, the operation is executed
+  and its output is cached.
+
+  For random variables, a cache hit reuses the random variable including its
+  sampled value. Downstream random variables whose arguments depend on it
+  therefore also hit the cache, so that re-executing a program only
+  recomputes the random variables affected by changed inputs. Operations
+  without a `name` are never cached. Within one `memoize` context, each cached
+  output is reused at most once, so that repeated sites with equal arguments
+  remain distinct. Enter a new context for each execution which should reuse
+  the cache.
+
+  Arguments are not traced back to the random variables they are computed
+  from: an argument which is computed anew on each execution, e.g.,
+  `tf.reduce_sum(z, axis=1)`, is only compared by value if it has at most 64
+  elements (see `SiteCache`). Larger ones are compared by identity, so their
+  operation and all operations downstream of it are executed again even if
+  the random variables they depend on were reused.
+
+  Tracers applied before the operation reaches `memoize` (that is, tracers
+  entered inside of it, such as `condition`) are part of the key, as they
+  modify the operation's arguments. Enter `memoize` as the outermost tracer.
+
+  Args:
+    cache: Optional `SiteCache` to look up and store operations in. Pass the
+      cache yielded by a previous `memoize` context in order to reuse its
+      operations. Default is a new cache.
+    capacity: Maximum number of entries of a new cache. Only used if `cache` is
+      None. Default is an unbounded cache.
+
+  Yields:
+    cache: `SiteCache` holding the cached operations together with `hits` and
+      `misses` statistics.
+
+  #### Examples
+
+  ```python
+  import edward2 as ed
+
+  def model():
+    z = ed.Normal(loc=0., scale=1., sample_shape=[1000], name="z")
+    x = ed.Normal(loc=tf.reduce_sum(z), scale=1., name="x")
+    y = ed.Normal(loc=x, scale=1., name="y")
+    return y
+
+  with ed.memoize(capacity=100) as cache:
+    model()
+
+  for y in [tf.constant(0.), tf.constant(1.)]:
+    with ed.memoize(cache):
+      with ed.condition(y=y):
+        model()
+
+  # `z` and `x` are reused; only `y` is recomputed.
+  assert cache.hits == 4
+  ```
+  """
+  if cache is None:
+    cache = SiteCache(capacity)
+  used_keys = set()
+
+  def _memoize(f, *args, **kwargs):
+    """Returns the cached output of an operation or executes it."""
     name = kwargs.get("name")
-    if name in model_kwargs:
-      kwargs["value"] = model_kwargs[name]
-    return traceable(f)(*args, **kwargs)
+    if not name:
+      return traceable(f)(*args, **kwargs)
+    key = (f, _cache_key(args), _cache_key(kwargs))
+    if key not in used_keys:
+      output = cache.lookup(key)
+      if output is not None:
+        used_keys.add(key)
+        cache.hits += 1
+        return output
+    cache.misses += 1
+    output = traceable(f)(*args, **kwargs)
+    if key not in used_keys:
+      used_keys.add(key)
+      cache.insert(key, output, (args, kwargs))
+    return output
 
-  with trace(_condition):
-    yield
+  with trace(_memoize):
+    yield cache
 
 
 @contextlib.contextmanager
-def tape():
+def tape(include=None, exclude=None, store="output", callback=None,
+         max_size=None):
   """Context manager for recording traceable executions onto a tape.
 
   Similar to `tf.GradientTape`, operations are recorded if they are executed
   within this context manager. In addition, the operation must be registered
   (decorated) as `ed.traceable`.
 
+  By default, the tape holds references to every recorded output, e.g., all
+  random variables together with their distributions and sampled values, for
+  the lifetime of the tape. For large models, use `include`, `exclude`, `store`
+  and `max_size` to bound the memory held by the tape.
+
+  Args:
+    include: Optional name or collection of names. If specified, only
+      operations whose `name` is in `include` are recorded.
+    exclude: Optional name or collection of names. Operations whose `name` is
+      in `exclude` are not recorded.
+    store: What to record for each operation. One of "output" (the output of
+      the operation, typically a random variable), "value" (the output's
+      `value`, dropping references to its distribution), "distribution" (the
+      output's `distribution`), or "callback" (nothing is stored; each output
+      is only passed to `callback`). Outputs without a `value` or
+      `distribution`, e.g., of operations which are not random variables, are
+      stored as is.
+    callback: Optional function which takes the `name` and output of each
+      recorded operation. It is called in execution order. This lets one stream
+      records, e.g., to a summary writer, without holding them in memory.
+    max_size: Optional maximum number of records to hold. Once the tape is
+      full, the least recently recorded name is dropped, so that the tape acts
+      as a ring buffer.
+
   Yields:
     tape: OrderedDict where operations are recorded in sequence. Keys are
       the `name` keyword argument to the operation (typically, a random
       variable's `name`) and values are the corresponding output of the
-      operation. If the operation has no name, it is not recorded.
+      operation (or its `value` or `distribution`, according to `store`). If
+      the operation has no name, it is not recorded.
+
+  Raises:
+    ValueError: If `store` is not one of the supported options, or `store` is
+      "callback" and no `callback` is given.
 
   #### Examples
 
@@ -111,15 +319,51 @@ def tape():
   assert model_tape["ratings"] == ratings
   ```
 
+  To only keep the sampled values of the latent variables:
+
+  ```python
+  with ed.tape(exclude=["ratings"], store="value") as model_tape:
+    ratings = probabilistic_matrix_factorization()
+
+  assert list(model_tape.keys()) == ["users", "items"]
+  ```
+
   """
+  if store not in ("output", "value", "distribution", "callback"):
+    raise ValueError("store must be one of 'output', 'value', 'distribution' "
+                     "or 'callback'; got {}.".format(store))
+  if store == "callback" and callback is None:
+    raise ValueError("store='callback' requires a callback.")
+  if isinstance(include, str):
+    include = (include,)
+  if isinstance(exclude, str):
+    exclude = (exclude,)
+  if include is not None:
+    include = frozenset(include)
+  exclude = frozenset(exclude or ())
   tape_data = collections.OrderedDict({})
 
   def record(f, *args, **kwargs):
     """Records execution to a tape."""
     name = kwargs.get("name")
     output = traceable(f)(*args, **kwargs)
-    if name:
+    if not name or name in exclude or (include is not None and
+                                       name not in include):
+      return output
+    if callback is not None:
+      callback(name, output)
+    if store == "callback":
+      return output
+    elif store == "value":
+      tape_data[name] = getattr(output, "value", output)
+    elif store == "distribution":
+      tape_data[name] = getattr(output, "distribution", output)
+    else:
       tape_data[name] = output
+    if max_size is not None:
+      tape_data.move_to_end(name)
+      if len(tape_data) > max_size:
+        tape_data.popitem(last=False)
     return output
 
   with trace(record):
@@ -17,6 +17,9 @@
 
 import edward2 as ed
 import tensorflow as tf
+import tensorflow_probability as tfp
+
+tfd = tfp.distributions
 
 
 class TracersTest(tf.test.TestCase):
@@ -34,6 +37,119 @@ class TracersTest(tf.test.TestCase):
     self.assertEqual(x, 5.)
     self.assertAllClose(tf.convert_to_tensor(y), 5., atol=1e-3)
 
+  def testMemoize(self):
+    def model():
+      z = ed.Normal(loc=0., scale=1., sample_shape=[3], name="z")
+      x = ed.Normal(loc=tf.reduce_sum(z), scale=1., name="x")
+      y = ed.Normal(loc=x, scale=1., name="y")
+      return z, x, y
+
+    with ed.memoize() as cache:
+      z, x, _ = model()
+    self.assertEqual(cache.hits, 0)
+    self.assertEqual(cache.misses, 3)
+
+    for y_value in [0., 1.]:
+      with ed.memoize(cache):
+        with ed.condition(y=y_value):
+          new_z, new_x, new_y = model()
+      self.assertIs(new_z, z)
+      self.assertIs(new_x, x)
+      self.assertEqual(new_y, y_value)
+    self.assertEqual(cache.hits, 4)
+    self.assertEqual(cache.misses, 5)
+
+  def testMemoizeDocstringExample(self):
+    def model():
+      z = ed.Normal(loc=0., scale=1., sample_shape=[1000], name="z")
+      x = ed.Normal(loc=tf.reduce_sum(z), scale=1., name="x")
+      y = ed.Normal(loc=x, scale=1., name="y")
+      return y
+
+    with ed.memoize(capacity=100) as cache:
+      model()
+
+    for y in [tf.constant(0.), tf.constant(1.)]:
+      with ed.memoize(cache):
+        with ed.condition(y=y):
+          model()
+
+    self.assertEqual(cache.hits, 4)
+    self.assertEqual(cache.misses, 5)
+
+  def testMemoizeSignedZero(self):
+    def model(loc):
+      return ed.Normal(loc=loc, scale=1., name="x")
+
+    with ed.memoize() as cache:
+      x = model(0.)
+    with ed.memoize(cache):
+      new_x = model(-0.)
+    self.assertIsNot(new_x, x)
+    self.assertEqual(cache.hits, 0)
+
+  def testMemoizeRepeatedSites(self):
+    def model():
+      x1 = ed.Normal(loc=0., scale=1., name="x")
+      x2 = ed.Normal(loc=0., scale=1., name="x")
+      return x1, x2
+
+    with ed.memoize() as cache:
+      x1, x2 = model()
+    self.assertIsNot(x1, x2)
+    with ed.memoize(cache):
+      new_x1, _ = model()
+    self.assertIs(new_x1, x1)
+
+  def testMemoizeReusesOncePerContext(self):
+    def model():
+      return ed.Normal(loc=0., scale=1., name="x")
+
+    with ed.memoize() as cache:
+      x = model()
+    with ed.memoize(cache):
+      new_x1 = model()
+      new_x2 = model()
+    self.assertIs(new_x1, x)
+    self.assertIsNot(new_x2, x)
+    self.assertEqual(cache.hits, 1)
+    self.assertEqual(cache.misses, 2)
+
+  def testMemoizeLargeArgumentsByIdentity(self):
+    small = tf.zeros([2])
+    large = tf.zeros([1000])
+    def model(loc):
+      return ed.Normal(loc=loc, scale=1., name="x")
+
+    with ed.memoize() as cache:
+      model(small)
+      model(large)
+    with ed.memoize(cache):
+      model(tf.zeros([2]))  # Compared by value.
+    with ed.memoize(cache):
+      model(tf.zeros([1000]))  # Compared by identity.
+    with ed.memoize(cache):
+      model(large)
+    self.assertEqual(cache.hits, 2)
+    self.assertEqual(cache.misses, 3)
+
+  def testMemoizeCapacity(self):
+    def model():
+      x = ed.Normal(loc=0., scale=1., name="x")
+      y = ed.Normal(loc=0., scale=1., name="y")
+      return x, y
+
+    with ed.memoize(capacity=1) as cache:
+      x, _ = model()
+    self.assertLen(cache, 1)
+    # Only `y` is cached, and executing `x` evicts it.
+    with ed.memoize(cache):
+      new_x, _ = model()
+    self.assertLen(cache, 1)
+    self.assertIsNot(new_x, x)
+    self.assertEqual(cache.hits, 0)
+    self.assertEqual(cache.misses, 4)
+
   def testTape(self):
     def model():
       x = ed.Normal(loc=0., scale=1., name="x")
@@ -59,6 +175,102 @@ class TracersTest(tf.test.TestCase):
 
     self.assertEqual(list(model_tape.keys()), ["x"])
 
+  def testTapeIncludeExclude(self):
+    def model():
+      x = ed.Normal(loc=0., scale=1., name="x")
+      y = ed.Normal(loc=x, scale=1., name="y")
+      z = ed.Normal(loc=y, scale=1., name="z")
+      return z
+
+    with ed.tape(include=["x", "z"]) as model_tape:
+      _ = model()
+    self.assertEqual(list(model_tape.keys()), ["x", "z"])
+
+    with ed.tape(exclude=["x"]) as model_tape:
+      _ = model()
+    self.assertEqual(list(model_tape.keys()), ["y", "z"])
+
+    with ed.tape(include="x") as model_tape:
+      _ = model()
+    self.assertEqual(list(model_tape.keys()), ["x"])
+
+    with ed.tape(exclude="x") as model_tape:
+      _ = model()
+    self.assertEqual(list(model_tape.keys()), ["y", "z"])
+
+    # A string is a single name, not a collection of one-character names.
+    with ed.tape(include="xz") as model_tape:
+      _ = model()
+    self.assertEmpty(model_tape)
+
+  def testTapeStore(self):
+    def model():
+      x = ed.Normal(loc=0., scale=1., name="x")
+      y = ed.Normal(loc=x, scale=1., name="y")
+      return y
+
+    with ed.tape(store="value") as model_tape:
+      y = model()
+    self.assertIsInstance(model_tape["y"], tf.Tensor)
+    self.assertEqual(model_tape["y"], y.value)
+
+    with ed.tape(store="distribution") as model_tape:
+      y = model()
+    self.assertIs(model_tape["y"], y.distribution)
+
+    records = []
+    with ed.tape(store="callback",
+                 callback=lambda name, rv: records.append(name)) as model_tape:
+      _ = model()
+    self.assertEmpty(model_tape)
+    self.assertEqual(records, ["x", "y"])
+
+    with self.assertRaises(ValueError):
+      with ed.tape(store="callback"):
+        pass
+
+  def testTapeStoreNonRandomVariable(self):
+    @ed.traceable
+    def double(x, name=None):
+      del name  # unused
+      return 2. * x
+
+    def model():
+      x = ed.Normal(loc=0., scale=1., name="x")
+      y = double(x, name="y")
+      return y
+
+    with ed.tape(store="distribution") as model_tape:
+      y = model()
+    self.assertIsInstance(model_tape["x"], tfd.Normal)
+    self.assertIs(model_tape["y"], y)
+
+  def testTapeMaxSize(self):
+    def model():
+      x = ed.Normal(loc=0., scale=1., name="x")
+      y = ed.Normal(loc=x, scale=1., name="y")
+      z = ed.Normal(loc=y, scale=1., name="z")
+      return z
+
+    with ed.tape(max_size=2) as model_tape:
+      z = model()
+    self.assertEqual(list(model_tape.keys()), ["y", "z"])
+    self.assertEqual(model_tape["z"], z)
+
+  def testTapeMaxSizeRerecord(self):
+    def model():
+      x = ed.Normal(loc=0., scale=1., name="x")
+      y = ed.Normal(loc=x, scale=1., name="y")
+      x = ed.Normal(loc=y, scale=1., name="x")
+      z = ed.Normal(loc=x, scale=1., name="z")
+      return x, z
+
+    with ed.tape(max_size=2) as model_tape:
+      x, z = model()
+    self.assertEqual(list(model_tape.keys()), ["x", "z"])
+    self.assertEqual(model_tape["x"], x)
+    self.assertEqual(model_tape["z"], z)
+
   def testTapeOuterForwarding(self):
     def double(f, *args, **kwargs):
       return 2. * ed.traceable(f)(*args, **kwargs)